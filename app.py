@@ -1,9 +1,13 @@
 import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from src.infrastructure.database import init_db, close_db
-from src.api.routes import task_list_router, task_router
+from src.infrastructure.group_commit import write_coordinator
+from src.infrastructure.outbox import outbox_dispatcher
+from src.api.metrics import MetricsMiddleware, metrics_response, stats_collector
+from src.api.routes import task_list_router, task_router, response_cache, task_events
+from src.infrastructure.metrics import metrics
 from src.config import settings
 
 
@@ -12,8 +16,15 @@ async def lifespan(app: FastAPI):
     """Context manager for application lifespan events."""
     # Startup
     await init_db()
+    # Notifications are delivered in the background, off the request path
+    if outbox_dispatcher:
+        outbox_dispatcher.start()
     yield
     # Shutdown
+    if write_coordinator:
+        await write_coordinator.drain()
+    if outbox_dispatcher:
+        await outbox_dispatcher.stop()
     await close_db()
 
 
@@ -23,13 +34,26 @@ app = FastAPI(
     description="A clean architecture API for managing task lists and tasks",
     version=settings.APP_VERSION,
     lifespan=lifespan,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=ORJSONResponse
 )
 
 # Include routers
 app.include_router(task_list_router)
 app.include_router(task_router)
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    metrics.add_collector(stats_collector("response_cache", response_cache.stats))
+    metrics.add_collector(stats_collector("task_events", task_events.stats))
+    if outbox_dispatcher:
+        metrics.add_collector(stats_collector("outbox", outbox_dispatcher.stats))
+
+    @app.get("/metrics", include_in_schema=False)
+    async def prometheus_metrics():
+        """Metrics in the Prometheus text format."""
+        return metrics_response()
+
 
 @app.get("/")
 async def root():
@@ -47,7 +71,10 @@ async def health():
     """Health check endpoint."""
     return JSONResponse({
         "status": "healthy",
-        "service": "task-management-api"
+        "service": "task-management-api",
+        "response_cache": response_cache.stats(),
+        "task_events": task_events.stats(),
+        "outbox": outbox_dispatcher.stats() if outbox_dispatcher else None
     })
 
 
@@ -0,0 +1,97 @@
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from fastapi import Response
+
+from ..infrastructure.metrics import SIZE_BUCKETS, Sample, metrics
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Route label of requests that matched no route, so unknown paths cannot add label values
+UNMATCHED_ROUTE = "<unmatched>"
+# Method label values; any other method the client sends is counted as "other"
+HTTP_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+OTHER_METHOD = "other"
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "Requests handled, by route and status", ("method", "route", "status")
+)
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    ("method", "route")
+)
+HTTP_RESPONSE_BYTES = metrics.histogram(
+    "http_response_size_bytes", "Size of response bodies", ("method", "route"), SIZE_BUCKETS
+)
+HTTP_IN_PROGRESS = metrics.gauge("http_requests_in_progress", "Requests being handled")
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware timing every HTTP request. Requests are labelled with the path
+    template of the route that handled them (e.g. /tasks/task/{task_id}), never the raw path,
+    and with a known method, so clients cannot create new label values.
+    Only `send` is wrapped, to read the status and count body bytes, so streamed responses
+    are not buffered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Optional[Dict[Callable, str]] = None
+
+    def _route_of(self, scope: Dict[str, Any]) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._route_paths is None:
+            # Routes are all registered by the first request
+            self._route_paths = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_PROGRESS.labels().inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_PROGRESS.labels().dec()
+            # The router records the matched endpoint in the scope it shares with us
+            method = scope["method"] if scope["method"] in HTTP_METHODS else OTHER_METHOD
+            route = self._route_of(scope)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+            HTTP_REQUEST_SECONDS.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_RESPONSE_BYTES.labels(method, route).observe(size)
+
+
+def stats_collector(
+    prefix: str, stats: Callable[[], Dict[str, Any]]
+) -> Callable[[], Iterable[Sample]]:
+    """Expose the numeric counters of a stats() dict (e.g. the response cache) as gauges"""
+    def collect() -> Iterable[Sample]:
+        for key, value in stats().items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield f"{prefix}_{key}", "gauge", f"{prefix.replace('_', ' ')} {key}", value
+    return collect
+
+
+def metrics_response() -> Response:
+    return Response(metrics.render(), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -1,42 +1,231 @@
-from typing import List, Optional
+import asyncio
+import re
+import zlib
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..application.dtos import (
     CreateTaskListRequest,
     UpdateTaskListRequest,
     TaskListResponse,
+    TaskListPageResponse,
     CreateTaskRequest,
+    BulkCreateTasksRequest,
+    BulkCreateTasksResponse,
+    BulkUpdateTasksRequest,
+    BulkUpdateTasksResponse,
+    ImportTasksResponse,
     UpdateTaskRequest,
     UpdateTaskStatusRequest,
     TaskResponse,
+    TaskPageResponse,
     TaskListWithFilteredTasksResponse,
+    TaskFilterRequest,
+    TaskEventResponse,
 )
+from ..application.cache import ResponseCache
+from ..application.fieldsets import (
+    TASK_FIELDS, TASK_LIST_FIELDS, InvalidFieldsError, parse_fields
+)
+from ..application.pagination import InvalidCursorError
+from ..application.task_import import iter_lines, parse_rows
 from ..application.use_cases import TaskListUseCases, TaskUseCases
+from ..config import settings
 from ..domain.entities.task import TaskStatus, TaskPriority
-from ..infrastructure.database import get_db_session
-from ..infrastructure.repositories import (
-    SQLAlchemyTaskListRepository,
-    SQLAlchemyTaskRepository,
+from ..domain.exceptions import VersionConflictError
+from ..infrastructure.database import (
+    get_db_session, get_read_session, on_task_events_committed, on_task_lists_committed
 )
+from ..infrastructure.events import EventBroker, EventSubscription, TaskEvent
+from ..infrastructure.group_commit import write_coordinator
+from ..infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
 
 # Create routers
 task_list_router = APIRouter(prefix="/task-lists", tags=["Task Lists"])
 task_router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
-# Dependency to get use cases
-async def get_task_list_use_cases(session: AsyncSession = Depends(get_db_session)) -> TaskListUseCases:
-    task_list_repo = SQLAlchemyTaskListRepository(session)
-    task_repo = SQLAlchemyTaskRepository(session)
-    return TaskListUseCases(task_list_repo, task_repo)
+# Read responses shared by all requests, invalidated by the task lists each commit changes
+response_cache = ResponseCache(
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS
+)
+on_task_lists_committed(response_cache.invalidate_task_lists)
+
+# Committed task changes, fanned out to the event stream subscribers of each task list
+task_events = EventBroker(max_queued_events=settings.EVENTS_QUEUE_SIZE)
+on_task_events_committed(task_events.publish)
+
+
+def build_task_list_use_cases(session: AsyncSession) -> TaskListUseCases:
+    return TaskListUseCases(SQLAlchemyUnitOfWork(session), cache=response_cache)
+
+
+def build_task_use_cases(session: AsyncSession) -> TaskUseCases:
+    return TaskUseCases(SQLAlchemyUnitOfWork(session), cache=response_cache)
+
+
+# One unit of work per request on the writer session. Every use case commits its own work,
+# but a route can open `async with uow:` around several calls to commit them together.
+async def get_unit_of_work(
+    session: AsyncSession = Depends(get_db_session)
+) -> SQLAlchemyUnitOfWork:
+    return SQLAlchemyUnitOfWork(session)
+
+
+# Dependencies to get use cases. Routes that modify data use the writer unit of work (or the
+# group commit coordinator, when enabled); read-only routes use the read-only pool.
+async def get_task_list_use_cases(
+    uow: SQLAlchemyUnitOfWork = Depends(get_unit_of_work)
+) -> TaskListUseCases:
+    if write_coordinator:
+        return write_coordinator.bind(build_task_list_use_cases)
+    return TaskListUseCases(uow, cache=response_cache)
+
+
+async def get_task_list_read_use_cases(
+    session: AsyncSession = Depends(get_read_session)
+) -> TaskListUseCases:
+    return build_task_list_use_cases(session)
+
+
+async def get_task_use_cases(
+    uow: SQLAlchemyUnitOfWork = Depends(get_unit_of_work)
+) -> TaskUseCases:
+    if write_coordinator:
+        return write_coordinator.bind(build_task_use_cases)
+    return TaskUseCases(uow, cache=response_cache)
+
+
+async def get_task_read_use_cases(
+    session: AsyncSession = Depends(get_read_session)
+) -> TaskUseCases:
+    return build_task_use_cases(session)
+
+
+def make_etag(
+    kind: str,
+    resource_id: int,
+    version: int,
+    fields: Optional[Sequence[str]] = None,
+    variant: Optional[str] = None
+) -> str:
+    """
+    Strong ETag of a resource derived from its version counter. A sparse fieldset or any
+    other `variant` of the resource (e.g. its canonical filters) is a different
+    representation, so it adds a checksum of the selected fields or of the variant.
+    """
+    if fields is not None:
+        variant = ",".join(fields)
+    if variant is None:
+        return f'"{kind}-{resource_id}-{version}"'
+    return f'"{kind}-{resource_id}-{version}-{zlib.crc32(variant.encode()):08x}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match already names the current representation"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so a W/ prefix does not matter
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
 
 
-async def get_task_use_cases(session: AsyncSession = Depends(get_db_session)) -> TaskUseCases:
-    task_list_repo = SQLAlchemyTaskListRepository(session)
-    task_repo = SQLAlchemyTaskRepository(session)
-    return TaskUseCases(task_repo, task_list_repo)
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+
+def json_response(
+    content: Union[BaseModel, Dict[str, Any]],
+    etag: Optional[str] = None
+) -> Response:
+    """
+    Serialize a response DTO with pydantic-core directly. The use cases already build the
+    exact response models, so FastAPI's jsonable_encoder pass and revalidation are skipped;
+    `response_model` on the route still documents the schema. Sparse fieldsets are plain
+    dicts of column values and go through orjson.
+    """
+    headers = {"ETag": etag} if etag else None
+    if isinstance(content, BaseModel):
+        return Response(content.model_dump_json(), media_type="application/json", headers=headers)
+    return ORJSONResponse(content, headers=headers)
+
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (id is always included); all by default"
+
+
+def task_fields(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields, TASK_FIELDS)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def task_list_fields(
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+) -> Optional[Tuple[str, ...]]:
+    try:
+        return parse_fields(fields, TASK_LIST_FIELDS)
+    except InvalidFieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def if_match_version(request: Request, kind: str, resource_id: int) -> Optional[int]:
+    """
+    Version named by the request's If-Match header, or None for an unconditional write.
+    If-Match uses the strong comparison, so a weak or foreign tag can never match: it maps
+    to version -1, which yields a conflict (or a 404 if the resource does not exist).
+    """
+    header = request.headers.get("if-match")
+    if not header or header.strip() == "*":
+        return None
+    for tag in header.split(","):
+        match = re.fullmatch(rf'"{kind}-{resource_id}-(\d+)(?:-[0-9a-f]{{8}})?"', tag.strip())
+        if match:
+            return int(match.group(1))
+    return -1
+
+
+def task_filters(
+    status: Optional[List[TaskStatus]] = Query(None, description="Task statuses to include"),
+    priority: Optional[List[TaskPriority]] = Query(None, description="Task priorities to include"),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    updated_after: Optional[datetime] = Query(None),
+    updated_before: Optional[datetime] = Query(None),
+    min_percentage: Optional[int] = Query(None, ge=0, le=100),
+    max_percentage: Optional[int] = Query(None, ge=0, le=100),
+    sort: Optional[str] = Query(
+        None,
+        description="Comma-separated sort fields (priority, percentage, created_at, "
+        "updated_at), each prefixed with '-' for descending order"
+    )
+) -> TaskFilterRequest:
+    try:
+        return TaskFilterRequest(
+            status=status or (),
+            priority=priority or (),
+            created_after=created_after,
+            created_before=created_before,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            min_percentage=min_percentage,
+            max_percentage=max_percentage,
+            sort=sort
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=e.errors()[0]["msg"])
 
 
 # Task List Routes
@@ -49,36 +238,64 @@ async def create_task_list(
     return await use_cases.create_task_list(request)
 
 
-@task_list_router.get("/", response_model=List[TaskListResponse])
+@task_list_router.get("/", response_model=TaskListPageResponse)
 async def get_all_task_lists(
-    use_cases: TaskListUseCases = Depends(get_task_list_use_cases)
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+    fields: Optional[Tuple[str, ...]] = Depends(task_list_fields),
+    use_cases: TaskListUseCases = Depends(get_task_list_read_use_cases)
 ):
-    """Get all task lists"""
-    return await use_cases.get_all_task_lists()
+    """Get a page of task lists"""
+    try:
+        if fields is not None:
+            return json_response(await use_cases.get_all_task_list_fields(fields, limit, cursor))
+        return json_response(await use_cases.get_all_task_lists(limit, cursor))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @task_list_router.get("/{task_list_id}", response_model=TaskListResponse)
 async def get_task_list(
     task_list_id: int,
-    use_cases: TaskListUseCases = Depends(get_task_list_use_cases)
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(task_list_fields),
+    use_cases: TaskListUseCases = Depends(get_task_list_read_use_cases)
 ):
     """Get a specific task list by ID"""
-    task_list = await use_cases.get_task_list(task_list_id)
+    # The version is checked before loading the list, so an unchanged list costs no query
+    version = await use_cases.get_task_list_version(task_list_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Task list not found")
+    etag = make_etag("task-list", task_list_id, version, fields)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    if fields is not None:
+        task_list = await use_cases.get_task_list_fields(task_list_id, fields, version=version)
+    else:
+        task_list = await use_cases.get_task_list(task_list_id, version=version)
     if not task_list:
         raise HTTPException(status_code=404, detail="Task list not found")
-    return task_list
+    return json_response(task_list, etag)
 
 
 @task_list_router.put("/{task_list_id}", response_model=TaskListResponse)
 async def update_task_list(
     task_list_id: int,
     request: UpdateTaskListRequest,
+    http_request: Request,
+    response: Response,
     use_cases: TaskListUseCases = Depends(get_task_list_use_cases)
 ):
-    """Update a task list"""
-    task_list = await use_cases.update_task_list(task_list_id, request)
+    """Update a task list (conditionally, when an If-Match header is sent)"""
+    expected_version = if_match_version(http_request, "task-list", task_list_id)
+    try:
+        task_list = await use_cases.update_task_list(task_list_id, request, expected_version)
+    except VersionConflictError:
+        raise HTTPException(status_code=409, detail="Task list was modified by another request")
     if not task_list:
         raise HTTPException(status_code=404, detail="Task list not found")
+    response.headers["ETag"] = make_etag("task-list", task_list.id, task_list.version)
     return task_list
 
 
@@ -93,6 +310,56 @@ async def delete_task_list(
         raise HTTPException(status_code=404, detail="Task list not found")
 
 
+def sse_message(event: TaskEvent) -> str:
+    task = TaskResponse.from_entity(event.task) if event.task is not None else None
+    data = TaskEventResponse(task_list_id=event.task_list_id, task=task)
+    return f"event: {event.type.value}\ndata: {data.model_dump_json()}\n\n"
+
+
+async def stream_task_events(
+    request: Request, subscription: EventSubscription
+) -> AsyncIterator[str]:
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), timeout=settings.EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                # A comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            yield sse_message(event)
+    finally:
+        task_events.unsubscribe(subscription)
+
+
+@task_list_router.get("/{task_list_id}/events")
+async def task_list_events(
+    task_list_id: int,
+    request: Request,
+    session: AsyncSession = Depends(get_read_session)
+):
+    """
+    Stream the committed task changes of a task list as Server-Sent Events. The first
+    event is `resync`, which is sent again whenever the client must refetch the list
+    (it fell behind, a bulk change happened, or the list was deleted).
+    """
+    version = await build_task_list_use_cases(session).get_task_list_version(task_list_id)
+    # The stream can stay open for hours, so it must not hold a pooled connection
+    await session.close()
+    if version is None:
+        raise HTTPException(status_code=404, detail="Task list not found")
+
+    return StreamingResponse(
+        stream_task_events(request, task_events.subscribe(task_list_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # Task Routes
 @task_router.post("/{task_list_id}/tasks", response_model=TaskResponse, status_code=201)
 async def create_task(
@@ -107,51 +374,194 @@ async def create_task(
     return task
 
 
-@task_router.get("/{task_list_id}/tasks", response_model=List[TaskResponse])
-async def get_tasks_by_list(
+@task_router.post(
+    "/{task_list_id}/tasks/bulk", response_model=BulkCreateTasksResponse, status_code=201
+)
+async def create_tasks_bulk(
     task_list_id: int,
+    request: BulkCreateTasksRequest,
     use_cases: TaskUseCases = Depends(get_task_use_cases)
 ):
-    """Get all tasks for a specific task list"""
-    return await use_cases.get_tasks_by_list(task_list_id)
+    """Create many tasks in a task list in one request"""
+    result = await use_cases.create_tasks_bulk(task_list_id, request)
+    if not result:
+        raise HTTPException(status_code=404, detail="Task list not found")
+    return result
+
+
+@task_router.post("/{task_list_id}/tasks/import", response_model=ImportTasksResponse)
+async def import_tasks(
+    task_list_id: int,
+    request: Request,
+    uow: SQLAlchemyUnitOfWork = Depends(get_unit_of_work)
+):
+    """
+    Import tasks from the request body, streamed as NDJSON or as CSV with a header row
+    (Content-Type: text/csv), reporting the rows that fail validation
+    """
+    content_type = request.headers.get("content-type", "")
+    import_format = "csv" if content_type.startswith("text/csv") else "ndjson"
+    rows = parse_rows(iter_lines(request.stream()), import_format)
+    
+    # Every batch commits on its own, so imports bypass the group commit coordinator
+    result = await TaskUseCases(uow, cache=response_cache).import_tasks(
+        task_list_id,
+        rows,
+        batch_size=settings.IMPORT_BATCH_SIZE,
+        max_reported_errors=settings.IMPORT_MAX_REPORTED_ERRORS
+    )
+    if not result:
+        raise HTTPException(status_code=404, detail="Task list not found")
+    return result
+
+
+@task_router.get("/{task_list_id}/tasks", response_model=TaskPageResponse)
+async def get_tasks_by_list(
+    task_list_id: int,
+    request: Request,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields),
+    use_cases: TaskUseCases = Depends(get_task_read_use_cases),
+    list_use_cases: TaskListUseCases = Depends(get_task_list_read_use_cases)
+):
+    """Get a page of tasks for a specific task list"""
+    # A missing list has no version and simply yields an empty page
+    version = await list_use_cases.get_task_list_version(task_list_id)
+    etag = None
+    if version is not None:
+        etag = make_etag("tasks", task_list_id, version, fields)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+    
+    try:
+        if fields is not None:
+            page = await use_cases.get_task_fields_by_list(
+                task_list_id, fields, limit, cursor, version=version
+            )
+        else:
+            page = await use_cases.get_tasks_by_list(task_list_id, limit, cursor, version=version)
+        return json_response(page, etag)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# The read session stays open while the body streams: dependencies with yield are only
+# closed once the response has been sent
+@task_router.get("/export")
+async def export_all_tasks(use_cases: TaskUseCases = Depends(get_task_read_use_cases)):
+    """Stream every task of every list as NDJSON"""
+    return StreamingResponse(
+        use_cases.export_tasks(batch_size=settings.EXPORT_BATCH_SIZE),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+@task_router.get("/{task_list_id}/tasks/export")
+async def export_tasks(
+    task_list_id: int,
+    use_cases: TaskUseCases = Depends(get_task_read_use_cases),
+    list_use_cases: TaskListUseCases = Depends(get_task_list_read_use_cases)
+):
+    """Stream every task of a task list as NDJSON"""
+    if await list_use_cases.get_task_list_version(task_list_id) is None:
+        raise HTTPException(status_code=404, detail="Task list not found")
+    return StreamingResponse(
+        use_cases.export_tasks(task_list_id, batch_size=settings.EXPORT_BATCH_SIZE),
+        media_type=NDJSON_MEDIA_TYPE
+    )
 
 
 @task_router.get("/{task_list_id}/tasks/filtered", response_model=TaskListWithFilteredTasksResponse)
 async def get_filtered_tasks(
     task_list_id: int,
+    request: Request,
+    filters: TaskFilterRequest = Depends(task_filters),
+    use_cases: TaskUseCases = Depends(get_task_read_use_cases),
+    list_use_cases: TaskListUseCases = Depends(get_task_list_read_use_cases)
+):
+    """Get the tasks of a list filtered and sorted, with the list's completion percentage"""
+    version = await list_use_cases.get_task_list_version(task_list_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Task list not found")
+    etag = make_etag("filtered-tasks", task_list_id, version, variant=filters.model_dump_json())
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    result = await use_cases.get_filtered_tasks(task_list_id, filters, version=version)
+    if not result:
+        raise HTTPException(status_code=404, detail="Task list not found")
+    return json_response(result, etag)
+
+
+@task_router.get("/search", response_model=TaskPageResponse)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to search for"),
+    task_list_id: Optional[int] = Query(None, description="Only search this task list"),
     status: Optional[TaskStatus] = Query(None, description="Filter by task status"),
     priority: Optional[TaskPriority] = Query(None, description="Filter by task priority"),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page"),
+    use_cases: TaskUseCases = Depends(get_task_read_use_cases)
+):
+    """Full-text search over task titles and descriptions, most relevant first"""
+    try:
+        page = await use_cases.search_tasks(q, limit, cursor, task_list_id, status, priority)
+        return json_response(page)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@task_router.patch("/bulk", response_model=BulkUpdateTasksResponse)
+async def update_tasks_bulk(
+    request: BulkUpdateTasksRequest,
     use_cases: TaskUseCases = Depends(get_task_use_cases)
 ):
-    """Get filtered tasks by status and/or priority with completion percentage"""
-    result = await use_cases.get_filtered_tasks(task_list_id, status, priority)
-    if not result:
-        raise HTTPException(status_code=404, detail="Task list not found")
-    return result
+    """Update status, priority and/or percentage of many tasks selected by ID or by filter"""
+    return await use_cases.update_tasks_bulk(request)
 
 
 @task_router.get("/task/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: int,
-    use_cases: TaskUseCases = Depends(get_task_use_cases)
+    request: Request,
+    fields: Optional[Tuple[str, ...]] = Depends(task_fields),
+    use_cases: TaskUseCases = Depends(get_task_read_use_cases)
 ):
     """Get a specific task by ID"""
-    task = await use_cases.get_task(task_id)
+    version = await use_cases.get_task_version(task_id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    etag = make_etag("task", task_id, version, fields)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    
+    if fields is not None:
+        task = await use_cases.get_task_fields(task_id, fields)
+    else:
+        task = await use_cases.get_task(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    return json_response(task, etag)
 
 
 @task_router.put("/task/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     request: UpdateTaskRequest,
+    http_request: Request,
+    response: Response,
     use_cases: TaskUseCases = Depends(get_task_use_cases)
 ):
-    """Update a task"""
-    task = await use_cases.update_task(task_id, request)
+    """Update a task (conditionally, when an If-Match header is sent)"""
+    expected_version = if_match_version(http_request, "task", task_id)
+    try:
+        task = await use_cases.update_task(task_id, request, expected_version)
+    except VersionConflictError:
+        raise HTTPException(status_code=409, detail="Task was modified by another request")
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = make_etag("task", task.id, task.version)
     return task
 
 
@@ -159,12 +569,19 @@ async def update_task(
 async def update_task_status(
     task_id: int,
     request: UpdateTaskStatusRequest,
+    http_request: Request,
+    response: Response,
     use_cases: TaskUseCases = Depends(get_task_use_cases)
 ):
-    """Update task status"""
-    task = await use_cases.update_task_status(task_id, request)
+    """Update task status (conditionally, when an If-Match header is sent)"""
+    expected_version = if_match_version(http_request, "task", task_id)
+    try:
+        task = await use_cases.update_task_status(task_id, request, expected_version)
+    except VersionConflictError:
+        raise HTTPException(status_code=409, detail="Task was modified by another request")
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    response.headers["ETag"] = make_etag("task", task.id, task.version)
     return task
 
 
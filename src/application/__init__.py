@@ -1,14 +1,18 @@
 # Application layer package 
 from .dtos import (
-    CreateTaskListRequest, UpdateTaskListRequest, TaskListResponse,
-    CreateTaskRequest, UpdateTaskRequest, UpdateTaskStatusRequest, TaskResponse,
+    CreateTaskListRequest, UpdateTaskListRequest, TaskListResponse, TaskListPageResponse,
+    CreateTaskRequest, BulkCreateTasksRequest, UpdateTaskRequest, UpdateTaskStatusRequest,
+    BulkTaskFilter, BulkUpdateTasksRequest, TaskResponse, TaskPageResponse,
+    BulkCreateTasksResponse, BulkUpdateTasksResponse, ImportRowError, ImportTasksResponse,
     TaskListWithTasksResponse, TaskFilterRequest, TaskListWithFilteredTasksResponse
 )
 from .use_cases import TaskListUseCases, TaskUseCases
 
 __all__ = [
-    "CreateTaskListRequest", "UpdateTaskListRequest", "TaskListResponse",
-    "CreateTaskRequest", "UpdateTaskRequest", "UpdateTaskStatusRequest", "TaskResponse",
+    "CreateTaskListRequest", "UpdateTaskListRequest", "TaskListResponse", "TaskListPageResponse",
+    "CreateTaskRequest", "BulkCreateTasksRequest", "UpdateTaskRequest", "UpdateTaskStatusRequest",
+    "BulkTaskFilter", "BulkUpdateTasksRequest", "TaskResponse", "TaskPageResponse",
+    "BulkCreateTasksResponse", "BulkUpdateTasksResponse", "ImportRowError", "ImportTasksResponse",
     "TaskListWithTasksResponse", "TaskFilterRequest", "TaskListWithFilteredTasksResponse",
     "TaskListUseCases", "TaskUseCases"
 ] 
\ No newline at end of file
@@ -0,0 +1,126 @@
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+# Returned by ResponseCache.get when there is no usable entry (None is a valid result)
+MISSING = object()
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache with a time-to-live for the results of read use cases.
+
+    Every entry belongs to a task list, and a committed write to that list drops all of
+    its entries. A cache with max_entries=0 is disabled.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (expires_at, task_list_id, value), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._keys_by_task_list: Dict[int, Set[Hashable]] = {}
+        # Bumped on every invalidation, so a load that raced with a write is not stored
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: Hashable) -> Any:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def set(self, key: Hashable, value: Any, task_list_id: int, generation: int):
+        """Store a value loaded when the cache was at `generation`, unless it is stale by now"""
+        if generation != self.generation:
+            return
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, task_list_id, value)
+        self._keys_by_task_list.setdefault(task_list_id, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate_task_lists(self, task_list_ids: Iterable[int]):
+        """Drop every entry of the given task lists"""
+        self.generation += 1
+        for task_list_id in task_list_ids:
+            for key in self._keys_by_task_list.pop(task_list_id, ()):
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        self.generation += 1
+        self._entries.clear()
+        self._keys_by_task_list.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable):
+        _, task_list_id, _ = self._entries.pop(key)
+        keys = self._keys_by_task_list.get(task_list_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_task_list[task_list_id]
+
+
+def cached_by_task_list(method):
+    """
+    Cache the result of a read use case whose first argument is a task list ID, keyed by
+    all of its arguments and the current version of the task list. The instance's `cache`
+    attribute may be None to disable caching; None results (not found) are never cached.
+
+    The version is read from the database (or passed as `version` by callers that already
+    read it), so writes this process never saw, from other workers or the CLI, make the
+    cached entries unreachable instead of being hidden until they expire.
+    """
+    @functools.wraps(method)
+    async def wrapper(
+        self, task_list_id: int, *args, version: Optional[int] = None, **kwargs
+    ):
+        cache: ResponseCache = self.cache
+        if cache is None or not cache.enabled:
+            return await method(self, task_list_id, *args, **kwargs)
+
+        if version is None:
+            version = await self.task_list_repo.get_version(task_list_id)
+            if version is None:
+                return await method(self, task_list_id, *args, **kwargs)
+        key = (
+            method.__qualname__, task_list_id, version, args, tuple(sorted(kwargs.items()))
+        )
+        value = cache.get(key)
+        if value is not MISSING:
+            return value
+
+        generation = cache.generation
+        value = await method(self, task_list_id, *args, **kwargs)
+        if value is not None:
+            cache.set(key, value, task_list_id, generation)
+        return value
+
+    return wrapper
@@ -1,15 +1,19 @@
 from .task_list_dtos import (
-    CreateTaskListRequest, UpdateTaskListRequest, TaskListResponse,
+    CreateTaskListRequest, UpdateTaskListRequest, TaskListResponse, TaskListPageResponse,
     TaskListWithTasksResponse, TaskListWithFilteredTasksResponse
 )
 from .task_dtos import (
-    CreateTaskRequest, UpdateTaskRequest, UpdateTaskStatusRequest, TaskResponse,
-    TaskFilterRequest
+    CreateTaskRequest, BulkCreateTasksRequest, UpdateTaskRequest, UpdateTaskStatusRequest,
+    BulkTaskFilter, BulkUpdateTasksRequest, TaskResponse, TaskPageResponse,
+    BulkCreateTasksResponse, BulkUpdateTasksResponse, ImportRowError, ImportTasksResponse,
+    TaskFilterRequest, TaskEventResponse
 )
 
 __all__ = [
-    "CreateTaskListRequest", "UpdateTaskListRequest", "TaskListResponse",
+    "CreateTaskListRequest", "UpdateTaskListRequest", "TaskListResponse", "TaskListPageResponse",
     "TaskListWithTasksResponse", "TaskListWithFilteredTasksResponse",
-    "CreateTaskRequest", "UpdateTaskRequest", "UpdateTaskStatusRequest", "TaskResponse",
-    "TaskFilterRequest"
+    "CreateTaskRequest", "BulkCreateTasksRequest", "UpdateTaskRequest", "UpdateTaskStatusRequest",
+    "BulkTaskFilter", "BulkUpdateTasksRequest", "TaskResponse", "TaskPageResponse",
+    "BulkCreateTasksResponse", "BulkUpdateTasksResponse", "ImportRowError", "ImportTasksResponse",
+    "TaskFilterRequest", "TaskEventResponse"
 ] 
\ No newline at end of file
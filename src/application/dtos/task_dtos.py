@@ -1,7 +1,12 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field
-from ...domain.entities.task import TaskStatus, TaskPriority
+from typing import List, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+from ...domain.entities.task import Task, TaskStatus, TaskPriority
+from ...domain.entities.task_collection import TaskRecord
+from ...domain.entities.task_query import TaskQuery, TaskSort, TaskSortField
+
+# Upper bound for the number of tasks accepted by a single bulk request
+MAX_BULK_TASKS = 10000
 
 
 class CreateTaskRequest(BaseModel):
@@ -11,6 +16,10 @@ class CreateTaskRequest(BaseModel):
     percentage: int = Field(0, ge=0, le=100)
 
 
+class BulkCreateTasksRequest(BaseModel):
+    tasks: List[CreateTaskRequest] = Field(..., min_length=1, max_length=MAX_BULK_TASKS)
+
+
 class UpdateTaskRequest(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=1000)
@@ -22,6 +31,30 @@ class UpdateTaskStatusRequest(BaseModel):
     status: TaskStatus
 
 
+class BulkTaskFilter(BaseModel):
+    task_list_id: int
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+
+
+class BulkUpdateTasksRequest(BaseModel):
+    # Select the tasks either by ID or with a filter
+    task_ids: Optional[List[int]] = Field(None, min_length=1, max_length=MAX_BULK_TASKS)
+    filter: Optional[BulkTaskFilter] = None
+    # Values to set on every selected task
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    percentage: Optional[int] = Field(None, ge=0, le=100)
+
+    @model_validator(mode="after")
+    def check_selection_and_changes(self):
+        if (self.task_ids is None) == (self.filter is None):
+            raise ValueError("Provide exactly one of task_ids or filter")
+        if self.status is None and self.priority is None and self.percentage is None:
+            raise ValueError("Provide at least one of status, priority or percentage")
+        return self
+
+
 class TaskResponse(BaseModel):
     id: int
     title: str
@@ -32,8 +65,106 @@ class TaskResponse(BaseModel):
     task_list_id: int
     created_at: datetime
     updated_at: Optional[datetime]
+    # Changes on every write; sent back in If-Match for optimistic concurrency
+    version: int
+
+    @classmethod
+    def from_entity(cls, task: Union[Task, TaskRecord]) -> "TaskResponse":
+        """Build the response from a task without validating its fields again"""
+        return cls.model_construct(
+            id=task.id,
+            title=task.title,
+            description=task.description,
+            status=task.status,
+            percentage=task.percentage,
+            priority=task.priority,
+            task_list_id=task.task_list_id,
+            created_at=task.created_at,
+            updated_at=task.updated_at,
+            version=task.version
+        )
+
+
+class BulkCreateTasksResponse(BaseModel):
+    created_ids: List[int]
+
+
+class BulkUpdateTasksResponse(BaseModel):
+    updated: int
+
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+
+class ImportTasksResponse(BaseModel):
+    imported: int
+    failed: int
+    # Only the first rejected rows are reported; `failed` counts all of them
+    errors: List[ImportRowError]
+
+
+class TaskPageResponse(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str]
+
+
+class TaskEventResponse(BaseModel):
+    """Data of a task list event stream message; the event type is the SSE event name"""
+    task_list_id: int
+    # The task as written, or as it was when deleted; None for a resync
+    task: Optional[TaskResponse] = None
+
+
+def parse_sort(value: str) -> Tuple[TaskSort, ...]:
+    """Parse comma-separated sort fields, each optionally prefixed with '-' for descending"""
+    keys = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        descending = item.startswith("-")
+        name = item[1:] if descending else item
+        try:
+            keys.append(TaskSort(TaskSortField(name), descending))
+        except ValueError:
+            allowed = ", ".join(field.value for field in TaskSortField)
+            raise ValueError(f"Unknown sort field '{name}', expected one of: {allowed}")
+    return tuple(keys)
 
 
 class TaskFilterRequest(BaseModel):
-    status: Optional[TaskStatus] = None
-    priority: Optional[TaskPriority] = None 
\ No newline at end of file
+    # Hashable, so filtered reads can be cached by their filters
+    model_config = ConfigDict(frozen=True)
+
+    status: Tuple[TaskStatus, ...] = ()
+    priority: Tuple[TaskPriority, ...] = ()
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    min_percentage: Optional[int] = Field(None, ge=0, le=100)
+    max_percentage: Optional[int] = Field(None, ge=0, le=100)
+    # e.g. "-priority,created_at": most urgent first, then oldest first
+    sort: Optional[str] = None
+
+    @field_validator("sort")
+    @classmethod
+    def validate_sort(cls, v):
+        if v is not None:
+            parse_sort(v)
+        return v
+
+    def to_query(self) -> TaskQuery:
+        return TaskQuery(
+            statuses=self.status,
+            priorities=self.priority,
+            created_after=self.created_after,
+            created_before=self.created_before,
+            updated_after=self.updated_after,
+            updated_before=self.updated_before,
+            min_percentage=self.min_percentage,
+            max_percentage=self.max_percentage,
+            sort=parse_sort(self.sort) if self.sort else ()
+        )
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 from pydantic import BaseModel, Field
+from ...domain.entities.task_list import TaskList
 from .task_dtos import TaskResponse, TaskFilterRequest
 
 
@@ -23,6 +24,28 @@ class TaskListResponse(BaseModel):
     completed_tasks: int
     created_at: datetime
     updated_at: Optional[datetime]
+    # Changes on every write to the list or its tasks
+    version: int
+
+    @classmethod
+    def from_entity(cls, task_list: TaskList) -> "TaskListResponse":
+        """Build the response from a task list without validating its fields again"""
+        return cls.model_construct(
+            id=task_list.id,
+            title=task_list.title,
+            description=task_list.description,
+            completion_percentage=task_list.completion_percentage,
+            total_tasks=task_list.total_tasks,
+            completed_tasks=task_list.completed_tasks,
+            created_at=task_list.created_at,
+            updated_at=task_list.updated_at,
+            version=task_list.version
+        )
+
+
+class TaskListPageResponse(BaseModel):
+    items: List[TaskListResponse]
+    next_cursor: Optional[str]
 
 
 class TaskListWithTasksResponse(BaseModel):
@@ -48,5 +71,6 @@ class TaskListWithFilteredTasksResponse(BaseModel):
     filter_applied: "TaskFilterRequest"
     created_at: datetime
     updated_at: Optional[datetime]
+    version: int
 
 TaskListWithFilteredTasksResponse.model_rebuild() 
\ No newline at end of file
@@ -0,0 +1,27 @@
+from typing import Optional, Sequence, Tuple
+
+from .dtos import TaskListResponse, TaskResponse
+
+# Fields that can be requested from each resource, in response order
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+TASK_LIST_FIELDS = tuple(TaskListResponse.model_fields)
+
+
+class InvalidFieldsError(ValueError):
+    """Raised when a sparse fieldset names an unknown field"""
+
+
+def parse_fields(raw: Optional[str], allowed: Sequence[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated `fields` parameter into field names in response order, or None
+    when every field is wanted. `id` is always included, since it identifies the resource
+    and positions the pagination cursor.
+    """
+    if raw is None:
+        return None
+
+    requested = {name.strip() for name in raw.split(",") if name.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise InvalidFieldsError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in allowed if name == "id" or name in requested)
@@ -0,0 +1,57 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursorError("Invalid pagination cursor")
+    
+    if not isinstance(payload, dict) or not isinstance(payload.get("id"), int):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return payload
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the keyset position (the last returned id) as an opaque cursor"""
+    return _encode({"id": last_id})
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decode an opaque cursor back into the id to continue after"""
+    if not cursor:
+        return None
+    return _decode(cursor)["id"]
+
+
+def encode_snapshot_cursor(offset: int, last_id: int) -> str:
+    """
+    Encode a position in results restricted to the rows up to `last_id` (a snapshot
+    taken on the first page) as an opaque cursor
+    """
+    return _encode({"offset": offset, "id": last_id})
+
+
+def decode_snapshot_cursor(cursor: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Decode a snapshot cursor back into the (offset, last id) to continue from"""
+    if not cursor:
+        return None
+    
+    payload = _decode(cursor)
+    offset = payload.get("offset")
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        raise InvalidCursorError("Invalid pagination cursor")
+    return offset, payload["id"]
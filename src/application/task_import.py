@@ -0,0 +1,77 @@
+import codecs
+import csv
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Literal, Optional, Tuple
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# (line number, parsed row or None, parse error or None)
+ParsedRow = Tuple[int, Optional[Any], Optional[str]]
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 byte chunks into lines, holding at most one partial line"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def parse_ndjson(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    """Parse one JSON object per line, skipping blank lines"""
+    line_number = 0
+    async for line in lines:
+        line_number += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line), None
+        except ValueError as e:
+            yield line_number, None, f"Invalid JSON: {e}"
+
+
+async def parse_csv(lines: AsyncIterable[str]) -> AsyncIterator[ParsedRow]:
+    """
+    Parse CSV with a header row into dicts, one record at a time. Quoted fields may span
+    several lines; empty fields are left out so the request defaults apply.
+    """
+    header = None
+    record, record_line, line_number = [], 0, 0
+    async for line in lines:
+        line_number += 1
+        if not record:
+            record_line = line_number
+        record.append(line)
+        # Quotes are escaped by doubling them, so an odd count means an open quoted field
+        text = "\n".join(record)
+        if text.count('"') % 2:
+            continue
+        record = []
+        if not text.strip():
+            continue
+
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            yield record_line, None, f"Invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield record_line, None, f"Expected {len(header)} fields, got {len(values)}"
+            continue
+        yield record_line, {name: value for name, value in zip(header, values) if value}, None
+
+    if record:
+        yield record_line, None, "Invalid CSV: unterminated quoted field"
+
+
+def parse_rows(lines: AsyncIterable[str], import_format: ImportFormat) -> AsyncIterator[ParsedRow]:
+    return parse_csv(lines) if import_format == "csv" else parse_ndjson(lines)
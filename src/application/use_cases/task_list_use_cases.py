@@ -1,17 +1,21 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, Optional, Tuple
 from ...domain.entities.task_list import TaskList
-from ...domain.repositories.task_list_repository import TaskListRepository
-from ...domain.repositories.task_repository import TaskRepository
+from ...domain.repositories.unit_of_work import UnitOfWork
+from ..cache import ResponseCache, cached_by_task_list
 from ..dtos.task_list_dtos import (
-    CreateTaskListRequest, UpdateTaskListRequest, TaskListResponse
+    CreateTaskListRequest, UpdateTaskListRequest, TaskListResponse, TaskListPageResponse
 )
+from ..pagination import decode_cursor, encode_cursor
 
 
 class TaskListUseCases:
-    def __init__(self, task_list_repo: TaskListRepository, task_repo: TaskRepository):
-        self.task_list_repo = task_list_repo
-        self.task_repo = task_repo
+    def __init__(self, uow: UnitOfWork, cache: Optional[ResponseCache] = None):
+        # Each write use case runs in one unit of work and commits once
+        self.uow = uow
+        self.task_list_repo = uow.task_lists
+        self.task_repo = uow.tasks
+        self.cache = cache
 
     async def create_task_list(self, request: CreateTaskListRequest) -> TaskListResponse:
         """Create a new task list"""
@@ -21,98 +25,100 @@ class TaskListUseCases:
             created_at=datetime.utcnow()
         )
         
-        created_task_list = await self.task_list_repo.create(task_list)
+        async with self.uow:
+            created_task_list = await self.task_list_repo.create(task_list)
         
-        return TaskListResponse(
-            id=created_task_list.id,
-            title=created_task_list.title,
-            description=created_task_list.description,
-            completion_percentage=created_task_list.completion_percentage,
-            total_tasks=created_task_list.total_tasks,
-            completed_tasks=created_task_list.completed_tasks,
-            created_at=created_task_list.created_at,
-            updated_at=created_task_list.updated_at
-        )
+        return TaskListResponse.from_entity(created_task_list)
+
+    async def get_task_list_version(self, task_list_id: int) -> Optional[int]:
+        """Get the version of a task list (None if it does not exist), for conditional requests"""
+        # Never cached: it is what tells whether a cached response is still current
+        return await self.task_list_repo.get_version(task_list_id)
 
+    @cached_by_task_list
     async def get_task_list(self, task_list_id: int) -> Optional[TaskListResponse]:
         """Get a task list by ID"""
+        # The repository returns the list with its stored task aggregates
         task_list = await self.task_list_repo.get_by_id(task_list_id)
         if not task_list:
             return None
         
-        # Get tasks for this list
-        tasks = await self.task_repo.get_by_task_list_id(task_list_id)
-        task_list.tasks = tasks
+        return TaskListResponse.from_entity(task_list)
+
+    @cached_by_task_list
+    async def get_task_list_fields(
+        self,
+        task_list_id: int,
+        fields: Tuple[str, ...]
+    ) -> Optional[Dict[str, Any]]:
+        """Get only the given fields of a task list"""
+        return await self.task_list_repo.get_fields_by_id(task_list_id, fields)
+
+    async def get_all_task_lists(
+        self,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> TaskListPageResponse:
+        """Get a page of task lists"""
+        # Aggregates are computed by the repository in one query instead of per list.
+        # One extra row is fetched to know whether another page exists.
+        task_lists = await self.task_list_repo.get_all_with_stats(
+            after_id=decode_cursor(cursor), limit=limit + 1
+        )
+        has_more = len(task_lists) > limit
+        task_lists = task_lists[:limit]
         
-        return TaskListResponse(
-            id=task_list.id,
-            title=task_list.title,
-            description=task_list.description,
-            completion_percentage=task_list.completion_percentage,
-            total_tasks=task_list.total_tasks,
-            completed_tasks=task_list.completed_tasks,
-            created_at=task_list.created_at,
-            updated_at=task_list.updated_at
+        items = [TaskListResponse.from_entity(task_list) for task_list in task_lists]
+        
+        return TaskListPageResponse(
+            items=items,
+            next_cursor=encode_cursor(task_lists[-1].id) if has_more else None
         )
 
-    async def get_all_task_lists(self) -> List[TaskListResponse]:
-        """Get all task lists"""
-        task_lists = await self.task_list_repo.get_all()
-        
-        result = []
-        for task_list in task_lists:
-            # Get tasks for each list
-            tasks = await self.task_repo.get_by_task_list_id(task_list.id)
-            task_list.tasks = tasks
-            
-            result.append(TaskListResponse(
-                id=task_list.id,
-                title=task_list.title,
-                description=task_list.description,
-                completion_percentage=task_list.completion_percentage,
-                total_tasks=task_list.total_tasks,
-                completed_tasks=task_list.completed_tasks,
-                created_at=task_list.created_at,
-                updated_at=task_list.updated_at
-            ))
+    async def get_all_task_list_fields(
+        self,
+        fields: Tuple[str, ...],
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get a page of task lists with only the given fields (which include id)"""
+        rows = await self.task_list_repo.get_all_fields(
+            fields, after_id=decode_cursor(cursor), limit=limit + 1
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
         
-        return result
+        return {
+            "items": rows,
+            "next_cursor": encode_cursor(rows[-1]["id"]) if has_more else None
+        }
 
-    async def update_task_list(self, task_list_id: int, request: UpdateTaskListRequest) -> Optional[TaskListResponse]:
-        """Update a task list"""
-        task_list = await self.task_list_repo.get_by_id(task_list_id)
-        if not task_list:
+    async def update_task_list(
+        self,
+        task_list_id: int,
+        request: UpdateTaskListRequest,
+        expected_version: Optional[int] = None
+    ) -> Optional[TaskListResponse]:
+        """Update a task list, optionally only if it is still at `expected_version`"""
+        # Only the provided fields are written; the repository returns the updated row
+        async with self.uow:
+            updated_task_list = await self.task_list_repo.update(
+                task_list_id,
+                expected_version=expected_version,
+                title=request.title,
+                description=request.description
+            )
+        if not updated_task_list:
             return None
         
-        # Update fields if provided
-        if request.title is not None:
-            task_list.title = request.title
-        if request.description is not None:
-            task_list.description = request.description
-        
-        task_list.updated_at = datetime.utcnow()
-        
-        updated_task_list = await self.task_list_repo.update(task_list)
-        
-        # Get tasks for this list
-        tasks = await self.task_repo.get_by_task_list_id(task_list_id)
-        updated_task_list.tasks = tasks
-        
-        return TaskListResponse(
-            id=updated_task_list.id,
-            title=updated_task_list.title,
-            description=updated_task_list.description,
-            completion_percentage=updated_task_list.completion_percentage,
-            total_tasks=updated_task_list.total_tasks,
-            completed_tasks=updated_task_list.completed_tasks,
-            created_at=updated_task_list.created_at,
-            updated_at=updated_task_list.updated_at
-        )
+        return TaskListResponse.from_entity(updated_task_list)
 
     async def delete_task_list(self, task_list_id: int) -> bool:
         """Delete a task list and all its tasks"""
-        # First delete all tasks in the list
-        await self.task_repo.delete_by_task_list_id(task_list_id)
-        
-        # Then delete the task list
-        return await self.task_list_repo.delete(task_list_id) 
\ No newline at end of file
+        # Both deletes commit together, so a failure cannot leave an emptied list behind
+        async with self.uow:
+            # First delete all tasks in the list
+            await self.task_repo.delete_by_task_list_id(task_list_id)
+            
+            # Then delete the task list
+            return await self.task_list_repo.delete(task_list_id) 
\ No newline at end of file
@@ -1,26 +1,31 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
 from ...domain.entities.task import Task, TaskStatus, TaskPriority
-from ...domain.repositories.task_repository import TaskRepository
-from ...domain.repositories.task_list_repository import TaskListRepository
+from ...domain.repositories.unit_of_work import UnitOfWork
 from ..dtos.task_dtos import (
-    CreateTaskRequest, UpdateTaskRequest, UpdateTaskStatusRequest, TaskResponse, TaskFilterRequest
+    CreateTaskRequest, BulkCreateTasksRequest, UpdateTaskRequest, UpdateTaskStatusRequest,
+    BulkUpdateTasksRequest, TaskResponse, TaskPageResponse, BulkCreateTasksResponse,
+    BulkUpdateTasksResponse, ImportRowError, ImportTasksResponse, TaskFilterRequest
 )
+from ..cache import ResponseCache, cached_by_task_list
+from ..task_import import ParsedRow
 from ..dtos.task_list_dtos import TaskListWithFilteredTasksResponse
+from ..pagination import (
+    decode_cursor, encode_cursor, decode_snapshot_cursor, encode_snapshot_cursor
+)
 
 
 class TaskUseCases:
-    def __init__(self, task_repo: TaskRepository, task_list_repo: TaskListRepository):
-        self.task_repo = task_repo
-        self.task_list_repo = task_list_repo
+    def __init__(self, uow: UnitOfWork, cache: Optional[ResponseCache] = None):
+        # Each write use case runs in one unit of work and commits once
+        self.uow = uow
+        self.task_repo = uow.tasks
+        self.task_list_repo = uow.task_lists
+        self.cache = cache
 
     async def create_task(self, task_list_id: int, request: CreateTaskRequest) -> Optional[TaskResponse]:
         """Create a new task in a task list"""
-        # Verify task list exists
-        task_list = await self.task_list_repo.get_by_id(task_list_id)
-        if not task_list:
-            return None
-        
         task = Task(
             title=request.title,
             description=request.description,
@@ -30,19 +35,101 @@ class TaskUseCases:
             created_at=datetime.utcnow()
         )
         
-        created_task = await self.task_repo.create(task)
-        
-        return TaskResponse(
-            id=created_task.id,
-            title=created_task.title,
-            description=created_task.description,
-            status=created_task.status,
-            percentage=created_task.percentage,
-            priority=created_task.priority,
-            task_list_id=created_task.task_list_id,
-            created_at=created_task.created_at,
-            updated_at=created_task.updated_at
-        )
+        # The repository reports a missing task list, so no separate lookup is needed
+        async with self.uow:
+            created_task = await self.task_repo.create(task)
+        if not created_task:
+            return None
+        
+        return TaskResponse.from_entity(created_task)
+
+    async def create_tasks_bulk(
+        self,
+        task_list_id: int,
+        request: BulkCreateTasksRequest
+    ) -> Optional[BulkCreateTasksResponse]:
+        """Create many tasks in a task list with a single insert and commit"""
+        now = datetime.utcnow()
+        # The items were already validated by CreateTaskRequest, so skip validating them again
+        tasks = [
+            Task.model_construct(
+                title=item.title,
+                description=item.description,
+                priority=item.priority,
+                percentage=item.percentage,
+                task_list_id=task_list_id,
+                created_at=now
+            )
+            for item in request.tasks
+        ]
+        
+        async with self.uow:
+            created_ids = await self.task_repo.create_many(task_list_id, tasks)
+        if created_ids is None:
+            return None
+        
+        return BulkCreateTasksResponse(created_ids=created_ids)
+
+    async def import_tasks(
+        self,
+        task_list_id: int,
+        rows: AsyncIterable[ParsedRow],
+        batch_size: int = 1000,
+        max_reported_errors: int = 100
+    ) -> Optional[ImportTasksResponse]:
+        """
+        Import parsed rows into a task list. Rows are validated with the CreateTaskRequest
+        rules and inserted in batches, each committed on its own; invalid rows are counted
+        and reported without stopping the import. Only one batch is held in memory.
+        """
+        async with self.uow:
+            if await self.task_list_repo.get_version(task_list_id) is None:
+                return None
+        
+        imported = failed = 0
+        errors: List[ImportRowError] = []
+        batch: List[Task] = []
+        now = datetime.utcnow()
+        async for line, row, error in rows:
+            if error is None:
+                try:
+                    item = CreateTaskRequest.model_validate(row)
+                except ValidationError as e:
+                    error = "; ".join(
+                        f"{'.'.join(map(str, detail['loc'])) or 'row'}: {detail['msg']}"
+                        for detail in e.errors()
+                    )
+            if error is not None:
+                failed += 1
+                if len(errors) < max_reported_errors:
+                    errors.append(ImportRowError(line=line, error=error))
+                continue
+            
+            batch.append(Task.model_construct(
+                title=item.title,
+                description=item.description,
+                priority=item.priority,
+                percentage=item.percentage,
+                task_list_id=task_list_id,
+                created_at=now
+            ))
+            if len(batch) >= batch_size:
+                imported += await self._import_batch(task_list_id, batch)
+                batch = []
+        if batch:
+            imported += await self._import_batch(task_list_id, batch)
+        
+        return ImportTasksResponse(imported=imported, failed=failed, errors=errors)
+
+    async def _import_batch(self, task_list_id: int, batch: List[Task]) -> int:
+        async with self.uow:
+            created_ids = await self.task_repo.create_many(task_list_id, batch)
+        # The list may have been deleted while the file was being imported
+        return len(created_ids) if created_ids is not None else 0
+
+    async def get_task_version(self, task_id: int) -> Optional[int]:
+        """Get the version of a task (None if it does not exist), for conditional requests"""
+        return await self.task_repo.get_version(task_id)
 
     async def get_task(self, task_id: int) -> Optional[TaskResponse]:
         """Get a task by ID"""
@@ -50,72 +137,132 @@ class TaskUseCases:
         if not task:
             return None
         
-        return TaskResponse(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            status=task.status,
-            percentage=task.percentage,
-            priority=task.priority,
-            task_list_id=task.task_list_id,
-            created_at=task.created_at,
-            updated_at=task.updated_at
+        return TaskResponse.from_entity(task)
+
+    async def get_task_fields(
+        self,
+        task_id: int,
+        fields: Tuple[str, ...]
+    ) -> Optional[Dict[str, Any]]:
+        """Get only the given fields of a task"""
+        return await self.task_repo.get_fields_by_id(task_id, fields)
+
+    @cached_by_task_list
+    async def get_tasks_by_list(
+        self,
+        task_list_id: int,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> TaskPageResponse:
+        """Get a page of tasks for a specific task list"""
+        tasks = await self.task_repo.get_by_task_list_id(
+            task_list_id, after_id=decode_cursor(cursor), limit=limit + 1
+        )
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+        
+        items = [TaskResponse.from_entity(task) for task in tasks]
+        
+        return TaskPageResponse(
+            items=items,
+            next_cursor=encode_cursor(tasks[-1].id) if has_more else None
         )
 
-    async def get_tasks_by_list(self, task_list_id: int) -> List[TaskResponse]:
-        """Get all tasks for a specific task list"""
-        tasks = await self.task_repo.get_by_task_list_id(task_list_id)
-        
-        return [
-            TaskResponse(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                status=task.status,
-                percentage=task.percentage,
-                priority=task.priority,
-                task_list_id=task.task_list_id,
-                created_at=task.created_at,
-                updated_at=task.updated_at
-            )
-            for task in tasks
-        ]
+    @cached_by_task_list
+    async def get_task_fields_by_list(
+        self,
+        task_list_id: int,
+        fields: Tuple[str, ...],
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get a page of tasks for a task list with only the given fields (which include id)"""
+        rows = await self.task_repo.get_fields_by_task_list_id(
+            task_list_id, fields, after_id=decode_cursor(cursor), limit=limit + 1
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        return {
+            "items": rows,
+            "next_cursor": encode_cursor(rows[-1]["id"]) if has_more else None
+        }
 
-    async def get_filtered_tasks(
-        self, 
-        task_list_id: int, 
+    async def search_tasks(
+        self,
+        query: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        task_list_id: Optional[int] = None,
         status: Optional[TaskStatus] = None,
         priority: Optional[TaskPriority] = None
+    ) -> TaskPageResponse:
+        """
+        Get a page of the tasks matching a full-text query, most relevant first.
+        Pages after the first only consider the tasks that existed when the first page was
+        read, so tasks created meanwhile are neither returned nor push results to later pages.
+        Editing or deleting matching tasks between pages can still move results across them.
+        """
+        position = decode_snapshot_cursor(cursor)
+        if position is None:
+            offset, max_id = 0, await self.task_repo.get_last_id()
+            if max_id is None:
+                return TaskPageResponse(items=[], next_cursor=None)
+        else:
+            offset, max_id = position
+        
+        tasks = await self.task_repo.search(
+            query,
+            task_list_id=task_list_id,
+            status=status,
+            priority=priority,
+            max_id=max_id,
+            offset=offset,
+            limit=limit + 1
+        )
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+        
+        return TaskPageResponse(
+            items=[TaskResponse.from_entity(task) for task in tasks],
+            next_cursor=encode_snapshot_cursor(offset + limit, max_id) if has_more else None
+        )
+
+    async def rebuild_search_index(self):
+        """Rebuild the full-text search index from the stored tasks"""
+        async with self.uow:
+            await self.task_repo.rebuild_search_index()
+
+    async def export_tasks(
+        self,
+        task_list_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[str]:
+        """Stream the tasks of a list (or of all lists) as NDJSON, one chunk per fetched batch"""
+        async for tasks in self.task_repo.stream_tasks(task_list_id, batch_size):
+            yield "".join(
+                TaskResponse.from_entity(task).model_dump_json() + "\n" for task in tasks
+            )
+
+    @cached_by_task_list
+    async def get_filtered_tasks(
+        self,
+        task_list_id: int,
+        filters: Optional[TaskFilterRequest] = None
     ) -> Optional[TaskListWithFilteredTasksResponse]:
-        """Get filtered tasks by status and/or priority"""
-        # Verify task list exists
-        task_list = await self.task_list_repo.get_by_id(task_list_id)
+        """Get the tasks of a list matching the filters, in the requested order"""
+        filters = filters or TaskFilterRequest()
+        # The list, its list-wide aggregates and the filtered tasks come back in one query
+        task_list = await self.task_list_repo.get_with_filtered_tasks(
+            task_list_id, filters.to_query()
+        )
         if not task_list:
             return None
         
-        # Get filtered tasks
-        filtered_tasks = await self.task_repo.get_filtered_tasks(task_list_id, status, priority)
-        
         # Convert to response DTOs
-        task_responses = [
-            TaskResponse(
-                id=task.id,
-                title=task.title,
-                description=task.description,
-                status=task.status,
-                percentage=task.percentage,
-                priority=task.priority,
-                task_list_id=task.task_list_id,
-                created_at=task.created_at,
-                updated_at=task.updated_at
-            )
-            for task in filtered_tasks
-        ]
-        
-        # Create filter request for response
-        filter_request = TaskFilterRequest(status=status, priority=priority)
+        task_responses = [TaskResponse.from_entity(task) for task in task_list.tasks]
         
-        return TaskListWithFilteredTasksResponse(
+        return TaskListWithFilteredTasksResponse.model_construct(
             id=task_list.id,
             title=task_list.title,
             description=task_list.description,
@@ -123,65 +270,67 @@ class TaskUseCases:
             total_tasks=task_list.total_tasks,
             completed_tasks=task_list.completed_tasks,
             filtered_tasks=task_responses,
-            filter_applied=filter_request,
+            filter_applied=filters,
             created_at=task_list.created_at,
-            updated_at=task_list.updated_at
+            updated_at=task_list.updated_at,
+            version=task_list.version
         )
 
-    async def update_task(self, task_id: int, request: UpdateTaskRequest) -> Optional[TaskResponse]:
-        """Update a task"""
-        task = await self.task_repo.get_by_id(task_id)
-        if not task:
+    async def update_task(
+        self,
+        task_id: int,
+        request: UpdateTaskRequest,
+        expected_version: Optional[int] = None
+    ) -> Optional[TaskResponse]:
+        """Update a task, optionally only if it is still at `expected_version`"""
+        # Only the provided fields are written; the repository returns the updated row
+        async with self.uow:
+            updated_task = await self.task_repo.update(
+                task_id,
+                expected_version=expected_version,
+                title=request.title,
+                description=request.description,
+                priority=request.priority,
+                percentage=request.percentage
+            )
+        if not updated_task:
             return None
         
-        # Update fields if provided
-        if request.title is not None:
-            task.title = request.title
-        if request.description is not None:
-            task.description = request.description
-        if request.priority is not None:
-            task.priority = request.priority
-        if request.percentage is not None:
-            task.update_percentage(request.percentage)
-        
-        task.updated_at = datetime.utcnow()
-        
-        updated_task = await self.task_repo.update(task)
-        
-        return TaskResponse(
-            id=updated_task.id,
-            title=updated_task.title,
-            description=updated_task.description,
-            status=updated_task.status,
-            percentage=updated_task.percentage,
-            priority=updated_task.priority,
-            task_list_id=updated_task.task_list_id,
-            created_at=updated_task.created_at,
-            updated_at=updated_task.updated_at
-        )
+        return TaskResponse.from_entity(updated_task)
 
-    async def update_task_status(self, task_id: int, request: UpdateTaskStatusRequest) -> Optional[TaskResponse]:
-        """Update task status"""
-        task = await self.task_repo.get_by_id(task_id)
-        if not task:
+    async def update_task_status(
+        self,
+        task_id: int,
+        request: UpdateTaskStatusRequest,
+        expected_version: Optional[int] = None
+    ) -> Optional[TaskResponse]:
+        """Update task status, optionally only if the task is still at `expected_version`"""
+        async with self.uow:
+            updated_task = await self.task_repo.update_status(
+                task_id, request.status, expected_version
+            )
+        if not updated_task:
             return None
         
-        task.update_status(request.status)
-        
-        updated_task = await self.task_repo.update_status(task_id, request.status)
+        return TaskResponse.from_entity(updated_task)
+
+    async def update_tasks_bulk(self, request: BulkUpdateTasksRequest) -> BulkUpdateTasksResponse:
+        """Update status/priority/percentage of many tasks with one set-based update"""
+        task_filter = request.filter
+        async with self.uow:
+            updated = await self.task_repo.update_many(
+                task_ids=request.task_ids,
+                task_list_id=task_filter.task_list_id if task_filter else None,
+                status_filter=task_filter.status if task_filter else None,
+                priority_filter=task_filter.priority if task_filter else None,
+                status=request.status,
+                priority=request.priority,
+                percentage=request.percentage
+            )
         
-        return TaskResponse(
-            id=updated_task.id,
-            title=updated_task.title,
-            description=updated_task.description,
-            status=updated_task.status,
-            percentage=updated_task.percentage,
-            priority=updated_task.priority,
-            task_list_id=updated_task.task_list_id,
-            created_at=updated_task.created_at,
-            updated_at=updated_task.updated_at
-        )
+        return BulkUpdateTasksResponse(updated=updated)
 
     async def delete_task(self, task_id: int) -> bool:
         """Delete a task"""
-        return await self.task_repo.delete(task_id) 
\ No newline at end of file
+        async with self.uow:
+            return await self.task_repo.delete(task_id) 
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+Maintenance commands for the Task Management API.
+
+Usage:
+    python -m src.cli migrate [--status]
+    python -m src.cli rebuild-counters
+    python -m src.cli rebuild-search
+    python -m src.cli import-tasks TASK_LIST_ID FILE [--format ndjson|csv] [--batch-size N]
+"""
+import argparse
+import asyncio
+from typing import AsyncIterator
+
+from .infrastructure.database import (
+    SessionLocal, init_db, close_db, migrate_db, get_pending_migrations
+)
+from .application.task_import import iter_lines, parse_rows
+from .application.use_cases import TaskUseCases
+from .config import settings
+from .infrastructure.unit_of_work import SQLAlchemyUnitOfWork
+
+READ_CHUNK_SIZE = 64 * 1024
+
+
+async def migrate(args: argparse.Namespace) -> None:
+    """Apply (or only list, with --status) the pending schema migrations"""
+    await init_db(migrate=False)
+    if args.status:
+        pending = await get_pending_migrations()
+        print("Pending migrations:" if pending else "Database schema is up to date")
+    else:
+        pending = await migrate_db()
+        print("Applied migrations:" if pending else "No pending migrations")
+    for description in pending:
+        print(f"  {description}")
+
+
+async def rebuild_counters(args: argparse.Namespace) -> None:
+    """Recompute the materialized task counters of every task list"""
+    await init_db()
+    async with SessionLocal() as session:
+        async with SQLAlchemyUnitOfWork(session) as uow:
+            updated = await uow.task_lists.rebuild_stats()
+    print(f"Rebuilt task counters for {updated} task list(s)")
+
+
+async def rebuild_search(args: argparse.Namespace) -> None:
+    """Rebuild the full-text search index of the tasks"""
+    await init_db()
+    async with SessionLocal() as session:
+        await TaskUseCases(SQLAlchemyUnitOfWork(session)).rebuild_search_index()
+    print("Rebuilt the task search index")
+
+
+async def _read_chunks(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        while chunk := file.read(READ_CHUNK_SIZE):
+            yield chunk
+
+
+async def import_tasks(args: argparse.Namespace) -> None:
+    """Import tasks from an NDJSON or CSV file into a task list"""
+    await init_db()
+    import_format = args.format or ("csv" if args.file.lower().endswith(".csv") else "ndjson")
+    rows = parse_rows(iter_lines(_read_chunks(args.file)), import_format)
+    async with SessionLocal() as session:
+        result = await TaskUseCases(SQLAlchemyUnitOfWork(session)).import_tasks(
+            args.task_list_id,
+            rows,
+            batch_size=args.batch_size,
+            max_reported_errors=settings.IMPORT_MAX_REPORTED_ERRORS
+        )
+    if result is None:
+        raise SystemExit(f"Task list {args.task_list_id} not found")
+    print(f"Imported {result.imported} task(s), rejected {result.failed} row(s)")
+    for row_error in result.errors:
+        print(f"  line {row_error.line}: {row_error.error}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Task Management API maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser("migrate", help="Apply pending schema migrations")
+    migrate_parser.add_argument(
+        "--status", action="store_true", help="Only list the pending migrations"
+    )
+    migrate_parser.set_defaults(handler=migrate)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-counters", help="Recompute the task counters stored on every task list"
+    )
+    rebuild_parser.set_defaults(handler=rebuild_counters)
+
+    search_parser = subparsers.add_parser(
+        "rebuild-search", help="Rebuild the full-text search index of the tasks"
+    )
+    search_parser.set_defaults(handler=rebuild_search)
+
+    import_parser = subparsers.add_parser(
+        "import-tasks", help="Import tasks from an NDJSON or CSV file into a task list"
+    )
+    import_parser.add_argument("task_list_id", type=int)
+    import_parser.add_argument("file", help="Path of the file to import")
+    import_parser.add_argument(
+        "--format", choices=("ndjson", "csv"), help="File format (default: from the extension)"
+    )
+    import_parser.add_argument(
+        "--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE,
+        help="Rows inserted and committed per transaction"
+    )
+    import_parser.set_defaults(handler=import_tasks)
+
+    return parser
+
+
+async def _run(args: argparse.Namespace) -> None:
+    try:
+        await args.handler(args)
+    finally:
+        await close_db()
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
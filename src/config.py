@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,6 +14,58 @@ class AppSettings(BaseSettings):
 
     # Database settings
     DATABASE_URL: str = "sqlite+aiosqlite:///./data/task_management.db"
+    # Size of the read-only connection pool (writes always go through a single connection)
+    DATABASE_READ_POOL_SIZE: int = 8
+    # Seconds to wait for a pooled connection before failing
+    DATABASE_POOL_TIMEOUT: int = 30
+    # Group commit: gather concurrent writes arriving within a short window into one transaction
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_WINDOW_MS: int = 5
+    GROUP_COMMIT_MAX_BATCH_SIZE: int = 100
+    # Apply pending schema migrations on startup
+    AUTO_MIGRATE: bool = True
+
+    # SQLite storage profile, applied as PRAGMAs to every new connection
+    SQLITE_JOURNAL_MODE: Literal["DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"] = "WAL"
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_CACHE_SIZE: int = -64000  # Negative values are KiB, positive values are pages
+    SQLITE_MMAP_SIZE: int = 268435456  # Bytes
+    SQLITE_BUSY_TIMEOUT: int = 5000  # Milliseconds
+    SQLITE_TEMP_STORE: Literal["DEFAULT", "FILE", "MEMORY"] = "MEMORY"
+
+    # In-process cache of read responses, invalidated by committed writes (0 entries disables it)
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1000
+    RESPONSE_CACHE_TTL_SECONDS: float = 30.0
+
+    # Pagination settings
+    DEFAULT_PAGE_SIZE: int = 100
+    MAX_PAGE_SIZE: int = 1000
+    # Rows fetched from the database per batch when streaming an export
+    EXPORT_BATCH_SIZE: int = 1000
+    # Rows inserted (and committed) per batch when importing a file, and rejected rows reported
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 100
+
+    # Task list event streams: events queued per subscriber before it is told to resync, and
+    # seconds between keep-alive comments on an idle stream
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+
+    # Transactional outbox: change notifications stored with each write and delivered in the
+    # background to a sink ("file" appends NDJSON, "http" POSTs JSON arrays)
+    OUTBOX_ENABLED: bool = False
+    OUTBOX_SINK: Literal["file", "http"] = "file"
+    OUTBOX_FILE_PATH: str = "./data/outbox.ndjson"
+    OUTBOX_HTTP_URL: str = "http://localhost:9000/events"
+    OUTBOX_HTTP_TIMEOUT_SECONDS: float = 10.0
+    OUTBOX_BATCH_SIZE: int = 100
+    # Seconds between polls when idle (commits also wake the dispatcher), and retry backoff
+    OUTBOX_POLL_SECONDS: float = 1.0
+    OUTBOX_RETRY_BASE_SECONDS: float = 0.5
+    OUTBOX_RETRY_MAX_SECONDS: float = 60.0
+
+    # Prometheus metrics at /metrics: request, response size and database timings
+    METRICS_ENABLED: bool = True
 
     # Pydantic settings configuration
     model_config = SettingsConfigDict(
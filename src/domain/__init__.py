@@ -1,8 +1,13 @@
 # Domain layer package 
-from .entities import TaskList, Task, TaskStatus, TaskPriority
-from .repositories import TaskListRepository, TaskRepository
+from .entities import (
+    TaskList, TaskListStats, Task, TaskStatus, TaskPriority, TaskCollection, TaskRecord,
+    TaskQuery, TaskSort, TaskSortField
+)
+from .exceptions import VersionConflictError
+from .repositories import TaskListRepository, TaskRepository, UnitOfWork
 
 __all__ = [
-    "TaskList", "Task", "TaskStatus", "TaskPriority",
-    "TaskListRepository", "TaskRepository"
+    "TaskList", "TaskListStats", "Task", "TaskStatus", "TaskPriority", "TaskCollection",
+    "TaskRecord", "TaskQuery", "TaskSort", "TaskSortField",
+    "VersionConflictError", "TaskListRepository", "TaskRepository", "UnitOfWork"
 ] 
\ No newline at end of file
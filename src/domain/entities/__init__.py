@@ -1,4 +1,9 @@
-from .task_list import TaskList
-from .task import Task, TaskStatus, TaskPriority
+from .task_list import TaskList, TaskListStats
+from .task import Task, TaskStatus, TaskPriority, STATUS_PERCENTAGE
+from .task_collection import TaskCollection, TaskRecord
+from .task_query import TaskQuery, TaskSort, TaskSortField
 
-__all__ = ["TaskList", "Task", "TaskStatus", "TaskPriority"] 
\ No newline at end of file
+__all__ = [
+    "TaskList", "TaskListStats", "Task", "TaskStatus", "TaskPriority", "STATUS_PERCENTAGE",
+    "TaskCollection", "TaskRecord", "TaskQuery", "TaskSort", "TaskSortField"
+]
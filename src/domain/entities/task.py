@@ -1,7 +1,7 @@
 from datetime import datetime
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 
 
 class TaskStatus(str, Enum):
@@ -18,6 +18,13 @@ class TaskPriority(str, Enum):
     URGENT = "urgent"
 
 
+# Percentage a task is forced to when it moves to one of these statuses
+STATUS_PERCENTAGE = {
+    TaskStatus.COMPLETED: 100,
+    TaskStatus.PENDING: 0,
+}
+
+
 class Task(BaseModel):
     id: Optional[int] = None
     title: str = Field(..., min_length=1, max_length=200)
@@ -28,8 +35,11 @@ class Task(BaseModel):
     task_list_id: int
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # Optimistic concurrency version, incremented on every write
+    version: int = 0
 
-    @validator('percentage')
+    @field_validator('percentage')
+    @classmethod
     def validate_percentage(cls, v):
         if v < 0 or v > 100:
             raise ValueError('Percentage must be between 0 and 100')
@@ -40,10 +50,8 @@ class Task(BaseModel):
         self.updated_at = datetime.utcnow()
         
         # Auto-update percentage based on status
-        if new_status == TaskStatus.COMPLETED:
-            self.percentage = 100
-        elif new_status == TaskStatus.PENDING:
-            self.percentage = 0
+        if new_status in STATUS_PERCENTAGE:
+            self.percentage = STATUS_PERCENTAGE[new_status]
 
     def update_percentage(self, new_percentage: int):
         if new_percentage < 0 or new_percentage > 100:
@@ -0,0 +1,168 @@
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from pydantic_core import core_schema
+from .task import Task, TaskStatus, TaskPriority
+
+
+class TaskRecord:
+    """
+    Slotted, unvalidated task used when many tasks are held in memory. It has the same
+    attributes as Task, which stays the validated type at the API boundary.
+    """
+    __slots__ = (
+        "id", "title", "description", "status", "percentage", "priority", "task_list_id",
+        "created_at", "updated_at", "version"
+    )
+
+    def __init__(
+        self,
+        id: Optional[int],
+        title: str,
+        description: Optional[str],
+        status: TaskStatus,
+        percentage: int,
+        priority: TaskPriority,
+        task_list_id: int,
+        created_at: Optional[datetime] = None,
+        updated_at: Optional[datetime] = None,
+        version: int = 0
+    ):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.status = status
+        self.percentage = percentage
+        self.priority = priority
+        self.task_list_id = task_list_id
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.version = version
+
+    @classmethod
+    def from_entity(cls, task: Task) -> "TaskRecord":
+        return cls(*(getattr(task, name) for name in cls.__slots__))
+
+    def to_entity(self) -> Task:
+        return Task.model_construct(**{name: getattr(self, name) for name in self.__slots__})
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TaskRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"TaskRecord(id={self.id!r}, title={self.title!r}, status={self.status!r})"
+
+
+class TaskCollection:
+    """
+    Ordered tasks of a list as TaskRecords, with O(1) lookup by ID and running status
+    counts and percentage sum, so the aggregates never iterate the tasks. Records must
+    not be modified while they are in the collection: remove and add them again instead.
+    IDs are unique: adding a task whose ID is present replaces that task in its position.
+
+    Removing leaves a tombstone (None) in place, so the positions in the index stay valid
+    and removal is O(1); tombstones are compacted away once they outnumber the records,
+    or before positional access.
+    """
+    __slots__ = ("_records", "_index", "_removed", "_status_counts", "percentage_sum")
+
+    def __init__(self, tasks: Iterable[Union[Task, TaskRecord]] = ()):
+        self._records: List[Optional[TaskRecord]] = []
+        self._index: Dict[int, int] = {}
+        self._removed = 0
+        self._status_counts: Counter = Counter()
+        self.percentage_sum = 0
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task: Union[Task, TaskRecord]) -> TaskRecord:
+        record = task if isinstance(task, TaskRecord) else TaskRecord.from_entity(task)
+        position = self._index.get(record.id) if record.id is not None else None
+        if position is None:
+            if record.id is not None:
+                self._index[record.id] = len(self._records)
+            self._records.append(record)
+        else:
+            replaced = self._records[position]
+            self._status_counts[replaced.status] -= 1
+            self.percentage_sum -= replaced.percentage
+            self._records[position] = record
+        self._status_counts[record.status] += 1
+        self.percentage_sum += record.percentage
+        return record
+
+    def remove(self, task_id: int) -> Optional[TaskRecord]:
+        position = self._index.pop(task_id, None)
+        if position is None:
+            return None
+
+        record = self._records[position]
+        self._records[position] = None
+        self._removed += 1
+        self._status_counts[record.status] -= 1
+        self.percentage_sum -= record.percentage
+        if self._removed * 2 > len(self._records):
+            self._compact()
+        return record
+
+    def _compact(self):
+        self._records = [record for record in self._records if record is not None]
+        self._index = {
+            record.id: position
+            for position, record in enumerate(self._records)
+            if record.id is not None
+        }
+        self._removed = 0
+
+    def get(self, task_id: int) -> Optional[TaskRecord]:
+        position = self._index.get(task_id)
+        return self._records[position] if position is not None else None
+
+    def count(self, status: TaskStatus) -> int:
+        return self._status_counts[status]
+
+    @property
+    def completed_count(self) -> int:
+        return self._status_counts[TaskStatus.COMPLETED]
+
+    @property
+    def completion_percentage(self) -> int:
+        if not len(self):
+            return 0
+        return self.percentage_sum // len(self)
+
+    def to_entities(self) -> List[Task]:
+        return [record.to_entity() for record in self]
+
+    def __len__(self) -> int:
+        return len(self._records) - self._removed
+
+    def __iter__(self) -> Iterator[TaskRecord]:
+        if not self._removed:
+            return iter(self._records)
+        return (record for record in self._records if record is not None)
+
+    def __getitem__(self, index):
+        if self._removed:
+            self._compact()
+        return self._records[index]
+
+    @classmethod
+    def _validate(cls, value: Any) -> "TaskCollection":
+        if isinstance(value, TaskCollection):
+            return value
+        return cls(
+            item if isinstance(item, (Task, TaskRecord)) else Task(**item) for item in value
+        )
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        # Lets Pydantic entities hold a collection, accepting any iterable of tasks
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda collection: collection.to_entities()
+            )
+        )
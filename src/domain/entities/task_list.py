@@ -1,42 +1,82 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional, Union
 from pydantic import BaseModel, Field
 from .task import Task, TaskStatus
+from .task_collection import TaskCollection, TaskRecord
+
+
+class TaskListStats(BaseModel):
+    """Task aggregates of a task list computed outside of Python (e.g. by the database)"""
+    total_tasks: int = 0
+    completed_tasks: int = 0
+    percentage_sum: int = 0
+
+    @property
+    def completion_percentage(self) -> int:
+        if not self.total_tasks:
+            return 0
+        return self.percentage_sum // self.total_tasks
+
+    def add(self, task: Union[Task, TaskRecord]):
+        self.total_tasks += 1
+        self.percentage_sum += task.percentage
+        if task.status == TaskStatus.COMPLETED:
+            self.completed_tasks += 1
+
+    def remove(self, task: Union[Task, TaskRecord]):
+        self.total_tasks -= 1
+        self.percentage_sum -= task.percentage
+        if task.status == TaskStatus.COMPLETED:
+            self.completed_tasks -= 1
 
 
 class TaskList(BaseModel):
     id: Optional[int] = None
     title: str = Field(..., min_length=1, max_length=200)
     description: Optional[str] = Field(None, max_length=1000)
-    tasks: List[Task] = []
+    tasks: TaskCollection = Field(default_factory=TaskCollection)
+    # When set, the aggregates come from here instead of iterating `tasks`
+    stats: Optional[TaskListStats] = None
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
+    # Incremented on every write to the list or its tasks
+    version: int = 0
 
     @property
     def completion_percentage(self) -> int:
         """Calculate the completion percentage of the task list"""
-        if not self.tasks:
-            return 0
-        
-        total_percentage = sum(task.percentage for task in self.tasks)
-        return total_percentage // len(self.tasks)
+        if self.stats is not None:
+            return self.stats.completion_percentage
+        return self.tasks.completion_percentage
 
     @property
     def total_tasks(self) -> int:
+        if self.stats is not None:
+            return self.stats.total_tasks
         return len(self.tasks)
 
     @property
     def completed_tasks(self) -> int:
-        return len([task for task in self.tasks if task.status == TaskStatus.COMPLETED])
+        if self.stats is not None:
+            return self.stats.completed_tasks
+        return self.tasks.completed_count
 
-    def add_task(self, task: Task):
+    def add_task(self, task: Union[Task, TaskRecord]):
         task.task_list_id = self.id
-        self.tasks.append(task)
+        replaced = self.tasks.get(task.id)
+        record = self.tasks.add(task)
+        if self.stats is not None:
+            if replaced is not None:
+                self.stats.remove(replaced)
+            self.stats.add(record)
         self.updated_at = datetime.utcnow()
 
     def remove_task(self, task_id: int):
-        self.tasks = [task for task in self.tasks if task.id != task_id]
+        record = self.tasks.remove(task_id)
+        if record and self.stats is not None:
+            self.stats.remove(record)
         self.updated_at = datetime.utcnow()
 
     def get_task(self, task_id: int) -> Optional[Task]:
-        return next((task for task in self.tasks if task.id == task_id), None) 
\ No newline at end of file
+        record = self.tasks.get(task_id)
+        return record.to_entity() if record is not None else None 
\ No newline at end of file
@@ -0,0 +1,33 @@
+from datetime import datetime
+from enum import Enum
+from typing import NamedTuple, Optional, Tuple
+from pydantic import BaseModel, ConfigDict, Field
+from .task import TaskStatus, TaskPriority
+
+
+class TaskSortField(str, Enum):
+    PRIORITY = "priority"
+    PERCENTAGE = "percentage"
+    CREATED_AT = "created_at"
+    UPDATED_AT = "updated_at"
+
+
+class TaskSort(NamedTuple):
+    field: TaskSortField
+    descending: bool = False
+
+
+class TaskQuery(BaseModel):
+    """Filters and ordering for reading the tasks of a list. Empty filters match everything."""
+    model_config = ConfigDict(frozen=True)
+
+    statuses: Tuple[TaskStatus, ...] = ()
+    priorities: Tuple[TaskPriority, ...] = ()
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    updated_after: Optional[datetime] = None
+    updated_before: Optional[datetime] = None
+    min_percentage: Optional[int] = Field(None, ge=0, le=100)
+    max_percentage: Optional[int] = Field(None, ge=0, le=100)
+    # Applied in order, with remaining ties broken by ID; empty means by ID
+    sort: Tuple[TaskSort, ...] = ()
@@ -0,0 +1,3 @@
+class VersionConflictError(Exception):
+    """Raised when a conditional write finds the entity at a different version than expected"""
+    pass
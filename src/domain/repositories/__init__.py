@@ -1,4 +1,5 @@
 from .task_list_repository import TaskListRepository
 from .task_repository import TaskRepository
+from .unit_of_work import UnitOfWork
 
-__all__ = ["TaskListRepository", "TaskRepository"] 
\ No newline at end of file
+__all__ = ["TaskListRepository", "TaskRepository", "UnitOfWork"] 
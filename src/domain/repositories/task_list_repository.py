@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 from ..entities.task_list import TaskList
+from ..entities.task_query import TaskQuery
 
 
 class TaskListRepository(ABC):
@@ -16,17 +17,80 @@ class TaskListRepository(ABC):
         """Get a task list by ID"""
         pass
     
+    @abstractmethod
+    async def get_version(self, task_list_id: int) -> Optional[int]:
+        """Get the version of a task list, bumped by every write to it or its tasks"""
+        pass
+    
     @abstractmethod
     async def get_all(self) -> List[TaskList]:
         """Get all task lists"""
         pass
     
     @abstractmethod
-    async def update(self, task_list: TaskList) -> TaskList:
-        """Update a task list"""
+    async def get_all_with_stats(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[TaskList]:
+        """Get task lists ordered by ID with their task aggregates populated in `stats`"""
+        pass
+    
+    @abstractmethod
+    async def get_fields_by_id(
+        self,
+        task_list_id: int,
+        fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get only the given attributes of a task list (including the aggregate properties
+        such as `completion_percentage`), reading just the columns they need
+        """
+        pass
+    
+    @abstractmethod
+    async def get_all_fields(
+        self,
+        fields: Sequence[str],
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Like get_all_with_stats, but reading only the given attributes of each list"""
+        pass
+    
+    @abstractmethod
+    async def get_with_filtered_tasks(
+        self,
+        task_list_id: int,
+        query: TaskQuery
+    ) -> Optional[TaskList]:
+        """
+        Get a task list with its aggregates and only the tasks matching the query's filters,
+        ordered by its sort
+        """
+        pass
+    
+    @abstractmethod
+    async def update(
+        self,
+        task_list_id: int,
+        *,
+        expected_version: Optional[int] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> Optional[TaskList]:
+        """
+        Update the given fields of a task list, returning None if it does not exist. With
+        `expected_version`, raise VersionConflictError if the list is at another version.
+        """
         pass
     
     @abstractmethod
     async def delete(self, task_list_id: int) -> bool:
         """Delete a task list"""
+        pass
+    
+    @abstractmethod
+    async def rebuild_stats(self) -> int:
+        """Recompute the stored task aggregates of every task list, returning the lists updated"""
         pass 
\ No newline at end of file
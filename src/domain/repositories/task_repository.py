@@ -1,14 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 from ..entities.task import Task, TaskStatus, TaskPriority
+from ..entities.task_collection import TaskCollection, TaskRecord
+from ..entities.task_query import TaskQuery
 
 
 class TaskRepository(ABC):
     """Repository interface for Task operations"""
     
     @abstractmethod
-    async def create(self, task: Task) -> Task:
-        """Create a new task"""
+    async def create(self, task: Task) -> Optional[Task]:
+        """Create a new task, returning None if its task list does not exist"""
+        pass
+    
+    @abstractmethod
+    async def create_many(self, task_list_id: int, tasks: List[Task]) -> Optional[List[int]]:
+        """
+        Create several tasks in one task list, returning their IDs in input order, or None
+        if the task list does not exist
+        """
         pass
     
     @abstractmethod
@@ -17,28 +27,132 @@ class TaskRepository(ABC):
         pass
     
     @abstractmethod
-    async def get_by_task_list_id(self, task_list_id: int) -> List[Task]:
-        """Get all tasks for a specific task list"""
+    async def get_version(self, task_id: int) -> Optional[int]:
+        """Get the version of a task, which changes whenever the task changes"""
+        pass
+    
+    @abstractmethod
+    async def get_by_task_list_id(
+        self,
+        task_list_id: int,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> TaskCollection:
+        """Get tasks for a specific task list ordered by ID, optionally after a given ID"""
+        pass
+    
+    @abstractmethod
+    async def get_fields_by_id(
+        self,
+        task_id: int,
+        fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Get only the given attributes of a task, reading just those columns"""
+        pass
+    
+    @abstractmethod
+    async def get_fields_by_task_list_id(
+        self,
+        task_list_id: int,
+        fields: Sequence[str],
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Like get_by_task_list_id, but reading only the given attributes of each task"""
+        pass
+    
+    @abstractmethod
+    def stream_tasks(
+        self,
+        task_list_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[TaskRecord]]:
+        """
+        Stream the tasks of a task list (or of all lists) ordered by ID, in batches of up to
+        `batch_size`, without loading the whole result at once
+        """
+        pass
+    
+    @abstractmethod
+    async def get_filtered_tasks(self, task_list_id: int, query: TaskQuery) -> TaskCollection:
+        """Get the tasks of a list matching the query's filters, ordered by its sort"""
         pass
     
     @abstractmethod
-    async def get_filtered_tasks(
-        self, 
-        task_list_id: int, 
+    async def search(
+        self,
+        query: str,
+        *,
+        task_list_id: Optional[int] = None,
         status: Optional[TaskStatus] = None,
-        priority: Optional[TaskPriority] = None
-    ) -> List[Task]:
-        """Get filtered tasks by status and/or priority"""
+        priority: Optional[TaskPriority] = None,
+        max_id: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[TaskRecord]:
+        """
+        Full-text search of the words in `query` (the last one as a prefix) over task titles
+        and descriptions, best matches first and then by ID. `max_id` leaves out the tasks
+        created after it, and `offset` skips that many results.
+        """
+        pass
+    
+    @abstractmethod
+    async def get_last_id(self) -> Optional[int]:
+        """Get the ID of the most recently created task (None if there are no tasks)"""
         pass
     
     @abstractmethod
-    async def update(self, task: Task) -> Task:
-        """Update a task"""
+    async def rebuild_search_index(self):
+        """Rebuild the full-text search index from the stored tasks"""
         pass
     
     @abstractmethod
-    async def update_status(self, task_id: int, status: TaskStatus) -> Task:
-        """Update task status"""
+    async def update(
+        self,
+        task_id: int,
+        *,
+        expected_version: Optional[int] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[TaskPriority] = None,
+        percentage: Optional[int] = None
+    ) -> Optional[Task]:
+        """
+        Update the given fields of a task, returning None if it does not exist. With
+        `expected_version`, raise VersionConflictError if the task is at another version.
+        """
+        pass
+    
+    @abstractmethod
+    async def update_status(
+        self,
+        task_id: int,
+        status: TaskStatus,
+        expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """
+        Update task status, returning None if the task does not exist. With
+        `expected_version`, raise VersionConflictError if the task is at another version.
+        """
+        pass
+    
+    @abstractmethod
+    async def update_many(
+        self,
+        task_ids: Optional[List[int]] = None,
+        task_list_id: Optional[int] = None,
+        status_filter: Optional[TaskStatus] = None,
+        priority_filter: Optional[TaskPriority] = None,
+        *,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        percentage: Optional[int] = None
+    ) -> int:
+        """
+        Set status/priority/percentage on the tasks with the given IDs, or on the tasks of a
+        list matching the filters, returning the number of tasks updated
+        """
         pass
     
     @abstractmethod
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from .task_list_repository import TaskListRepository
+from .task_repository import TaskRepository
+
+
+class UnitOfWork(ABC):
+    """
+    Transaction boundary shared by the repositories of a use case.
+
+    Repositories only flush their changes; the work is committed once, when the outermost
+    `async with` block exits cleanly, and rolled back if it raises. Nested blocks join the
+    outer transaction, so a caller can widen the boundary over several use-case calls.
+    """
+    task_lists: TaskListRepository
+    tasks: TaskRepository
+
+    def __init__(self):
+        self._depth = 0
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    @abstractmethod
+    async def commit(self):
+        """Commit the work done through the repositories"""
+        pass
+
+    @abstractmethod
+    async def rollback(self):
+        """Discard the work done through the repositories"""
+        pass
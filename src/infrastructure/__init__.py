@@ -1,8 +1,9 @@
 # Infrastructure layer package 
 from .models import TaskListModel, TaskModel
 from .repositories import SQLAlchemyTaskListRepository, SQLAlchemyTaskRepository
+from .unit_of_work import SQLAlchemyUnitOfWork
 
 __all__ = [
     "TaskListModel", "TaskModel",
-    "SQLAlchemyTaskListRepository", "SQLAlchemyTaskRepository"
+    "SQLAlchemyTaskListRepository", "SQLAlchemyTaskRepository", "SQLAlchemyUnitOfWork"
 ] 
\ No newline at end of file
@@ -1,27 +1,297 @@
+import logging
 import os
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+from sqlalchemy import event, make_url, text
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from ..config import settings
+from . import migrations
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SQLITE_PRAGMAS = (
+    "journal_mode", "synchronous", "cache_size", "mmap_size", "busy_timeout", "temp_store"
+)
+
+
+def configure_sqlite_connection(engine: AsyncEngine, read_only: bool = False):
+    """Apply the SQLite storage profile from settings to every connection the engine opens"""
+    if engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        if not read_only:
+            # Let SQLAlchemy emit BEGIN itself (see _begin below) instead of the driver
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        # busy_timeout goes first so the journal_mode switch can wait for other connections
+        cursor.execute(f"PRAGMA busy_timeout = {int(settings.SQLITE_BUSY_TIMEOUT)}")
+        if not read_only:
+            # The journal mode is persistent in the file and can only be set by a writer
+            cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA cache_size = {int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size = {int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA temp_store = {settings.SQLITE_TEMP_STORE}")
+        cursor.close()
+
+    if not read_only:
+        @event.listens_for(engine.sync_engine, "begin")
+        def _begin(conn):
+            # The driver delays BEGIN until the first DML statement, which breaks SAVEPOINTs.
+            # IMMEDIATE takes the write lock up front, so a transaction that reads before it
+            # writes waits on busy_timeout instead of failing on the lock upgrade.
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+DB_STATEMENT_SECONDS = metrics.histogram(
+    "db_statement_duration_seconds",
+    "Time executing SQL statements, by engine and statement kind",
+    ("engine", "operation")
+)
+DB_STATEMENT_ERRORS = metrics.counter(
+    "db_statement_errors_total", "SQL statements that raised an error", ("engine",)
+)
+DB_POOL_WAIT_SECONDS = metrics.histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a pooled connection", ("engine",)
+)
+_STATEMENT_OPERATIONS = frozenset(("SELECT", "INSERT", "UPDATE", "DELETE"))
+
+
+def instrument_engine(engine: AsyncEngine, name: str):
+    """Time every statement the engine executes, labelled with the engine name"""
+    errors = DB_STATEMENT_ERRORS.labels(name)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_start = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _observe(conn, cursor, statement, parameters, context, executemany):
+        operation = statement[:6].upper()
+        if operation not in _STATEMENT_OPERATIONS:
+            operation = "OTHER"
+        DB_STATEMENT_SECONDS.labels(name, operation).observe(
+            time.perf_counter() - context._metrics_start
+        )
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def _count_error(exception_context):
+        errors.inc()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool recording how long each checkout waits, labelled by the pool logging name"""
+
+    def connect(self):
+        # The public checkout entry point used by the engine. Pool events only fire once a
+        # connection was obtained, so they cannot time the wait for one.
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_WAIT_SECONDS.labels(self.logging_name or "default").observe(
+                time.perf_counter() - start
+            )
+
+
+def sqlite_read_only_url(database_url: str) -> Optional[URL]:
+    """
+    Build a `mode=ro` URI for a file-backed SQLite database, or None when the database
+    cannot be shared by a separate read-only pool (other backends, in-memory databases).
+    """
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        return None
+    if url.query.get("mode") == "memory":
+        return None
+
+    database = url.database if url.database.startswith("file:") else f"file:{url.database}"
+    return url.set(database=database).update_query_dict({"mode": "ro", "uri": "true"})
+
+
+def _create_engines():
+    """Create the writer engine and, for file-backed SQLite, a separate read-only engine"""
+    read_url = sqlite_read_only_url(settings.DATABASE_URL)
+    if read_url is None:
+        shared = create_async_engine(
+            settings.DATABASE_URL, connect_args={"check_same_thread": False}
+        )
+        configure_sqlite_connection(shared)
+        if settings.METRICS_ENABLED:
+            instrument_engine(shared, "shared")
+        return shared, shared
+
+    # SQLite allows a single writer at a time, so writes are serialized on one pooled
+    # connection while reads scale over a pool of read-only connections (WAL mode)
+    pool_class = InstrumentedQueuePool if settings.METRICS_ENABLED else AsyncAdaptedQueuePool
+    writer = create_async_engine(
+        settings.DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=pool_class,
+        pool_logging_name="writer",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT
+    )
+    reader = create_async_engine(
+        read_url,
+        connect_args={"check_same_thread": False},
+        poolclass=pool_class,
+        pool_logging_name="reader",
+        pool_size=settings.DATABASE_READ_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT
+    )
+    configure_sqlite_connection(writer)
+    configure_sqlite_connection(reader, read_only=True)
+    if settings.METRICS_ENABLED:
+        instrument_engine(writer, "writer")
+        instrument_engine(reader, "reader")
+    return writer, reader
+
 
 # Use the database URL from the central settings
-engine = create_async_engine(settings.DATABASE_URL, connect_args={"check_same_thread": False})
+engine, read_engine = _create_engines()
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
     class_=AsyncSession
 )
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+    class_=AsyncSession
+)
 Base = declarative_base()
 
 
 async def get_db_session() -> AsyncSession:
-    """Dependency to get a database session"""
+    """Dependency to get a read-write database session (served by the writer connection)"""
     async with SessionLocal() as session:
         yield session
 
 
-async def init_db():
-    """Initialize the database and create tables"""
+# Session.info flag set by the write coordinator: units of work flush instead of committing
+# and the coordinator commits the whole batch at once
+DEFER_COMMIT = "defer_commit"
+
+
+async def commit_session(session: AsyncSession):
+    """Commit the session, or only flush it when its commit is deferred to a group commit"""
+    if session.info.get(DEFER_COMMIT):
+        await session.flush()
+    else:
+        await session.commit()
+
+
+# Session.info key where repositories record the IDs of the task lists a transaction changed
+CHANGED_TASK_LISTS = "changed_task_lists"
+_task_list_change_listeners: List[Callable[[Set[int]], None]] = []
+
+
+def mark_task_lists_changed(session: AsyncSession, *task_list_ids: int):
+    """Record task lists changed in the session's transaction, reported once it commits"""
+    session.info.setdefault(CHANGED_TASK_LISTS, set()).update(task_list_ids)
+
+
+def on_task_lists_committed(listener: Callable[[Set[int]], None]):
+    """Register a callback receiving the IDs of the task lists changed by each commit"""
+    _task_list_change_listeners.append(listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_task_list_changes(session: Session):
+    # Marks left by a rolled back transaction are reported with the next commit of the same
+    # session, which at worst invalidates a little more than needed
+    changed = session.info.pop(CHANGED_TASK_LISTS, None)
+    if changed:
+        for listener in _task_list_change_listeners:
+            listener(changed)
+
+
+# Session.info key where repositories record the change events of a transaction. Unlike the
+# changed task lists, events must never outlive a rollback, including of a SAVEPOINT.
+TASK_EVENTS = "task_events"
+_SAVEPOINT_EVENT_MARKS = "savepoint_event_marks"
+_task_event_listeners: List[Callable[[List[Any]], None]] = []
+
+
+def record_task_events(session: AsyncSession, *events: Any):
+    """Record change events of the session's transaction, published once it commits"""
+    session.info.setdefault(TASK_EVENTS, []).extend(events)
+
+
+def on_task_events_committed(listener: Callable[[List[Any]], None]):
+    """Register a callback receiving the change events of each commit, in write order"""
+    _task_event_listeners.append(listener)
+
+
+def remove_task_events_listener(listener: Callable[[List[Any]], None]):
+    """Unregister a callback added with on_task_events_committed"""
+    _task_event_listeners.remove(listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_task_events(session: Session):
+    events = session.info.pop(TASK_EVENTS, None)
+    if events:
+        for listener in _task_event_listeners:
+            listener(events)
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _mark_savepoint_events(session: Session, transaction):
+    if transaction.nested:
+        marks = session.info.setdefault(_SAVEPOINT_EVENT_MARKS, {})
+        marks[transaction] = len(session.info.get(TASK_EVENTS, ()))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_savepoint_events(session: Session, previous_transaction):
+    mark = session.info.get(_SAVEPOINT_EVENT_MARKS, {}).pop(previous_transaction, None)
+    if mark is not None and TASK_EVENTS in session.info:
+        del session.info[TASK_EVENTS][mark:]
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted_events(session: Session, transaction):
+    # A committed root transaction has already published its events
+    if transaction.parent is None:
+        session.info.pop(TASK_EVENTS, None)
+        session.info.pop(_SAVEPOINT_EVENT_MARKS, None)
+
+
+async def get_read_session() -> AsyncSession:
+    """Dependency to get a read-only database session (served by the reader pool)"""
+    async with ReadSessionLocal() as session:
+        yield session
+
+
+async def get_sqlite_pragmas(target: AsyncEngine = engine) -> Dict[str, object]:
+    """Read the effective storage PRAGMAs from a pooled connection"""
+    if target.dialect.name != "sqlite":
+        return {}
+
+    async with target.connect() as conn:
+        return {
+            pragma: (await conn.execute(text(f"PRAGMA {pragma}"))).scalar()
+            for pragma in SQLITE_PRAGMAS
+        }
+
+
+async def init_db(migrate: Optional[bool] = None):
+    """
+    Initialize the database, create tables and (by default) apply pending migrations.
+    With AUTO_MIGRATE off, refuse to start on a schema with pending migrations.
+    """
     # Ensure the directory for the database exists
     if settings.DATABASE_URL.startswith("sqlite"):
         db_path = settings.DATABASE_URL.split("///")[-1]
@@ -33,7 +303,42 @@ async def init_db():
         # This will create tables if they don't exist
         await conn.run_sync(Base.metadata.create_all)
 
+    if settings.AUTO_MIGRATE if migrate is None else migrate:
+        await migrate_db()
+    elif migrate is None:
+        # Queries rely on columns added by migrations (e.g. the task list counters), so an
+        # outdated schema would fail on every request instead of at startup
+        pending = await get_pending_migrations()
+        if pending:
+            raise RuntimeError(
+                "The database schema is outdated, run `python -m src.cli migrate` to apply: "
+                + ", ".join(pending)
+            )
+
+    pragmas = await get_sqlite_pragmas()
+    if pragmas:
+        logger.info(
+            "SQLite storage profile: %s",
+            ", ".join(f"{name}={value}" for name, value in pragmas.items())
+        )
+
+
+async def migrate_db() -> List[str]:
+    """Apply pending schema migrations and return their descriptions"""
+    async with engine.begin() as conn:
+        applied = await conn.run_sync(migrations.upgrade)
+    return [f"{migration.version:04d} {migration.description}" for migration in applied]
+
+
+async def get_pending_migrations() -> List[str]:
+    """Describe the schema migrations not yet applied to the database"""
+    async with engine.begin() as conn:
+        pending = await conn.run_sync(migrations.pending_migrations)
+    return [f"{migration.version:04d} {migration.description}" for migration in pending]
+
 
 async def close_db():
-    """Close the database connection engine"""
-    await engine.dispose() 
\ No newline at end of file
+    """Close the database connection engines"""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
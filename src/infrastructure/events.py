@@ -0,0 +1,107 @@
+import asyncio
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, Optional, Set
+
+from ..domain.entities.task_collection import TaskRecord
+
+
+class TaskEventType(str, Enum):
+    CREATED = "task.created"
+    UPDATED = "task.updated"
+    DELETED = "task.deleted"
+    # The subscriber missed changes (or is just starting) and must refetch the task list
+    RESYNC = "resync"
+
+
+@dataclass(frozen=True)
+class TaskEvent:
+    """A committed change to the tasks of a list, with the row as written (or deleted)"""
+    type: TaskEventType
+    task_list_id: int
+    task: Optional[TaskRecord] = None
+
+
+class EventSubscription:
+    """Bounded queue of the events of one task list for a single subscriber"""
+    __slots__ = ("task_list_id", "queue", "resync_pending")
+
+    def __init__(self, task_list_id: int, max_queued_events: int):
+        self.task_list_id = task_list_id
+        self.queue: "asyncio.Queue[TaskEvent]" = asyncio.Queue(max_queued_events)
+        # Set while a RESYNC is queued: anything published before the subscriber reads it
+        # is covered by the refetch, so it is not queued
+        self.resync_pending = False
+
+    async def get(self) -> TaskEvent:
+        event = await self.queue.get()
+        if event.type is TaskEventType.RESYNC:
+            self.resync_pending = False
+        return event
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe of committed task events, per task list.
+
+    Publishing never blocks the writer: a subscriber too slow to keep up with its bounded
+    queue has its pending events replaced by a single RESYNC, so it refetches instead of
+    holding an unbounded backlog.
+    """
+
+    def __init__(self, max_queued_events: int):
+        # A RESYNC must always fit in the queue
+        self.max_queued_events = max(max_queued_events, 1)
+        self._subscriptions: Dict[int, Set[EventSubscription]] = {}
+        self.published = 0
+        self.dropped = 0
+        self.overflows = 0
+
+    def subscribe(self, task_list_id: int) -> EventSubscription:
+        """Subscribe to a task list. The first event is a RESYNC, to load the current state."""
+        subscription = EventSubscription(task_list_id, self.max_queued_events)
+        self._resync(subscription)
+        self._subscriptions.setdefault(task_list_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: EventSubscription):
+        subscriptions = self._subscriptions.get(subscription.task_list_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.task_list_id]
+
+    def publish(self, events: Iterable[TaskEvent]):
+        """Deliver events to the subscribers of their task lists (from the event loop thread)"""
+        for event in events:
+            self.published += 1
+            for subscription in self._subscriptions.get(event.task_list_id, ()):
+                self._deliver(subscription, event)
+
+    def _deliver(self, subscription: EventSubscription, event: TaskEvent):
+        if subscription.resync_pending:
+            self.dropped += 1
+            return
+        if event.type is TaskEventType.RESYNC:
+            self._resync(subscription)
+            return
+        try:
+            subscription.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += subscription.queue.qsize() + 1
+            self.overflows += 1
+            self._resync(subscription)
+
+    def _resync(self, subscription: EventSubscription):
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(TaskEvent(TaskEventType.RESYNC, subscription.task_list_id))
+        subscription.resync_pending = True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "subscribers": sum(len(subscribers) for subscribers in self._subscriptions.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+            "overflows": self.overflows,
+        }
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from .database import DEFER_COMMIT, SessionLocal
+
+T = TypeVar("T")
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+    # The caller may have gone away (e.g. a cancelled request) while the batch ran
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class WriteCoordinator:
+    """
+    Gathers write operations submitted within a short window and runs them in one
+    transaction, so a burst of concurrent writes pays for a single commit (and fsync).
+
+    Each operation runs inside its own SAVEPOINT: a failing operation is rolled back on
+    its own and only its caller gets the error, while the rest of the batch commits.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        window_seconds: float,
+        max_batch_size: int
+    ):
+        self._session_factory = session_factory
+        self._window_seconds = window_seconds
+        self._max_batch_size = max_batch_size
+        self._pending: List[Tuple[WriteOperation, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def submit(self, operation: WriteOperation[T]) -> T:
+        """Queue an operation for the next batch and wait for its own result or error"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((operation, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_window())
+        return await future
+
+    def bind(self, factory: Callable[[AsyncSession], Any]) -> "GroupCommitProxy":
+        """Wrap a session-bound object factory so every method call goes through the batch"""
+        return GroupCommitProxy(self, factory)
+
+    async def drain(self):
+        """Wait until every submitted operation has been committed"""
+        while self._flush_task is not None:
+            await self._flush_task
+
+    async def _flush_after_window(self):
+        try:
+            await asyncio.sleep(self._window_seconds)
+            while self._pending:
+                batch = self._pending[:self._max_batch_size]
+                del self._pending[:self._max_batch_size]
+                await self._run_batch(batch)
+        finally:
+            self._flush_task = None
+
+    async def _run_batch(self, batch: List[Tuple[WriteOperation, asyncio.Future]]):
+        completed = []
+        try:
+            async with self._session_factory() as session:
+                session.info[DEFER_COMMIT] = True
+                for operation, future in batch:
+                    try:
+                        async with session.begin_nested():
+                            result = await operation(session)
+                    except Exception as e:
+                        _resolve(future, error=e)
+                    else:
+                        completed.append((future, result))
+                await session.commit()
+        except Exception as e:
+            # The shared commit failed, so none of the operations of the batch persisted
+            for _, future in batch:
+                _resolve(future, error=e)
+            return
+
+        for future, result in completed:
+            _resolve(future, result=result)
+
+
+class GroupCommitProxy:
+    """Stands in for a use-case object and runs each of its method calls in a group commit"""
+
+    def __init__(self, coordinator: WriteCoordinator, factory: Callable[[AsyncSession], Any]):
+        self._coordinator = coordinator
+        self._factory = factory
+
+    def __getattr__(self, name: str):
+        async def call(*args, **kwargs):
+            return await self._coordinator.submit(
+                lambda session: getattr(self._factory(session), name)(*args, **kwargs)
+            )
+        return call
+
+
+# Only created when group commit is enabled; otherwise every request commits on its own
+write_coordinator = (
+    WriteCoordinator(
+        SessionLocal,
+        window_seconds=settings.GROUP_COMMIT_WINDOW_MS / 1000,
+        max_batch_size=settings.GROUP_COMMIT_MAX_BATCH_SIZE
+    )
+    if settings.GROUP_COMMIT_ENABLED
+    else None
+)
@@ -0,0 +1,82 @@
+"""
+Versioned schema migrations.
+
+`Base.metadata.create_all` only creates missing tables, so changes to existing
+tables (new columns, new indexes) are shipped as numbered scripts in the
+`versions` package. Each script defines `VERSION`, `DESCRIPTION` and an
+`upgrade(connection)` function, and the applied versions are tracked in the
+`schema_version` table. Scripts must be idempotent because a database created
+from the current models already has the resulting schema.
+"""
+import importlib
+import pkgutil
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from . import versions
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def load_migrations() -> List[Migration]:
+    """Discover the migration scripts in the versions package, ordered by version"""
+    migrations = []
+    for module_info in pkgutil.iter_modules(versions.__path__):
+        module = importlib.import_module(f"{versions.__name__}.{module_info.name}")
+        migrations.append(Migration(module.VERSION, module.DESCRIPTION, module.upgrade))
+    
+    migrations.sort(key=lambda migration: migration.version)
+    numbers = [migration.version for migration in migrations]
+    if len(numbers) != len(set(numbers)):
+        raise RuntimeError(f"Duplicate migration versions found: {numbers}")
+    return migrations
+
+
+def _ensure_version_table(connection: Connection):
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_version ("
+        "version INTEGER PRIMARY KEY, "
+        "description VARCHAR(200) NOT NULL, "
+        "applied_at DATETIME NOT NULL)"
+    ))
+
+
+def applied_versions(connection: Connection) -> List[int]:
+    """Versions already recorded in the schema_version table"""
+    _ensure_version_table(connection)
+    result = connection.execute(text("SELECT version FROM schema_version ORDER BY version"))
+    return [row[0] for row in result]
+
+
+def pending_migrations(connection: Connection) -> List[Migration]:
+    """Migrations that have not been applied to this database yet"""
+    applied = set(applied_versions(connection))
+    return [migration for migration in load_migrations() if migration.version not in applied]
+
+
+def upgrade(connection: Connection) -> List[Migration]:
+    """Apply every pending migration in version order and return the ones applied"""
+    pending = pending_migrations(connection)
+    for migration in pending:
+        migration.upgrade(connection)
+        connection.execute(
+            text(
+                "INSERT INTO schema_version (version, description, applied_at) "
+                "VALUES (:version, :description, :applied_at)"
+            ),
+            {
+                "version": migration.version,
+                "description": migration.description,
+                "applied_at": datetime.utcnow(),
+            },
+        )
+    return pending
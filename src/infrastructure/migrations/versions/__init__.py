@@ -0,0 +1 @@
+# Migration scripts, named v<version>_<description>.py
@@ -0,0 +1,26 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 1
+DESCRIPTION = "Add materialized task counters to task_lists"
+
+COUNTER_COLUMNS = ("task_count", "completed_count", "percentage_sum")
+
+
+def upgrade(connection: Connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("task_lists")}
+    for name in COUNTER_COLUMNS:
+        if name not in columns:
+            connection.execute(text(
+                f"ALTER TABLE task_lists ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"
+            ))
+
+    # Backfill from the existing tasks (task status is stored by enum name)
+    connection.execute(text(
+        "UPDATE task_lists SET "
+        "task_count = (SELECT count(*) FROM tasks WHERE tasks.task_list_id = task_lists.id), "
+        "completed_count = (SELECT count(*) FROM tasks "
+        "WHERE tasks.task_list_id = task_lists.id AND tasks.status = 'COMPLETED'), "
+        "percentage_sum = (SELECT coalesce(sum(percentage), 0) FROM tasks "
+        "WHERE tasks.task_list_id = task_lists.id)"
+    ))
@@ -0,0 +1,16 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 2
+DESCRIPTION = "Add composite indexes for task list lookups and filters"
+
+
+def upgrade(connection: Connection):
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_task_list_id_status_priority "
+        "ON tasks (task_list_id, status, priority)"
+    ))
+    connection.execute(text(
+        "CREATE INDEX IF NOT EXISTS ix_tasks_task_list_id_updated_at "
+        "ON tasks (task_list_id, updated_at)"
+    ))
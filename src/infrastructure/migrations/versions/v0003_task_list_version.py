@@ -0,0 +1,13 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 3
+DESCRIPTION = "Add a version counter to task_lists for conditional requests"
+
+
+def upgrade(connection: Connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("task_lists")}
+    if "version" not in columns:
+        connection.execute(text(
+            "ALTER TABLE task_lists ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+        ))
@@ -0,0 +1,13 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+VERSION = 4
+DESCRIPTION = "Add an optimistic concurrency version to tasks"
+
+
+def upgrade(connection: Connection):
+    columns = {column["name"] for column in inspect(connection).get_columns("tasks")}
+    if "version" not in columns:
+        connection.execute(text(
+            "ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 0"
+        ))
@@ -0,0 +1,17 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ...models.task_search import TASK_SEARCH_DDL, TASK_SEARCH_REBUILD
+
+VERSION = 5
+DESCRIPTION = "Add a full-text search index over task titles and descriptions"
+
+
+def upgrade(connection: Connection):
+    # FTS5 is specific to SQLite
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in TASK_SEARCH_DDL:
+        connection.execute(text(statement))
+    # Index the tasks that existed before the triggers
+    connection.execute(text(TASK_SEARCH_REBUILD))
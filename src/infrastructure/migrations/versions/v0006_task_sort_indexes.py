@@ -0,0 +1,20 @@
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex
+
+from ...models.task_model import TaskModel
+
+VERSION = 6
+DESCRIPTION = "Add indexes serving the supported task sorts"
+
+SORT_INDEXES = (
+    "ix_tasks_task_list_id_priority_rank_created_at",
+    "ix_tasks_task_list_id_created_at",
+    "ix_tasks_task_list_id_percentage",
+)
+
+
+def upgrade(connection: Connection):
+    # Created from the model so the priority expression is exactly the one queries use
+    for index in TaskModel.__table__.indexes:
+        if index.name in SORT_INDEXES:
+            connection.execute(CreateIndex(index, if_not_exists=True))
@@ -0,0 +1,10 @@
+from sqlalchemy.engine import Connection
+
+from ...models.outbox_model import OutboxModel
+
+VERSION = 7
+DESCRIPTION = "Add the outbox table of pending change notifications"
+
+
+def upgrade(connection: Connection):
+    OutboxModel.__table__.create(connection, checkfirst=True)
@@ -0,0 +1,56 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from ...models.task_list_model import TaskListModel
+from ...models.task_model import TaskModel
+from ...models.task_search import TASK_SEARCH_REBUILD
+
+VERSION = 8
+DESCRIPTION = "Never reuse the IDs of deleted task lists and tasks (AUTOINCREMENT)"
+
+
+def _rebuild_table(connection: Connection, model) -> bool:
+    """Recreate the model's table from its current definition, keeping the rows"""
+    name = model.__tablename__
+    sql = connection.execute(
+        text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": name}
+    ).scalar()
+    if sql is None or "AUTOINCREMENT" in sql.upper():
+        return False
+
+    # Indexes and triggers keep their names when their table is renamed, and the new
+    # table creates them again
+    dependents = connection.execute(
+        text(
+            "SELECT type, name FROM sqlite_master "
+            "WHERE type IN ('index', 'trigger') AND tbl_name = :name AND sql IS NOT NULL"
+        ),
+        {"name": name}
+    ).all()
+    for kind, dependent in dependents:
+        connection.execute(text(f'DROP {kind.upper()} "{dependent}"'))
+
+    old_name = f"_{name}_old"
+    connection.execute(text(f"ALTER TABLE {name} RENAME TO {old_name}"))
+    model.__table__.create(connection)
+    columns = ", ".join(column.name for column in model.__table__.columns)
+    connection.execute(text(f"INSERT INTO {name} ({columns}) SELECT {columns} FROM {old_name}"))
+    connection.execute(text(f"DROP TABLE {old_name}"))
+    return True
+
+
+def upgrade(connection: Connection):
+    # SQLite reuses the highest rowid after a delete unless the table is AUTOINCREMENT, which
+    # can only be set by recreating the table. The sequence starts after the highest ID kept.
+    if connection.dialect.name != "sqlite":
+        return
+    # Otherwise renaming task_lists would point the foreign key of tasks at the old table
+    connection.execute(text("PRAGMA legacy_alter_table = ON"))
+    try:
+        _rebuild_table(connection, TaskListModel)
+        if _rebuild_table(connection, TaskModel):
+            # Copying the rows went through the search triggers of the new table again
+            connection.execute(text(TASK_SEARCH_REBUILD))
+    finally:
+        connection.execute(text("PRAGMA legacy_alter_table = OFF"))
@@ -1,4 +1,9 @@
 from .task_list_model import TaskListModel
 from .task_model import TaskModel
+from .task_search import tasks_fts, TASK_SEARCH_DDL, TASK_SEARCH_REBUILD
+from .outbox_model import OutboxModel
 
-__all__ = ["TaskListModel", "TaskModel"] 
\ No newline at end of file
+__all__ = [
+    "TaskListModel", "TaskModel", "tasks_fts", "TASK_SEARCH_DDL", "TASK_SEARCH_REBUILD",
+    "OutboxModel"
+]
@@ -0,0 +1,21 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from ..database import Base
+
+
+class OutboxModel(Base):
+    """
+    Change notifications written in the same transaction as the change itself and deleted
+    once delivered by the outbox dispatcher.
+    """
+    __tablename__ = "outbox"
+    # AUTOINCREMENT: IDs are never reused once delivered rows are deleted, so consumers can
+    # rely on them to order and deduplicate messages
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id = Column(Integer, primary_key=True)
+    event_type = Column(String(50), nullable=False)
+    # Not a foreign key: the notification of a deleted list outlives the list
+    task_list_id = Column(Integer, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
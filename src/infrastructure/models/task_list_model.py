@@ -6,10 +6,19 @@ from ..database import Base
 
 class TaskListModel(Base):
     __tablename__ = "task_lists"
+    # AUTOINCREMENT: a new list never gets the ID of a deleted one, so an ETag or If-Match
+    # naming the deleted list ("task-list-{id}-{version}") cannot match its replacement
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
+    # Denormalized task aggregates, maintained by the task repository on every write
+    task_count = Column(Integer, default=0, server_default="0", nullable=False)
+    completed_count = Column(Integer, default=0, server_default="0", nullable=False)
+    percentage_sum = Column(Integer, default=0, server_default="0", nullable=False)
+    # Bumped by every write to the list or its tasks; the ETags of list responses derive from it
+    version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
 
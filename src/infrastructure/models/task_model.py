@@ -1,12 +1,38 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum, literal_column
+)
 from sqlalchemy.orm import relationship
 from ..database import Base
 from ...domain.entities.task import TaskStatus, TaskPriority
 
 
+# Urgency of the stored priority as a number (LOW=0 ... URGENT=3), so tasks can be sorted by
+# priority. SQLite only matches an expression index when queries use this exact expression.
+PRIORITY_RANK = literal_column(
+    "(CASE priority "
+    + " ".join(f"WHEN '{priority.name}' THEN {rank}" for rank, priority in enumerate(TaskPriority))
+    + " END)"
+)
+
+
 class TaskModel(Base):
     __tablename__ = "tasks"
+    # Keep in sync with the migrations that add these indexes to existing databases
+    __table_args__ = (
+        Index("ix_tasks_task_list_id_status_priority", "task_list_id", "status", "priority"),
+        Index("ix_tasks_task_list_id_updated_at", "task_list_id", "updated_at"),
+        # One index per supported sort; the board order (most urgent, then oldest) is a
+        # forward scan of the first one
+        Index(
+            "ix_tasks_task_list_id_priority_rank_created_at",
+            "task_list_id", PRIORITY_RANK.desc(), "created_at"
+        ),
+        Index("ix_tasks_task_list_id_created_at", "task_list_id", "created_at"),
+        Index("ix_tasks_task_list_id_percentage", "task_list_id", "percentage"),
+        # AUTOINCREMENT: IDs of deleted tasks are never reused, which keeps ETags unique
+        {"sqlite_autoincrement": True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -17,6 +43,8 @@ class TaskModel(Base):
     task_list_id = Column(Integer, ForeignKey("task_lists.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True)
+    # Optimistic concurrency version, incremented by every update of the task
+    version = Column(Integer, default=0, server_default="0", nullable=False)
 
     # Relationship
     task_list = relationship("TaskListModel", back_populates="tasks") 
\ No newline at end of file
@@ -0,0 +1,39 @@
+from sqlalchemy import DDL, column, event, table
+from .task_model import TaskModel
+
+# Full-text index over task titles and descriptions (SQLite FTS5). It is an external content
+# table over `tasks`, so it stores only the index, and triggers keep it in sync on every write.
+# Keep in sync with the migration that adds it to existing databases.
+TASK_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    # Status and percentage changes do not touch the indexed text
+    "CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks "
+    "BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.id, new.title, new.description); END",
+)
+
+# Reindex every task from the content table
+TASK_SEARCH_REBUILD = "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')"
+
+# Query handle: `rowid` is the task ID and `rank` the bm25 relevance (lower is better). The
+# column named like the table is FTS5's hidden column that MATCH is applied to.
+tasks_fts = table("tasks_fts", column("rowid"), column("rank"), column("tasks_fts"))
+
+for statement in TASK_SEARCH_DDL:
+    event.listen(TaskModel.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+event.listen(
+    TaskModel.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite")
+)
@@ -0,0 +1,255 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import orjson
+import requests
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..config import settings
+from ..domain.entities.task_collection import TaskRecord
+from ..domain.entities.task_list import TaskList
+from .database import ReadSessionLocal, SessionLocal, on_task_lists_committed
+from .models.outbox_model import OutboxModel
+
+logger = logging.getLogger(__name__)
+
+# Notification types besides the per-task ones, which reuse the task event types
+TASKS_UPDATED = "tasks.updated"
+TASKS_DELETED = "tasks.deleted"
+TASK_LIST_CREATED = "task_list.created"
+TASK_LIST_UPDATED = "task_list.updated"
+TASK_LIST_DELETED = "task_list.deleted"
+
+TASK_LIST_PAYLOAD_FIELDS = ("id", "title", "description", "created_at", "updated_at", "version")
+
+
+async def write_outbox(
+    session: AsyncSession, event_type: str, task_list_id: int, data: Dict[str, Any]
+):
+    """Add a notification to the session's transaction (a no-op when the outbox is off)"""
+    if settings.OUTBOX_ENABLED:
+        await session.execute(insert(OutboxModel).values(
+            event_type=event_type, task_list_id=task_list_id, payload=orjson.dumps(data).decode()
+        ))
+
+
+async def write_task_outbox(
+    session: AsyncSession, event_type: str, records: Iterable[TaskRecord]
+):
+    """Add one notification per written task, with the task row as payload"""
+    if not settings.OUTBOX_ENABLED:
+        return
+    rows = [
+        {
+            "event_type": event_type,
+            "task_list_id": record.task_list_id,
+            "payload": orjson.dumps(
+                {name: getattr(record, name) for name in TaskRecord.__slots__}
+            ).decode(),
+        }
+        for record in records
+    ]
+    if rows:
+        await session.execute(insert(OutboxModel), rows)
+
+
+async def write_task_list_outbox(session: AsyncSession, event_type: str, task_list: TaskList):
+    await write_outbox(
+        session,
+        event_type,
+        task_list.id,
+        {name: getattr(task_list, name) for name in TASK_LIST_PAYLOAD_FIELDS}
+    )
+
+
+def to_message(row: OutboxModel) -> Dict[str, Any]:
+    """The message delivered to sinks for an outbox row"""
+    return {
+        "id": row.id,
+        "type": row.event_type,
+        "task_list_id": row.task_list_id,
+        "created_at": row.created_at,
+        "data": orjson.loads(row.payload),
+    }
+
+
+class OutboxSink(ABC):
+    """Destination of outbox messages. `send` must raise unless the whole batch was accepted."""
+
+    @abstractmethod
+    async def send(self, messages: List[Dict[str, Any]]):
+        pass
+
+
+class FileSink(OutboxSink):
+    """Appends messages to a local NDJSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def send(self, messages: List[Dict[str, Any]]):
+        lines = b"".join(orjson.dumps(message) + b"\n" for message in messages)
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines: bytes):
+        with open(self.path, "ab") as file:
+            file.write(lines)
+
+
+class HttpSink(OutboxSink):
+    """POSTs each batch as a JSON array to an HTTP receiver, expecting a 2xx response"""
+
+    def __init__(self, url: str, timeout_seconds: float):
+        self.url = url
+        self.timeout_seconds = timeout_seconds
+        self._http = requests.Session()
+
+    async def send(self, messages: List[Dict[str, Any]]):
+        await asyncio.to_thread(self._post, orjson.dumps(messages))
+
+    def _post(self, body: bytes):
+        response = self._http.post(
+            self.url,
+            data=body,
+            headers={"Content-Type": "application/json"},
+            timeout=self.timeout_seconds
+        )
+        response.raise_for_status()
+
+
+class OutboxDispatcher:
+    """
+    Background task delivering outbox messages to a sink in batches, oldest first.
+
+    Batches are read from the read pool and deleted in a short write transaction only
+    after the sink accepted them, so delivery is at least once and a slow or failing sink
+    never holds a connection or delays writes. A failed batch is retried with exponential
+    backoff, ahead of any newer message.
+    """
+
+    def __init__(
+        self,
+        sink: OutboxSink,
+        read_session_factory: Callable[[], AsyncSession],
+        write_session_factory: Callable[[], AsyncSession],
+        batch_size: int,
+        poll_seconds: float,
+        retry_base_seconds: float,
+        retry_max_seconds: float
+    ):
+        self.sink = sink
+        self._read_session_factory = read_session_factory
+        self._write_session_factory = write_session_factory
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.dispatched = 0
+        self.batches = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        # Age of the oldest undelivered message when the last batch was read
+        self.lag_seconds = 0.0
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def wake(self):
+        """Dispatch now instead of at the next poll (called when a write commits)"""
+        self._wakeup.set()
+
+    async def dispatch_once(self) -> int:
+        """Deliver the oldest batch of pending messages and return how many were sent"""
+        async with self._read_session_factory() as session:
+            rows = (await session.scalars(
+                select(OutboxModel).order_by(OutboxModel.id).limit(self.batch_size)
+            )).all()
+        if not rows:
+            self.lag_seconds = 0.0
+            return 0
+
+        self.lag_seconds = (datetime.utcnow() - rows[0].created_at).total_seconds()
+        await self.sink.send([to_message(row) for row in rows])
+
+        async with self._write_session_factory() as session:
+            await session.execute(
+                delete(OutboxModel).where(OutboxModel.id.in_([row.id for row in rows]))
+            )
+            await session.commit()
+        self.dispatched += len(rows)
+        self.batches += 1
+        return len(rows)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                sent = await self.dispatch_once()
+            except Exception as e:
+                self.failures += 1
+                self.consecutive_failures += 1
+                self.last_error = repr(e)
+                delay = min(
+                    self.retry_base_seconds * 2 ** (self.consecutive_failures - 1),
+                    self.retry_max_seconds
+                )
+                logger.warning("Outbox dispatch failed, retrying in %.1fs: %r", delay, e)
+                await asyncio.sleep(delay)
+                continue
+
+            self.consecutive_failures = 0
+            if sent < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "dispatched": self.dispatched,
+            "batches": self.batches,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "lag_seconds": round(self.lag_seconds, 3),
+            "last_error": self.last_error,
+        }
+
+
+def build_outbox_sink() -> OutboxSink:
+    if settings.OUTBOX_SINK == "http":
+        return HttpSink(settings.OUTBOX_HTTP_URL, settings.OUTBOX_HTTP_TIMEOUT_SECONDS)
+    return FileSink(settings.OUTBOX_FILE_PATH)
+
+
+# Only created when the outbox is enabled; otherwise repositories write no notifications
+outbox_dispatcher = (
+    OutboxDispatcher(
+        build_outbox_sink(),
+        ReadSessionLocal,
+        SessionLocal,
+        batch_size=settings.OUTBOX_BATCH_SIZE,
+        poll_seconds=settings.OUTBOX_POLL_SECONDS,
+        retry_base_seconds=settings.OUTBOX_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.OUTBOX_RETRY_MAX_SECONDS
+    )
+    if settings.OUTBOX_ENABLED
+    else None
+)
+if outbox_dispatcher:
+    on_task_lists_committed(lambda task_list_ids: outbox_dispatcher.wake())
@@ -1,10 +1,64 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from ...domain.entities.task_list import TaskList
+from sqlalchemy import select, insert, update, delete, func, case, and_
+from ...domain.entities.task import TaskStatus
+from ...domain.entities.task_query import TaskQuery
+from ...domain.entities.task_collection import TaskCollection, TaskRecord
+from ...domain.entities.task_list import TaskList, TaskListStats
+from ...domain.exceptions import VersionConflictError
 from ...domain.repositories.task_list_repository import TaskListRepository
+from ..database import mark_task_lists_changed, record_task_events
+from ..events import TaskEvent, TaskEventType
+from ..outbox import (
+    TASK_LIST_CREATED, TASK_LIST_DELETED, TASK_LIST_UPDATED, write_outbox, write_task_list_outbox
+)
 from ..models.task_list_model import TaskListModel
+from ..models.task_model import TaskModel
+from .task_repository import RECORD_COLUMNS, task_query_conditions, task_query_ordering
+
+
+def _map_to_entity(db_task_list: TaskListModel) -> TaskList:
+    """
+    Maps a TaskListModel object to a TaskList domain entity with its stored counters
+    (rows are trusted, so not revalidated).
+    """
+    return TaskList.model_construct(
+        id=db_task_list.id,
+        title=db_task_list.title,
+        description=db_task_list.description,
+        stats=TaskListStats.model_construct(
+            total_tasks=db_task_list.task_count,
+            completed_tasks=db_task_list.completed_count,
+            percentage_sum=db_task_list.percentage_sum
+        ),
+        created_at=db_task_list.created_at,
+        updated_at=db_task_list.updated_at,
+        version=db_task_list.version
+    )
+
+
+# Entity attribute -> SQL expression, so a projection reads only the columns it needs. The
+# aggregates mirror TaskListStats, computed from the stored counters.
+_FIELD_EXPRESSIONS = {
+    "id": TaskListModel.id,
+    "title": TaskListModel.title,
+    "description": TaskListModel.description,
+    "completion_percentage": case(
+        (TaskListModel.task_count == 0, 0),
+        else_=TaskListModel.percentage_sum // TaskListModel.task_count
+    ),
+    "total_tasks": TaskListModel.task_count,
+    "completed_tasks": TaskListModel.completed_count,
+    "created_at": TaskListModel.created_at,
+    "updated_at": TaskListModel.updated_at,
+    "version": TaskListModel.version,
+}
+
+
+def _project(fields: Sequence[str]):
+    """Select only the expressions of the given task list attributes, labelled by name"""
+    return select(*(_FIELD_EXPRESSIONS[name].label(name) for name in fields))
 
 
 class SQLAlchemyTaskListRepository(TaskListRepository):
@@ -12,23 +66,23 @@ class SQLAlchemyTaskListRepository(TaskListRepository):
         self.session = session
 
     async def create(self, task_list: TaskList) -> TaskList:
-        db_task_list = TaskListModel(
-            title=task_list.title,
-            description=task_list.description,
-            created_at=task_list.created_at
+        stmt = (
+            insert(TaskListModel)
+            .values(
+                title=task_list.title,
+                description=task_list.description,
+                created_at=task_list.created_at or datetime.utcnow()
+            )
+            .returning(TaskListModel)
         )
+        db_task_list = (await self.session.scalars(stmt)).one()
+        # A new list may reuse the ID of a deleted one, so drop anything cached under it
+        mark_task_lists_changed(self.session, db_task_list.id)
+        created = _map_to_entity(db_task_list)
+        await write_task_list_outbox(self.session, TASK_LIST_CREATED, created)
+        await self.session.flush()
         
-        self.session.add(db_task_list)
-        await self.session.commit()
-        await self.session.refresh(db_task_list)
-        
-        return TaskList(
-            id=db_task_list.id,
-            title=db_task_list.title,
-            description=db_task_list.description,
-            created_at=db_task_list.created_at,
-            updated_at=db_task_list.updated_at
-        )
+        return created
 
     async def get_by_id(self, task_list_id: int) -> Optional[TaskList]:
         stmt = select(TaskListModel).where(TaskListModel.id == task_list_id)
@@ -38,49 +92,166 @@ class SQLAlchemyTaskListRepository(TaskListRepository):
         if not db_task_list:
             return None
         
-        return TaskList(
-            id=db_task_list.id,
-            title=db_task_list.title,
-            description=db_task_list.description,
-            created_at=db_task_list.created_at,
-            updated_at=db_task_list.updated_at
-        )
+        return _map_to_entity(db_task_list)
+
+    async def get_version(self, task_list_id: int) -> Optional[int]:
+        stmt = select(TaskListModel.version).where(TaskListModel.id == task_list_id)
+        return await self.session.scalar(stmt)
 
     async def get_all(self) -> List[TaskList]:
         stmt = select(TaskListModel)
         result = await self.session.execute(stmt)
         db_task_lists = result.scalars().all()
         
-        return [
-            TaskList(
-                id=db_task_list.id,
-                title=db_task_list.title,
-                description=db_task_list.description,
-                created_at=db_task_list.created_at,
-                updated_at=db_task_list.updated_at
-            )
-            for db_task_list in db_task_lists
-        ]
+        return [_map_to_entity(db_task_list) for db_task_list in db_task_lists]
+
+    async def get_all_with_stats(
+        self,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[TaskList]:
+        # The aggregates are materialized on the task_lists rows, so no join over tasks is needed
+        stmt = select(TaskListModel).order_by(TaskListModel.id)
+        
+        # Keyset pagination: continue after the last seen id so every page is an index seek
+        if after_id is not None:
+            stmt = stmt.where(TaskListModel.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        result = await self.session.execute(stmt)
+        db_task_lists = result.scalars().all()
+        
+        return [_map_to_entity(db_task_list) for db_task_list in db_task_lists]
 
-    async def update(self, task_list: TaskList) -> TaskList:
+    async def get_fields_by_id(
+        self,
+        task_list_id: int,
+        fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        stmt = _project(fields).where(TaskListModel.id == task_list_id)
+        row = (await self.session.execute(stmt)).mappings().one_or_none()
+        return dict(row) if row else None
+
+    async def get_all_fields(
+        self,
+        fields: Sequence[str],
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        stmt = _project(fields).order_by(TaskListModel.id)
+        
+        if after_id is not None:
+            stmt = stmt.where(TaskListModel.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+
+    async def get_with_filtered_tasks(
+        self,
+        task_list_id: int,
+        query: TaskQuery
+    ) -> Optional[TaskList]:
+        # One round trip: the list row carries the list-wide counters and the filters go
+        # into the join condition, so a list without matching tasks still comes back. The
+        # list is a single row, so the tasks come out in the order of the sort's index.
         stmt = (
-            update(TaskListModel)
-            .where(TaskListModel.id == task_list.id)
-            .values(
-                title=task_list.title,
-                description=task_list.description,
-                updated_at=task_list.updated_at
+            select(TaskListModel, *RECORD_COLUMNS)
+            .outerjoin(
+                TaskModel,
+                and_(TaskModel.task_list_id == TaskListModel.id, *task_query_conditions(query))
             )
+            .where(TaskListModel.id == task_list_id)
+            .order_by(*task_query_ordering(query))
         )
+        result = await self.session.execute(stmt)
+        rows = result.all()
         
-        await self.session.execute(stmt)
-        await self.session.commit()
+        if not rows:
+            return None
         
+        # Without matching tasks, the outer join yields a single row of NULL task columns
+        task_list = _map_to_entity(rows[0][0])
+        task_list.tasks = TaskCollection(
+            TaskRecord(*row[1:]) for row in rows if row[1] is not None
+        )
         return task_list
 
+    async def update(
+        self,
+        task_list_id: int,
+        *,
+        expected_version: Optional[int] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None
+    ) -> Optional[TaskList]:
+        condition = TaskListModel.id == task_list_id
+        if expected_version is not None:
+            condition = condition & (TaskListModel.version == expected_version)
+        
+        values = {"updated_at": datetime.utcnow(), "version": TaskListModel.version + 1}
+        if title is not None:
+            values["title"] = title
+        if description is not None:
+            values["description"] = description
+        
+        stmt = (
+            update(TaskListModel)
+            .where(condition)
+            .values(**values)
+            .returning(TaskListModel)
+            .execution_options(synchronize_session=False)
+        )
+        db_task_list = (await self.session.scalars(stmt)).one_or_none()
+        await self.session.flush()
+        
+        if not db_task_list:
+            # Only a failed conditional update pays for telling a conflict from a missing list
+            if expected_version is not None and await self.get_version(task_list_id) is not None:
+                raise VersionConflictError(
+                    f"Task list {task_list_id} is not at version {expected_version}"
+                )
+            return None
+        mark_task_lists_changed(self.session, task_list_id)
+        updated = _map_to_entity(db_task_list)
+        await write_task_list_outbox(self.session, TASK_LIST_UPDATED, updated)
+        return updated
+
     async def delete(self, task_list_id: int) -> bool:
         stmt = delete(TaskListModel).where(TaskListModel.id == task_list_id)
         result = await self.session.execute(stmt)
-        await self.session.commit()
+        mark_task_lists_changed(self.session, task_list_id)
+        # Subscribers refetch the list and find it gone
+        record_task_events(self.session, TaskEvent(TaskEventType.RESYNC, task_list_id))
+        if result.rowcount > 0:
+            await write_outbox(
+                self.session, TASK_LIST_DELETED, task_list_id, {"task_list_id": task_list_id}
+            )
+        await self.session.flush()
+        
+        return result.rowcount > 0
+
+    async def rebuild_stats(self) -> int:
+        """Recomputes the materialized task counters of every task list from the tasks table."""
+        def aggregate(expr):
+            return (
+                select(func.coalesce(expr, 0))
+                .where(TaskModel.task_list_id == TaskListModel.id)
+                .scalar_subquery()
+            )
+        
+        completed = case((TaskModel.status == TaskStatus.COMPLETED, 1), else_=0)
+        stmt = update(TaskListModel).values(
+            task_count=aggregate(func.count(TaskModel.id)),
+            completed_count=aggregate(func.sum(completed)),
+            percentage_sum=aggregate(func.sum(TaskModel.percentage)),
+            version=TaskListModel.version + 1
+        ).returning(TaskListModel.id)
+        
+        task_list_ids = (await self.session.scalars(stmt)).all()
+        mark_task_lists_changed(self.session, *task_list_ids)
+        await self.session.flush()
         
-        return result.rowcount > 0 
\ No newline at end of file
+        return len(task_list_ids)
@@ -1,15 +1,24 @@
+import re
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete
-from ...domain.entities.task import Task, TaskStatus, TaskPriority
+from sqlalchemy import select, insert, update, delete, func, case, literal, text
+from ...domain.entities.task import Task, TaskStatus, TaskPriority, STATUS_PERCENTAGE
+from ...domain.entities.task_collection import TaskCollection, TaskRecord
+from ...domain.entities.task_query import TaskQuery, TaskSort, TaskSortField
+from ...domain.exceptions import VersionConflictError
 from ...domain.repositories.task_repository import TaskRepository
-from ..models.task_model import TaskModel
+from ..database import mark_task_lists_changed, record_task_events
+from ..events import TaskEvent, TaskEventType
+from ..outbox import TASKS_DELETED, TASKS_UPDATED, write_outbox, write_task_outbox
+from ..models.task_list_model import TaskListModel
+from ..models.task_model import TaskModel, PRIORITY_RANK
+from ..models.task_search import tasks_fts, TASK_SEARCH_REBUILD
 
 
 def _map_to_entity(db_task: TaskModel) -> Task:
-    """Maps a TaskModel object to a Task domain entity."""
-    return Task(
+    """Maps a TaskModel object to a Task domain entity (rows are trusted, so not revalidated)."""
+    return Task.model_construct(
         id=db_task.id,
         title=db_task.title,
         description=db_task.description,
@@ -18,32 +27,264 @@ def _map_to_entity(db_task: TaskModel) -> Task:
         priority=db_task.priority,
         task_list_id=db_task.task_list_id,
         created_at=db_task.created_at,
-        updated_at=db_task.updated_at
+        updated_at=db_task.updated_at,
+        version=db_task.version
     )
 
 
+# Columns in TaskRecord order: reads of many tasks build records straight from the rows,
+# without ORM instances or Pydantic validation
+RECORD_COLUMNS = tuple(getattr(TaskModel, name) for name in TaskRecord.__slots__)
+
+
+async def _record_changes(
+    session: AsyncSession, event_type: TaskEventType, records: List[TaskRecord]
+):
+    """Record a change event and an outbox notification per written row"""
+    record_task_events(
+        session, *(TaskEvent(event_type, record.task_list_id, record) for record in records)
+    )
+    await write_task_outbox(session, event_type.value, records)
+
+
+def _project(fields: Sequence[str]):
+    """Select only the columns of the given task attributes, labelled by attribute name"""
+    return select(*(getattr(TaskModel, name).label(name) for name in fields))
+
+
+_SORT_EXPRESSIONS = {
+    TaskSortField.PRIORITY: PRIORITY_RANK,
+    TaskSortField.PERCENTAGE: TaskModel.percentage,
+    TaskSortField.CREATED_AT: TaskModel.created_at,
+    TaskSortField.UPDATED_AT: TaskModel.updated_at,
+}
+
+
+def task_query_conditions(query: TaskQuery) -> List:
+    """SQL conditions for the filters of a task query"""
+    conditions = []
+    if query.statuses:
+        conditions.append(TaskModel.status.in_(query.statuses))
+    if query.priorities:
+        conditions.append(TaskModel.priority.in_(query.priorities))
+    if query.created_after is not None:
+        conditions.append(TaskModel.created_at > query.created_after)
+    if query.created_before is not None:
+        conditions.append(TaskModel.created_at < query.created_before)
+    if query.updated_after is not None:
+        conditions.append(TaskModel.updated_at > query.updated_after)
+    if query.updated_before is not None:
+        conditions.append(TaskModel.updated_at < query.updated_before)
+    if query.min_percentage is not None:
+        conditions.append(TaskModel.percentage >= query.min_percentage)
+    if query.max_percentage is not None:
+        conditions.append(TaskModel.percentage <= query.max_percentage)
+    return conditions
+
+
+def task_query_ordering(query: TaskQuery) -> List:
+    """
+    ORDER BY for the sort of a task query. A trailing priority key is followed by age (oldest
+    first for the most urgent first) and ID breaks the remaining ties in the direction of the
+    last key, so every single-key sort and its reverse are one scan of a task index.
+    """
+    keys = list(query.sort)
+    if keys and keys[-1].field == TaskSortField.PRIORITY:
+        keys.append(TaskSort(TaskSortField.CREATED_AT, not keys[-1].descending))
+    
+    ordering = [
+        _SORT_EXPRESSIONS[key.field].desc() if key.descending else _SORT_EXPRESSIONS[key.field]
+        for key in keys
+    ]
+    ordering.append(TaskModel.id.desc() if keys and keys[-1].descending else TaskModel.id)
+    return ordering
+
+
+def _match_expression(query: str) -> Optional[str]:
+    """
+    FTS5 query matching every word of `query`, the last one as a prefix (as typed so far).
+    Only word characters are kept, so user input can never be parsed as FTS5 syntax.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+def _completed_flag(status):
+    """SQL expression that is 1 for a completed task and 0 otherwise."""
+    return case((status == TaskStatus.COMPLETED, 1), else_=0)
+
+
 class SQLAlchemyTaskRepository(TaskRepository):
     def __init__(self, session: AsyncSession):
         """Initializes the repository with a database session."""
         self.session = session
 
-    async def create(self, task: Task) -> Task:
-        """Creates a new task in the database."""
-        db_task = TaskModel(
-            title=task.title,
-            description=task.description,
-            status=task.status,
-            percentage=task.percentage,
-            priority=task.priority,
-            task_list_id=task.task_list_id,
-            created_at=task.created_at
+    async def _adjust_list_counters(self, condition, count=None, completed=None, percentage=None):
+        """
+        Adds per-task deltas to the materialized counters of the task lists owning the tasks
+        matching `condition`, and bumps their version. Each delta is a SQL expression evaluated
+        on the matching rows and summed per list, so the adjustment runs as one set-based UPDATE.
+        """
+        def contribution(expr):
+            return (
+                select(func.coalesce(func.sum(expr), 0))
+                .where(TaskModel.task_list_id == TaskListModel.id, condition)
+                .scalar_subquery()
+            )
+        
+        values = {"version": TaskListModel.version + 1}
+        if count is not None:
+            values["task_count"] = TaskListModel.task_count + contribution(count)
+        if completed is not None:
+            values["completed_count"] = TaskListModel.completed_count + contribution(completed)
+        if percentage is not None:
+            values["percentage_sum"] = TaskListModel.percentage_sum + contribution(percentage)
+        
+        stmt = (
+            update(TaskListModel)
+            .where(TaskListModel.id.in_(select(TaskModel.task_list_id).where(condition)))
+            .values(**values)
+        )
+        await self.session.execute(stmt)
+
+    async def _shift_list_counters(self, condition, sign: int):
+        """
+        Adds (sign=1) or removes (sign=-1) the contribution of the tasks matching
+        `condition` to the materialized counters of their task lists.
+        """
+        await self._adjust_list_counters(
+            condition,
+            count=literal(sign),
+            completed=sign * _completed_flag(TaskModel.status),
+            percentage=sign * TaskModel.percentage
         )
+
+    async def _update_tasks(self, condition, *, status=None, percentage=None, **fields):
+        """
+        Adjusts the list counters for the new status/percentage of the tasks matching
+        `condition` and returns the UPDATE statement setting them, ready to execute or to
+        extend with RETURNING. Fields left as None are not changed.
+        """
+        # Same rules as Task.update_status: some statuses force the percentage
+        if status in STATUS_PERCENTAGE:
+            percentage = STATUS_PERCENTAGE[status]
         
-        self.session.add(db_task)
-        await self.session.commit()
-        await self.session.refresh(db_task)
+        values = {name: value for name, value in fields.items() if value is not None}
+        values["updated_at"] = datetime.utcnow()
+        values["version"] = TaskModel.version + 1
+        if status is not None:
+            values["status"] = status
+        if percentage is not None:
+            values["percentage"] = percentage
         
-        return _map_to_entity(db_task)
+        # The new values are constants, so the counter deltas can be computed from the
+        # current rows before they are updated
+        await self._adjust_list_counters(
+            condition,
+            completed=(
+                (1 if status == TaskStatus.COMPLETED else 0) - _completed_flag(TaskModel.status)
+                if status is not None else None
+            ),
+            percentage=percentage - TaskModel.percentage if percentage is not None else None
+        )
+        return (
+            update(TaskModel)
+            .where(condition)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+
+    async def create(self, task: Task) -> Optional[Task]:
+        """Creates a new task, returning None if its task list does not exist."""
+        # The counters update doubles as the existence check of the task list
+        result = await self.session.execute(
+            update(TaskListModel)
+            .where(TaskListModel.id == task.task_list_id)
+            .values(
+                task_count=TaskListModel.task_count + 1,
+                completed_count=(
+                    TaskListModel.completed_count
+                    + (1 if task.status == TaskStatus.COMPLETED else 0)
+                ),
+                percentage_sum=TaskListModel.percentage_sum + task.percentage,
+                version=TaskListModel.version + 1
+            )
+        )
+        if result.rowcount == 0:
+            return None
+        mark_task_lists_changed(self.session, task.task_list_id)
+        
+        stmt = (
+            insert(TaskModel)
+            .values(
+                title=task.title,
+                description=task.description,
+                status=task.status,
+                percentage=task.percentage,
+                priority=task.priority,
+                task_list_id=task.task_list_id,
+                created_at=task.created_at or datetime.utcnow()
+            )
+            .returning(TaskModel)
+        )
+        db_task = (await self.session.scalars(stmt)).one()
+        await self.session.flush()
+        
+        created = _map_to_entity(db_task)
+        await _record_changes(
+            self.session, TaskEventType.CREATED, [TaskRecord.from_entity(created)]
+        )
+        return created
+
+    async def create_many(self, task_list_id: int, tasks: List[Task]) -> Optional[List[int]]:
+        """
+        Creates several tasks with a multi-row INSERT and a single counters update, returning
+        None if the task list does not exist.
+        """
+        result = await self.session.execute(
+            update(TaskListModel)
+            .where(TaskListModel.id == task_list_id)
+            .values(
+                task_count=TaskListModel.task_count + len(tasks),
+                completed_count=(
+                    TaskListModel.completed_count
+                    + sum(1 for task in tasks if task.status == TaskStatus.COMPLETED)
+                ),
+                percentage_sum=(
+                    TaskListModel.percentage_sum + sum(task.percentage for task in tasks)
+                ),
+                version=TaskListModel.version + 1
+            )
+        )
+        if result.rowcount == 0:
+            return None
+        mark_task_lists_changed(self.session, task_list_id)
+        
+        rows = [
+            {
+                "title": task.title,
+                "description": task.description,
+                "status": task.status,
+                "percentage": task.percentage,
+                "priority": task.priority,
+                "task_list_id": task_list_id,
+                "created_at": task.created_at,
+            }
+            for task in tasks
+        ]
+        
+        # Batched into multi-row INSERT ... RETURNING statements by SQLAlchemy. SQLite does not
+        # promise the order of RETURNING rows, but it assigns new rowids in insertion order, so
+        # sorting the ids restores the input order without falling back to row-by-row inserts.
+        stmt = insert(TaskModel).returning(*RECORD_COLUMNS)
+        result = await self.session.execute(stmt, rows)
+        created = sorted((TaskRecord(*row) for row in result), key=lambda record: record.id)
+        await self.session.flush()
+        
+        await _record_changes(self.session, TaskEventType.CREATED, created)
+        return [record.id for record in created]
 
     async def get_by_id(self, task_id: int) -> Optional[Task]:
         """Gets a task by its ID."""
@@ -53,87 +294,284 @@ class SQLAlchemyTaskRepository(TaskRepository):
         
         return _map_to_entity(db_task) if db_task else None
 
-    async def get_by_task_list_id(self, task_list_id: int) -> List[Task]:
-        """Gets all tasks associated with a task list."""
-        stmt = select(TaskModel).where(TaskModel.task_list_id == task_list_id)
-        result = await self.session.execute(stmt)
-        db_tasks = result.scalars().all()
+    async def get_version(self, task_id: int) -> Optional[int]:
+        """Gets the version of a task."""
+        stmt = select(TaskModel.version).where(TaskModel.id == task_id)
+        return await self.session.scalar(stmt)
+
+    async def get_by_task_list_id(
+        self,
+        task_list_id: int,
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> TaskCollection:
+        """Gets tasks associated with a task list, ordered by ID (keyset paginated)."""
+        stmt = (
+            select(*RECORD_COLUMNS)
+            .where(TaskModel.task_list_id == task_list_id)
+            .order_by(TaskModel.id)
+        )
         
-        return [_map_to_entity(db_task) for db_task in db_tasks]
+        if after_id is not None:
+            stmt = stmt.where(TaskModel.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        result = await self.session.execute(stmt)
+        return TaskCollection(TaskRecord(*row) for row in result)
+
+    async def get_fields_by_id(
+        self,
+        task_id: int,
+        fields: Sequence[str]
+    ) -> Optional[Dict[str, Any]]:
+        """Gets the given attributes of a task, selecting only their columns."""
+        stmt = _project(fields).where(TaskModel.id == task_id)
+        row = (await self.session.execute(stmt)).mappings().one_or_none()
+        return dict(row) if row else None
 
-    async def get_filtered_tasks(
+    async def get_fields_by_task_list_id(
         self,
         task_list_id: int,
+        fields: Sequence[str],
+        after_id: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Gets the given attributes of the tasks of a list, ordered by ID (keyset paginated)."""
+        stmt = (
+            _project(fields)
+            .where(TaskModel.task_list_id == task_list_id)
+            .order_by(TaskModel.id)
+        )
+        
+        if after_id is not None:
+            stmt = stmt.where(TaskModel.id > after_id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings()]
+
+    async def stream_tasks(
+        self,
+        task_list_id: Optional[int] = None,
+        batch_size: int = 1000
+    ) -> AsyncIterator[List[TaskRecord]]:
+        """Streams tasks ordered by ID in batches using a server-side cursor."""
+        stmt = (
+            select(*RECORD_COLUMNS)
+            .order_by(TaskModel.id)
+            .execution_options(yield_per=batch_size)
+        )
+        if task_list_id is not None:
+            stmt = stmt.where(TaskModel.task_list_id == task_list_id)
+        
+        result = await self.session.stream(stmt)
+        async for partition in result.partitions():
+            yield [TaskRecord(*row) for row in partition]
+
+    async def get_filtered_tasks(self, task_list_id: int, query: TaskQuery) -> TaskCollection:
+        """Gets the tasks of a list matching the query's filters, in the query's order."""
+        stmt = (
+            select(*RECORD_COLUMNS)
+            .where(TaskModel.task_list_id == task_list_id, *task_query_conditions(query))
+            .order_by(*task_query_ordering(query))
+        )
+        result = await self.session.execute(stmt)
+        return TaskCollection(TaskRecord(*row) for row in result)
+
+    async def search(
+        self,
+        query: str,
+        *,
+        task_list_id: Optional[int] = None,
         status: Optional[TaskStatus] = None,
-        priority: Optional[TaskPriority] = None
-    ) -> List[Task]:
-        """Gets tasks filtered by status and/or priority."""
-        stmt = select(TaskModel).where(TaskModel.task_list_id == task_list_id)
+        priority: Optional[TaskPriority] = None,
+        max_id: Optional[int] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> List[TaskRecord]:
+        """Searches the full-text index, joining only the matching tasks."""
+        match = _match_expression(query)
+        if match is None:
+            return []
+        
+        stmt = (
+            select(*RECORD_COLUMNS)
+            .select_from(tasks_fts)
+            .join(TaskModel, TaskModel.id == tasks_fts.c.rowid)
+            .where(tasks_fts.c.tasks_fts.op("MATCH")(match))
+            .order_by(tasks_fts.c.rank, TaskModel.id)
+        )
         
+        if task_list_id is not None:
+            stmt = stmt.where(TaskModel.task_list_id == task_list_id)
         if status:
             stmt = stmt.where(TaskModel.status == status)
         if priority:
             stmt = stmt.where(TaskModel.priority == priority)
+        if max_id is not None:
+            stmt = stmt.where(TaskModel.id <= max_id)
+        # BM25 scores change whenever a matching row is written, so positions are counted
+        # instead of continuing after a stored score
+        if offset:
+            stmt = stmt.offset(offset)
+        if limit is not None:
+            stmt = stmt.limit(limit)
         
         result = await self.session.execute(stmt)
-        db_tasks = result.scalars().all()
-        
-        return [_map_to_entity(db_task) for db_task in db_tasks]
+        return [TaskRecord(*row) for row in result]
 
-    async def update(self, task: Task) -> Task:
-        """Updates an existing task."""
-        stmt = (
-            update(TaskModel)
-            .where(TaskModel.id == task.id)
-            .values(
-                title=task.title,
-                description=task.description,
-                status=task.status,
-                percentage=task.percentage,
-                priority=task.priority,
-                updated_at=task.updated_at
-            )
+    async def get_last_id(self) -> Optional[int]:
+        """Gets the highest task ID, which new tasks always exceed."""
+        return await self.session.scalar(select(func.max(TaskModel.id)))
+
+    async def rebuild_search_index(self):
+        """Rebuilds the full-text index from the tasks table."""
+        await self.session.execute(text(TASK_SEARCH_REBUILD))
+        await self.session.flush()
+
+    async def update(
+        self,
+        task_id: int,
+        *,
+        expected_version: Optional[int] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        priority: Optional[TaskPriority] = None,
+        percentage: Optional[int] = None
+    ) -> Optional[Task]:
+        """Updates the given fields of a task, returning None if it does not exist."""
+        stmt = await self._update_tasks(
+            self._version_condition(task_id, expected_version),
+            title=title,
+            description=description,
+            priority=priority,
+            percentage=percentage
         )
-        
-        await self.session.execute(stmt)
-        await self.session.commit()
-        
-        return task
+        return await self._update_one(stmt, task_id, expected_version)
 
-    async def update_status(self, task_id: int, status: TaskStatus) -> Task:
-        """Updates the status of a task."""
-        stmt = (
-            update(TaskModel)
-            .where(TaskModel.id == task_id)
-            .values(
-                status=status,
-                updated_at=datetime.utcnow()
-            )
+    async def update_status(
+        self,
+        task_id: int,
+        status: TaskStatus,
+        expected_version: Optional[int] = None
+    ) -> Optional[Task]:
+        """Updates the status of a task, returning None if it does not exist."""
+        stmt = await self._update_tasks(
+            self._version_condition(task_id, expected_version), status=status
         )
+        return await self._update_one(stmt, task_id, expected_version)
+
+    @staticmethod
+    def _version_condition(task_id: int, expected_version: Optional[int]):
+        """Selects the task, only at the expected version when one is given."""
+        condition = TaskModel.id == task_id
+        if expected_version is not None:
+            condition = condition & (TaskModel.version == expected_version)
+        return condition
+
+    async def _update_one(
+        self, stmt, task_id: int, expected_version: Optional[int]
+    ) -> Optional[Task]:
+        """Runs a single-task UPDATE and returns the updated row via RETURNING."""
+        db_task = (await self.session.scalars(stmt.returning(TaskModel))).one_or_none()
+        await self.session.flush()
         
-        await self.session.execute(stmt)
-        await self.session.commit()
+        if not db_task:
+            # Only a failed conditional update pays for telling a conflict from a missing task
+            if expected_version is not None and await self.get_version(task_id) is not None:
+                raise VersionConflictError(f"Task {task_id} is not at version {expected_version}")
+            return None
+        mark_task_lists_changed(self.session, db_task.task_list_id)
+        updated = _map_to_entity(db_task)
+        await _record_changes(
+            self.session, TaskEventType.UPDATED, [TaskRecord.from_entity(updated)]
+        )
+        return updated
+
+    async def update_many(
+        self,
+        task_ids: Optional[List[int]] = None,
+        task_list_id: Optional[int] = None,
+        status_filter: Optional[TaskStatus] = None,
+        priority_filter: Optional[TaskPriority] = None,
+        *,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        percentage: Optional[int] = None
+    ) -> int:
+        """Updates every selected task with one set-based UPDATE."""
+        if task_ids is not None:
+            condition = TaskModel.id.in_(task_ids)
+        else:
+            condition = TaskModel.task_list_id == task_list_id
+            if status_filter:
+                condition = condition & (TaskModel.status == status_filter)
+            if priority_filter:
+                condition = condition & (TaskModel.priority == priority_filter)
+        
+        stmt = await self._update_tasks(
+            condition, status=status, priority=priority, percentage=percentage
+        )
+        if task_ids is None:
+            result = await self.session.execute(stmt)
+            updated = result.rowcount
+            mark_task_lists_changed(self.session, task_list_id)
+            # A filtered update can touch any number of rows, so subscribers refetch instead
+            # and downstream systems get a single notification describing it
+            record_task_events(self.session, TaskEvent(TaskEventType.RESYNC, task_list_id))
+            await write_outbox(self.session, TASKS_UPDATED, task_list_id, {
+                "task_list_id": task_list_id,
+                "filter": {"status": status_filter, "priority": priority_filter},
+                "changes": {"status": status, "priority": priority, "percentage": percentage},
+                "updated": updated,
+            })
+        else:
+            # The lists owning the selected tasks are only known from the updated rows
+            result = await self.session.execute(stmt.returning(*RECORD_COLUMNS))
+            records = [TaskRecord(*row) for row in result]
+            updated = len(records)
+            mark_task_lists_changed(self.session, *(record.task_list_id for record in records))
+            await _record_changes(self.session, TaskEventType.UPDATED, records)
+        await self.session.flush()
         
-        # Get the updated task
-        updated_task = await self.get_by_id(task_id)
-        if not updated_task:
-            # This case should ideally not be reached if the update was successful
-            # and the task existed. But as a safeguard:
-            raise RuntimeError(f"Task with id {task_id} not found after update.")
-        return updated_task
+        return updated
 
     async def delete(self, task_id: int) -> bool:
         """Deletes a task by its ID."""
-        stmt = delete(TaskModel).where(TaskModel.id == task_id)
-        result = await self.session.execute(stmt)
-        await self.session.commit()
+        stmt = delete(TaskModel).where(TaskModel.id == task_id).returning(*RECORD_COLUMNS)
+        await self._shift_list_counters(TaskModel.id == task_id, -1)
+        row = (await self.session.execute(stmt)).one_or_none()
+        await self.session.flush()
         
-        return result.rowcount > 0
+        if row is None:
+            return False
+        deleted = TaskRecord(*row)
+        mark_task_lists_changed(self.session, deleted.task_list_id)
+        await _record_changes(self.session, TaskEventType.DELETED, [deleted])
+        return True
 
     async def delete_by_task_list_id(self, task_list_id: int) -> bool:
         """Deletes all tasks associated with a task list."""
         stmt = delete(TaskModel).where(TaskModel.task_list_id == task_list_id)
         result = await self.session.execute(stmt)
-        await self.session.commit()
+        await self.session.execute(
+            update(TaskListModel)
+            .where(TaskListModel.id == task_list_id)
+            .values(
+                task_count=0,
+                completed_count=0,
+                percentage_sum=0,
+                version=TaskListModel.version + 1
+            )
+        )
+        mark_task_lists_changed(self.session, task_list_id)
+        record_task_events(self.session, TaskEvent(TaskEventType.RESYNC, task_list_id))
+        if result.rowcount > 0:
+            await write_outbox(self.session, TASKS_DELETED, task_list_id, {
+                "task_list_id": task_list_id, "deleted": result.rowcount
+            })
+        await self.session.flush()
         
         return result.rowcount > 0 
\ No newline at end of file
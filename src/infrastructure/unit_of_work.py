@@ -0,0 +1,23 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..domain.repositories.unit_of_work import UnitOfWork
+from .database import DEFER_COMMIT, commit_session
+from .repositories import SQLAlchemyTaskListRepository, SQLAlchemyTaskRepository
+
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    """Unit of work over one AsyncSession, shared by the SQLAlchemy repositories"""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__()
+        self.session = session
+        self.task_lists = SQLAlchemyTaskListRepository(session)
+        self.tasks = SQLAlchemyTaskRepository(session)
+
+    async def commit(self):
+        # Under group commit this only flushes; the coordinator commits the whole batch
+        await commit_session(self.session)
+
+    async def rollback(self):
+        # Under group commit the coordinator rolls back this operation's SAVEPOINT
+        if not self.session.info.get(DEFER_COMMIT):
+            await self.session.rollback()
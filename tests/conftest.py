@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.app import app
-from src.infrastructure.database import Base, get_db_session
+from src.infrastructure.database import Base, get_db_session, get_read_session
 
 # --- Test Database Setup ---
 # Use an in-memory SQLite database for testing.
@@ -30,8 +30,9 @@ async def override_get_db_session() -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
-# Apply the override to the FastAPI app.
+# Apply the override to the FastAPI app, for both the read-write and read-only sessions.
 app.dependency_overrides[get_db_session] = override_get_db_session
+app.dependency_overrides[get_read_session] = override_get_db_session
 
 
 # --- Pytest Fixtures ---
@@ -53,11 +54,22 @@ async def init_test_db():
     The `autouse=True` ensures this fixture is used for all tests.
     """
     async with engine.begin() as conn:
+        # Start from a clean schema so model changes are picked up by the test database
+        await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     yield
     # Teardown is handled by the in-memory nature of the database.
 
 
+@pytest.fixture(scope="function")
+async def db_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provides a database session for tests that exercise repositories directly.
+    """
+    async with TestingSessionLocal() as session:
+        yield session
+
+
 @pytest.fixture(scope="function")
 async def client() -> AsyncGenerator[AsyncClient, None]:
     """
@@ -0,0 +1,34 @@
+import pytest
+from httpx import AsyncClient
+
+# --- Metrics API Integration Tests ---
+
+@pytest.mark.asyncio
+async def test_metrics_label_requests_by_route_template(client: AsyncClient):
+    """Tests that /metrics reports requests by route template, status and response size."""
+    response = await client.post("/task-lists/", json={"title": "Measured"})
+    task_list_id = response.json()["id"]
+    await client.get(f"/task-lists/{task_list_id}")
+    await client.get("/no/such/path")
+    for method in ("X0", "X1"):
+        await client.request(method, "/nope")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    lines = response.text.splitlines()
+    route = 'method="GET",route="/task-lists/{task_list_id}"'
+    assert any(line.startswith(f'http_requests_total{{{route},status="200"}}') for line in lines)
+    assert any(
+        line.startswith(f'http_request_duration_seconds_bucket{{{route},le="+Inf"}}')
+        for line in lines
+    )
+    assert any(line.startswith(f"http_response_size_bytes_sum{{{route}}}") for line in lines)
+    assert any('route="<unmatched>",status="404"' in line for line in lines)
+    assert not any(f"/task-lists/{task_list_id}\"" in line for line in lines)
+    # Unknown methods share one label value instead of adding a series each
+    assert not any('method="X' in line for line in lines)
+    assert any(line.startswith('http_requests_total{method="other",') for line in lines)
+    assert "http_requests_in_progress 1" in lines
+    assert any(line.startswith("response_cache_hits ") for line in lines)
@@ -1,5 +1,16 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.routes import response_cache
+from src.infrastructure.models import TaskListModel
+from src.application.pagination import encode_cursor
+
+
+def _cursor_before(task_list_id: int) -> str:
+    """Builds a cursor whose next page starts at the given task list."""
+    return encode_cursor(task_list_id - 1)
 
 # --- TaskList API Integration Tests ---
 
@@ -32,12 +43,12 @@ async def test_get_all_task_lists(client: AsyncClient):
     await client.post("/task-lists/", json={"title": "List A"})
     await client.post("/task-lists/", json={"title": "List B"})
 
-    response = await client.get("/task-lists/")
+    response = await client.get("/task-lists/", params={"limit": 1000})
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) >= 2
-    assert "List A" in [item["title"] for item in data]
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) >= 2
+    assert "List A" in [item["title"] for item in data["items"]]
 
 
 @pytest.mark.asyncio
@@ -76,4 +87,220 @@ async def test_delete_task_list(client: AsyncClient):
 async def test_get_nonexistent_task_list(client: AsyncClient):
     """Tests that requesting a non-existent task list returns a 404 error."""
     response = await client.get("/task-lists/99999")
-    assert response.status_code == 404 
\ No newline at end of file
+    assert response.status_code == 404 
+
+@pytest.mark.asyncio
+async def test_get_all_task_lists_includes_aggregates(client: AsyncClient):
+    """Tests that the list endpoint returns per-list task aggregates."""
+    response = await client.post("/task-lists/", json={"title": "Aggregated List"})
+    task_list_id = response.json()["id"]
+    empty_response = await client.post("/task-lists/", json={"title": "Empty Aggregated List"})
+    empty_list_id = empty_response.json()["id"]
+
+    done = await client.post(
+        f"/tasks/{task_list_id}/tasks", json={"title": "Done", "percentage": 100}
+    )
+    await client.patch(f"/tasks/task/{done.json()['id']}/status", json={"status": "completed"})
+    await client.post(f"/tasks/{task_list_id}/tasks", json={"title": "Half", "percentage": 50})
+
+    response = await client.get("/task-lists/", params={"cursor": _cursor_before(task_list_id)})
+    assert response.status_code == 200
+    by_id = {item["id"]: item for item in response.json()["items"]}
+
+    assert by_id[task_list_id]["total_tasks"] == 2
+    assert by_id[task_list_id]["completed_tasks"] == 1
+    assert by_id[task_list_id]["completion_percentage"] == 75
+    assert by_id[empty_list_id]["total_tasks"] == 0
+    assert by_id[empty_list_id]["completion_percentage"] == 0
+
+
+@pytest.mark.asyncio
+async def test_paginate_task_lists_with_cursor(client: AsyncClient):
+    """Tests walking the task lists page by page using the returned cursor."""
+    created_ids = []
+    for title in ("Page 1", "Page 2", "Page 3"):
+        response = await client.post("/task-lists/", json={"title": title})
+        created_ids.append(response.json()["id"])
+
+    cursor = _cursor_before(created_ids[0])
+    response = await client.get("/task-lists/", params={"limit": 2, "cursor": cursor})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [item["id"] for item in first_page["items"]] == created_ids[:2]
+    assert first_page["next_cursor"] is not None
+
+    response = await client.get(
+        "/task-lists/", params={"limit": 2, "cursor": first_page["next_cursor"]}
+    )
+    second_page = response.json()
+    assert second_page["items"][0]["id"] == created_ids[2]
+
+
+@pytest.mark.asyncio
+async def test_get_task_lists_invalid_cursor(client: AsyncClient):
+    """Tests that a malformed cursor is rejected with a 400 error."""
+    response = await client.get("/task-lists/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_task_list_counters_follow_task_writes(client: AsyncClient):
+    """Tests that the stored task counters stay consistent across task writes."""
+    response = await client.post("/task-lists/", json={"title": "Counted List"})
+    task_list_id = response.json()["id"]
+
+    tasks_url = f"/tasks/{task_list_id}/tasks"
+    first = await client.post(tasks_url, json={"title": "A", "percentage": 20})
+    second = await client.post(tasks_url, json={"title": "B", "percentage": 40})
+    await client.put(f"/tasks/task/{first.json()['id']}", json={"percentage": 60})
+    await client.patch(
+        f"/tasks/task/{first.json()['id']}/status", json={"status": "completed"}
+    )
+    await client.delete(f"/tasks/task/{second.json()['id']}")
+
+    response = await client.get(f"/task-lists/{task_list_id}")
+    data = response.json()
+    assert data["total_tasks"] == 1
+    assert data["completed_tasks"] == 1
+    # Completing a task forces its percentage to 100
+    assert data["completion_percentage"] == 100
+
+
+@pytest.mark.asyncio
+async def test_cached_task_list_is_invalidated_by_writes(client: AsyncClient):
+    """Tests that repeated reads are served from the cache until the list changes."""
+    response = await client.post("/task-lists/", json={"title": "Cached List"})
+    task_list_id = response.json()["id"]
+
+    await client.get(f"/task-lists/{task_list_id}")
+    hits = response_cache.hits
+    response = await client.get(f"/task-lists/{task_list_id}")
+    assert response.json()["total_tasks"] == 0
+    # The version used for the ETag is always read, the list itself comes from the cache
+    assert response_cache.hits == hits + 1
+
+    await client.post(f"/tasks/{task_list_id}/tasks", json={"title": "New task"})
+
+    response = await client.get(f"/task-lists/{task_list_id}")
+    assert response.json()["total_tasks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cached_task_list_sees_writes_from_other_processes(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """Tests that a write this process was not told about is served and changes the ETag."""
+    response = await client.post("/task-lists/", json={"title": "Shared List"})
+    task_list_id = response.json()["id"]
+    response = await client.get(f"/task-lists/{task_list_id}")
+    etag = response.headers["etag"]
+
+    # Like another worker would, write without marking the list as changed in this process
+    await db_session.execute(
+        update(TaskListModel)
+        .where(TaskListModel.id == task_list_id)
+        .values(title="Renamed elsewhere", version=TaskListModel.version + 1)
+    )
+    await db_session.commit()
+
+    response = await client.get(f"/task-lists/{task_list_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "Renamed elsewhere"
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_task_list(client: AsyncClient):
+    """Tests that an unchanged task list answers If-None-Match with 304."""
+    response = await client.post("/task-lists/", json={"title": "Polled List"})
+    task_list_id = response.json()["id"]
+
+    response = await client.get(f"/task-lists/{task_list_id}")
+    etag = response.headers["etag"]
+
+    response = await client.get(f"/task-lists/{task_list_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # Any write to the list or its tasks changes the ETag
+    await client.post(f"/tasks/{task_list_id}/tasks", json={"title": "New task"})
+    response = await client.get(f"/task-lists/{task_list_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["total_tasks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_conditional_update_task_list(client: AsyncClient):
+    """Tests that a task list update with a stale If-Match is rejected with 409."""
+    response = await client.post("/task-lists/", json={"title": "Versioned List"})
+    task_list_id = response.json()["id"]
+    etag = (await client.get(f"/task-lists/{task_list_id}")).headers["etag"]
+
+    # Adding a task changes the list representation, so the old ETag is stale
+    await client.post(f"/tasks/{task_list_id}/tasks", json={"title": "New task"})
+    response = await client.put(
+        f"/task-lists/{task_list_id}", json={"title": "Renamed"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 409
+
+    etag = (await client.get(f"/task-lists/{task_list_id}")).headers["etag"]
+    response = await client.put(
+        f"/task-lists/{task_list_id}", json={"title": "Renamed"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_recreated_task_list_never_matches_old_etags(client: AsyncClient):
+    """Tests that a list created after a delete cannot match the deleted list's ETag."""
+    response = await client.post("/task-lists/", json={"title": "List A"})
+    old_id = response.json()["id"]
+    response = await client.put(f"/task-lists/{old_id}", json={"title": "List A v1"})
+    etag = response.headers["etag"]
+    await client.delete(f"/task-lists/{old_id}")
+
+    # The highest ID was freed, but is not handed out again
+    response = await client.post("/task-lists/", json={"title": "List B"})
+    new_id = response.json()["id"]
+    await client.put(f"/task-lists/{new_id}", json={"title": "List B v1"})
+    assert new_id != old_id
+
+    response = await client.get(f"/task-lists/{old_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+    response = await client.put(
+        f"/task-lists/{old_id}", json={"title": "Stale"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 404
+    response = await client.get(f"/task-lists/{new_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["title"] == "List B v1"
+
+
+@pytest.mark.asyncio
+async def test_task_list_sparse_fieldsets(client: AsyncClient):
+    """Tests that `fields` returns only the requested fields, aggregates included."""
+    response = await client.post("/task-lists/", json={"title": "Sparse List"})
+    task_list_id = response.json()["id"]
+    await client.post(f"/tasks/{task_list_id}/tasks", json={"title": "Half", "percentage": 50})
+    await client.post(f"/tasks/{task_list_id}/tasks", json={"title": "Quarter", "percentage": 25})
+
+    response = await client.get(
+        f"/task-lists/{task_list_id}", params={"fields": "title,completion_percentage"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": task_list_id, "title": "Sparse List", "completion_percentage": 37
+    }
+    full = await client.get(f"/task-lists/{task_list_id}")
+    assert response.headers["etag"] != full.headers["etag"]
+
+    response = await client.get("/task-lists/", params={"fields": "total_tasks", "limit": 100})
+    items = response.json()["items"]
+    assert all(set(item) == {"id", "total_tasks"} for item in items)
+    assert {"id": task_list_id, "total_tasks": 2} in items
+
+    response = await client.get(f"/task-lists/{task_list_id}", params={"fields": "title,tasks"})
+    assert response.status_code == 400
@@ -1,7 +1,11 @@
+import json
+
 import pytest
 from httpx import AsyncClient
 
+from src.api.routes import sse_message, task_events
 from src.domain.entities.task import TaskPriority, TaskStatus
+from src.infrastructure.events import TaskEventType
 
 # --- Task API Integration Tests ---
 
@@ -33,9 +37,31 @@ async def test_get_tasks_by_list(client: AsyncClient, task_list: int):
     response = await client.get(f"/tasks/{task_list}/tasks")
     assert response.status_code == 200
     data = response.json()
-    assert isinstance(data, list)
-    assert len(data) > 0
-    assert data[0]["title"] == "Task A"
+    assert isinstance(data["items"], list)
+    assert len(data["items"]) > 0
+    assert data["items"][0]["title"] == "Task A"
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_paginate_tasks_by_list(client: AsyncClient, task_list: int):
+    """Tests that task pages are bounded by limit and chained through next_cursor."""
+    for title in ("Task 1", "Task 2", "Task 3"):
+        await client.post(f"/tasks/{task_list}/tasks", json={"title": title})
+
+    titles = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get(f"/tasks/{task_list}/tasks", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["items"]) <= 2
+        titles.extend(item["title"] for item in data["items"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert titles == ["Task 1", "Task 2", "Task 3"]
 
 
 @pytest.mark.asyncio
@@ -131,4 +157,464 @@ async def test_get_filtered_tasks(client: AsyncClient, task_list: int):
     assert response.status_code == 200
     data = response.json()
     assert len(data["filtered_tasks"]) == 1
-    assert data["filtered_tasks"][0]["title"] == "High Prio Done" 
\ No newline at end of file
+    assert data["filtered_tasks"][0]["title"] == "High Prio Done" 
+
+@pytest.mark.asyncio
+async def test_get_filtered_tasks_returns_list_aggregates(client: AsyncClient, task_list: int):
+    """Tests that the filtered endpoint reports aggregates over the whole list."""
+    done = await client.post(
+        f"/tasks/{task_list}/tasks", json={"title": "Done", "percentage": 100}
+    )
+    await client.patch(f"/tasks/task/{done.json()['id']}/status", json={"status": "completed"})
+    await client.post(
+        f"/tasks/{task_list}/tasks",
+        json={"title": "Urgent", "priority": TaskPriority.URGENT, "percentage": 20},
+    )
+
+    response = await client.get(f"/tasks/{task_list}/tasks/filtered?priority=urgent")
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["title"] for t in data["filtered_tasks"]] == ["Urgent"]
+    assert data["total_tasks"] == 2
+    assert data["completed_tasks"] == 1
+    assert data["completion_percentage"] == 60
+
+    # A filter matching nothing still returns the list and its aggregates
+    response = await client.get(f"/tasks/{task_list}/tasks/filtered?status=cancelled")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["filtered_tasks"] == []
+    assert data["total_tasks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_get_filtered_tasks_nonexistent_list(client: AsyncClient):
+    """Tests that filtering a non-existent list returns a 404 error."""
+    response = await client.get("/tasks/99999/tasks/filtered")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk(client: AsyncClient, task_list: int):
+    """Tests creating many tasks in one request."""
+    items = [{"title": f"Bulk {i}", "percentage": 10} for i in range(250)]
+    items[0]["priority"] = TaskPriority.URGENT
+    response = await client.post(f"/tasks/{task_list}/tasks/bulk", json={"tasks": items})
+    assert response.status_code == 201
+    created_ids = response.json()["created_ids"]
+    assert len(created_ids) == 250
+    assert created_ids == sorted(created_ids)
+
+    response = await client.get(f"/tasks/task/{created_ids[0]}")
+    assert response.json()["title"] == "Bulk 0"
+    assert response.json()["priority"] == TaskPriority.URGENT
+
+    response = await client.get(f"/task-lists/{task_list}")
+    assert response.json()["total_tasks"] == 250
+    assert response.json()["completion_percentage"] == 10
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_bulk_validation(client: AsyncClient, task_list: int):
+    """Tests that one invalid item rejects the whole bulk request."""
+    items = [{"title": "Valid"}, {"title": "", "percentage": 150}]
+    response = await client.post(f"/tasks/{task_list}/tasks/bulk", json={"tasks": items})
+    assert response.status_code == 422
+
+    response = await client.post("/tasks/99999/tasks/bulk", json={"tasks": [{"title": "A"}]})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_tasks_bulk_by_filter(client: AsyncClient, task_list: int):
+    """Tests marking every pending task of a list as completed in one request."""
+    items = [{"title": f"Todo {i}", "percentage": 40} for i in range(5)]
+    response = await client.post(f"/tasks/{task_list}/tasks/bulk", json={"tasks": items})
+    created_ids = response.json()["created_ids"]
+
+    response = await client.patch(
+        "/tasks/bulk",
+        json={"filter": {"task_list_id": task_list, "status": "pending"}, "status": "completed"},
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == 5
+
+    response = await client.get(f"/tasks/task/{created_ids[0]}")
+    assert response.json()["status"] == TaskStatus.COMPLETED
+    assert response.json()["percentage"] == 100
+
+    response = await client.get(f"/task-lists/{task_list}")
+    data = response.json()
+    assert data["completed_tasks"] == 5
+    assert data["completion_percentage"] == 100
+
+
+@pytest.mark.asyncio
+async def test_update_tasks_bulk_by_ids(client: AsyncClient, task_list: int):
+    """Tests updating an explicit set of tasks, leaving the others untouched."""
+    items = [{"title": f"Item {i}"} for i in range(3)]
+    response = await client.post(f"/tasks/{task_list}/tasks/bulk", json={"tasks": items})
+    first, second, third = response.json()["created_ids"]
+
+    response = await client.patch(
+        "/tasks/bulk",
+        json={"task_ids": [first, second], "priority": "urgent", "percentage": 30},
+    )
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+
+    response = await client.get(f"/tasks/task/{second}")
+    assert response.json()["priority"] == TaskPriority.URGENT
+    assert response.json()["percentage"] == 30
+    response = await client.get(f"/tasks/task/{third}")
+    assert response.json()["priority"] == TaskPriority.MEDIUM
+
+    response = await client.get(f"/task-lists/{task_list}")
+    assert response.json()["completion_percentage"] == 20
+
+
+@pytest.mark.asyncio
+async def test_update_tasks_bulk_requires_selection(client: AsyncClient):
+    """Tests that a bulk update needs exactly one selection and at least one change."""
+    response = await client.patch("/tasks/bulk", json={"status": "completed"})
+    assert response.status_code == 422
+    response = await client.patch("/tasks/bulk", json={"task_ids": [1]})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_writes_on_missing_rows_return_404(client: AsyncClient):
+    """Tests that writes detect missing rows without a separate lookup."""
+    response = await client.post("/tasks/999/tasks", json={"title": "Orphan"})
+    assert response.status_code == 404
+    response = await client.put("/tasks/task/999", json={"title": "Ghost"})
+    assert response.status_code == 404
+    response = await client.patch("/tasks/task/999/status", json={"status": "completed"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_tasks(client: AsyncClient, task_list: int):
+    """Tests ETags on a task and on the task collection of its list."""
+    response = await client.post(f"/tasks/{task_list}/tasks", json={"title": "Watched"})
+    task_id = response.json()["id"]
+
+    response = await client.get(f"/tasks/{task_list}/tasks")
+    collection_etag = response.headers["etag"]
+    response = await client.get(f"/tasks/task/{task_id}")
+    task_etag = response.headers["etag"]
+
+    response = await client.get(
+        f"/tasks/{task_list}/tasks", headers={"If-None-Match": f"W/{collection_etag}"}
+    )
+    assert response.status_code == 304
+    response = await client.get(f"/tasks/task/{task_id}", headers={"If-None-Match": task_etag})
+    assert response.status_code == 304
+
+    await client.patch(f"/tasks/task/{task_id}/status", json={"status": "completed"})
+
+    response = await client.get(
+        f"/tasks/{task_list}/tasks", headers={"If-None-Match": collection_etag}
+    )
+    assert response.status_code == 200
+    response = await client.get(f"/tasks/task/{task_id}", headers={"If-None-Match": task_etag})
+    assert response.status_code == 200
+    assert response.json()["status"] == TaskStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_conditional_update_detects_conflicts(client: AsyncClient, task_list: int):
+    """Tests that If-Match updates succeed once and then conflict with 409."""
+    response = await client.post(f"/tasks/{task_list}/tasks", json={"title": "Shared"})
+    task_id = response.json()["id"]
+    etag = (await client.get(f"/tasks/task/{task_id}")).headers["etag"]
+
+    response = await client.put(
+        f"/tasks/task/{task_id}", json={"title": "First edit"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    # A second writer holding the old ETag loses instead of clobbering the first edit
+    response = await client.patch(
+        f"/tasks/task/{task_id}/status",
+        json={"status": "completed"},
+        headers={"If-Match": etag},
+    )
+    assert response.status_code == 409
+    response = await client.get(f"/tasks/task/{task_id}")
+    assert response.json()["title"] == "First edit"
+    assert response.json()["status"] == TaskStatus.PENDING
+
+    response = await client.put(
+        "/tasks/task/99999", json={"title": "Missing"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_recreated_task_never_matches_old_etags(client: AsyncClient, task_list: int):
+    """Tests that a task created after a delete cannot match the deleted task's ETag."""
+    response = await client.post(f"/tasks/{task_list}/tasks", json={"title": "Task A"})
+    old_id = response.json()["id"]
+    etag = (await client.get(f"/tasks/task/{old_id}")).headers["etag"]
+    await client.delete(f"/tasks/task/{old_id}")
+
+    response = await client.post(f"/tasks/{task_list}/tasks", json={"title": "Task B"})
+    assert response.json()["id"] != old_id
+
+    response = await client.get(f"/tasks/task/{old_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+    response = await client.patch(
+        f"/tasks/task/{old_id}/status", json={"status": "completed"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_streams_ndjson(client: AsyncClient, task_list: int):
+    """Tests exporting the tasks of a list as one JSON document per line."""
+    items = [{"title": f"Export {i}", "percentage": i} for i in range(5)]
+    response = await client.post(f"/tasks/{task_list}/tasks/bulk", json={"tasks": items})
+    created_ids = response.json()["created_ids"]
+
+    response = await client.get(f"/tasks/{task_list}/tasks/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [task["id"] for task in lines] == created_ids
+    assert lines[3]["percentage"] == 3
+
+    response = await client.get("/tasks/export")
+    exported_ids = {json.loads(line)["id"] for line in response.text.splitlines()}
+    assert set(created_ids) <= exported_ids
+
+    response = await client.get("/tasks/99999/tasks/export")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson_reports_invalid_rows(client: AsyncClient, task_list: int):
+    """Tests that an NDJSON import keeps the valid rows and reports the others."""
+    body = "\n".join([
+        json.dumps({"title": "Imported 1", "percentage": 10}),
+        "{not json",
+        json.dumps({"title": "", "percentage": 150}),
+        "",
+        json.dumps({"title": "Imported 2", "priority": "high"}),
+    ])
+    response = await client.post(
+        f"/tasks/{task_list}/tasks/import",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["imported"] == 2
+    assert data["failed"] == 2
+    assert [error["line"] for error in data["errors"]] == [2, 3]
+
+    response = await client.get(f"/task-lists/{task_list}")
+    assert response.json()["total_tasks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_import_csv(client: AsyncClient, task_list: int):
+    """Tests importing CSV rows, including a quoted field spanning several lines."""
+    body = (
+        "title,description,priority,percentage\n"
+        'Plain,,low,5\n'
+        '"Quoted, title","first line\nsecond line",,\n'
+    )
+    response = await client.post(
+        f"/tasks/{task_list}/tasks/import",
+        content=body,
+        headers={"Content-Type": "text/csv"},
+    )
+    assert response.json() == {"imported": 2, "failed": 0, "errors": []}
+
+    response = await client.get(f"/tasks/{task_list}/tasks")
+    items = response.json()["items"]
+    assert items[0]["priority"] == TaskPriority.LOW
+    assert items[1]["title"] == "Quoted, title"
+    assert items[1]["description"] == "first line\nsecond line"
+
+    response = await client.post(
+        "/tasks/99999/tasks/import", content=body, headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_task_sparse_fieldsets(client: AsyncClient, task_list: int):
+    """Tests that `fields` returns only the requested task fields, paginated by id."""
+    for title in ("One", "Two", "Three"):
+        await client.post(f"/tasks/{task_list}/tasks", json={"title": title, "description": "x"})
+
+    response = await client.get(
+        f"/tasks/{task_list}/tasks", params={"fields": "title,status", "limit": 2}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [set(item) for item in data["items"]] == [{"id", "title", "status"}] * 2
+    assert data["items"][0]["status"] == TaskStatus.PENDING
+
+    params = {"fields": "title,status", "cursor": data["next_cursor"]}
+    response = await client.get(f"/tasks/{task_list}/tasks", params=params)
+    assert [item["title"] for item in response.json()["items"]] == ["Three"]
+
+    task_id = data["items"][0]["id"]
+    response = await client.get(f"/tasks/task/{task_id}", params={"fields": "percentage"})
+    assert response.json() == {"id": task_id, "percentage": 0}
+
+    # The projected ETag still carries the version, so it works as an If-Match precondition
+    etag = response.headers["etag"]
+    response = await client.put(
+        f"/tasks/task/{task_id}", json={"title": "Renamed"}, headers={"If-Match": etag}
+    )
+    assert response.status_code == 200
+
+    response = await client.get(f"/tasks/task/{task_id}", params={"fields": "secret"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(client: AsyncClient, task_list: int):
+    """Tests ranked full-text search with filters, pagination and index maintenance."""
+    tasks = [
+        {"title": "Fix login bug", "description": "Login fails on Safari"},
+        {"title": "Write docs", "description": "Explain the login flow"},
+        {"title": "Café menu", "priority": "high"},
+    ]
+    ids = []
+    for task in tasks:
+        ids.append((await client.post(f"/tasks/{task_list}/tasks", json=task)).json()["id"])
+
+    response = await client.get("/tasks/search", params={"q": "login", "task_list_id": task_list})
+    assert response.status_code == 200
+    # Matching both title and description ranks first
+    assert [item["id"] for item in response.json()["items"]] == [ids[0], ids[1]]
+
+    params = {"q": "log", "task_list_id": task_list, "limit": 1}
+    first = (await client.get("/tasks/search", params=params)).json()
+    params["cursor"] = first["next_cursor"]
+    second = (await client.get("/tasks/search", params=params)).json()
+    assert [first["items"][0]["id"], second["items"][0]["id"]] == [ids[0], ids[1]]
+    assert second["next_cursor"] is None
+
+    # Accents are folded and words are matched as prefixes
+    params = {"q": "cafe", "task_list_id": task_list, "priority": "high"}
+    response = await client.get("/tasks/search", params=params)
+    assert [item["id"] for item in response.json()["items"]] == [ids[2]]
+
+    # Updates and deletes keep the index in sync
+    await client.put(f"/tasks/task/{ids[1]}", json={"description": "Explain the flow"})
+    await client.delete(f"/tasks/task/{ids[0]}")
+    response = await client.get("/tasks/search", params={"q": "login", "task_list_id": task_list})
+    assert response.json()["items"] == []
+
+    response = await client.get("/tasks/search", params={"q": '"*(', "task_list_id": task_list})
+    assert response.json() == {"items": [], "next_cursor": None}
+
+
+@pytest.mark.asyncio
+async def test_search_pages_are_stable_across_writes(client: AsyncClient, task_list: int):
+    """Tests that tasks created between pages neither repeat nor skip search results."""
+    ids = []
+    for i in range(6):
+        task = {"title": f"Deploy {i}", "description": "deploy " * (i + 1)}
+        ids.append((await client.post(f"/tasks/{task_list}/tasks", json=task)).json()["id"])
+
+    params = {"q": "deploy", "task_list_id": task_list, "limit": 3}
+    first = (await client.get("/tasks/search", params=params)).json()
+
+    # New matches change every BM25 score, and would rank ahead of the next page
+    for _ in range(3):
+        task = {"title": "Deploy deploy deploy", "description": "deploy"}
+        await client.post(f"/tasks/{task_list}/tasks", json=task)
+
+    params["cursor"] = first["next_cursor"]
+    second = (await client.get("/tasks/search", params=params)).json()
+    returned = [item["id"] for item in first["items"] + second["items"]]
+    assert sorted(returned) == ids
+    assert second["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_filtered_tasks_etag_depends_on_filters(client: AsyncClient, task_list: int):
+    """Tests that each filter combination has its own ETag, so 304s never cross filters."""
+    await client.post(f"/tasks/{task_list}/tasks", json={"title": "Urgent", "priority": "urgent"})
+    url = f"/tasks/{task_list}/tasks/filtered"
+
+    urgent = await client.get(url, params={"priority": "urgent"})
+    etag = urgent.headers["etag"]
+    response = await client.get(url, params={"priority": "low"})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    response = await client.get(url, params={"priority": "low"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    response = await client.get(
+        url, params={"priority": "urgent"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_filtered_tasks_sort_and_ranges(client: AsyncClient, task_list: int):
+    """Tests sorting, multi-value filters and range filters on the filtered endpoint."""
+    for title, priority, percentage in [
+        ("Low", "low", 10), ("Urgent", "urgent", 40), ("High", "high", 80)
+    ]:
+        await client.post(
+            f"/tasks/{task_list}/tasks",
+            json={"title": title, "priority": priority, "percentage": percentage},
+        )
+
+    response = await client.get(
+        f"/tasks/{task_list}/tasks/filtered",
+        params={"sort": "-priority", "priority": ["urgent", "low"]},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["title"] for t in data["filtered_tasks"]] == ["Urgent", "Low"]
+    assert data["filter_applied"]["priority"] == ["urgent", "low"]
+    assert data["filter_applied"]["sort"] == "-priority"
+
+    params = {"min_percentage": 20, "max_percentage": 90, "sort": "-percentage"}
+    response = await client.get(f"/tasks/{task_list}/tasks/filtered", params=params)
+    assert [t["title"] for t in response.json()["filtered_tasks"]] == ["High", "Urgent"]
+
+    response = await client.get(f"/tasks/{task_list}/tasks/filtered", params={"sort": "title"})
+    assert response.status_code == 400
+    assert "Unknown sort field 'title'" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_task_list_events(client: AsyncClient, task_list: int):
+    """Tests that committed task writes are published to the task list's subscribers."""
+    subscription = task_events.subscribe(task_list)
+    assert (await subscription.get()).type is TaskEventType.RESYNC
+    try:
+        created = (await client.post(f"/tasks/{task_list}/tasks", json={"title": "Live"})).json()
+        await client.put(f"/tasks/task/{created['id']}", json={"title": "Live edit"})
+        await client.delete(f"/tasks/task/{created['id']}")
+
+        events = []
+        while not subscription.queue.empty():
+            events.append(subscription.queue.get_nowait())
+    finally:
+        task_events.unsubscribe(subscription)
+
+    assert [event.type for event in events] == [
+        TaskEventType.CREATED, TaskEventType.UPDATED, TaskEventType.DELETED
+    ]
+    assert events[1].task.title == "Live edit"
+    assert events[2].task.id == created["id"]
+
+    message = sse_message(events[1])
+    assert message.startswith("event: task.updated\ndata: ")
+    assert json.loads(message.split("data: ", 1)[1])["task"]["title"] == "Live edit"
+
+    response = await client.get("/task-lists/999999/events")
+    assert response.status_code == 404
@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.infrastructure.database import (
+    DB_POOL_WAIT_SECONDS,
+    DB_STATEMENT_ERRORS,
+    DB_STATEMENT_SECONDS,
+    InstrumentedQueuePool,
+    configure_sqlite_connection,
+    instrument_engine,
+    sqlite_read_only_url,
+)
+
+# --- Reader/Writer Engine Integration Tests ---
+
+def test_read_only_url_for_file_database():
+    """Tests that file-backed SQLite URLs are turned into read-only URIs."""
+    url = sqlite_read_only_url("sqlite+aiosqlite:///./data/tasks.db")
+    assert url.database == "file:./data/tasks.db"
+    assert url.query["mode"] == "ro"
+    assert url.query["uri"] == "true"
+
+
+@pytest.mark.parametrize(
+    "database_url",
+    ["sqlite+aiosqlite://", "sqlite+aiosqlite:///:memory:", "postgresql+asyncpg://db/tasks"],
+)
+def test_read_only_url_not_available(database_url: str):
+    """Tests that databases that cannot be shared fall back to a single engine."""
+    assert sqlite_read_only_url(database_url) is None
+
+
+@pytest.mark.asyncio
+async def test_reader_sees_writes_and_rejects_them(tmp_path):
+    """Tests that the read-only engine sees committed data but cannot modify it."""
+    database_url = f"sqlite+aiosqlite:///{tmp_path / 'split.db'}"
+    writer = create_async_engine(database_url)
+    configure_sqlite_connection(writer)
+    reader = create_async_engine(sqlite_read_only_url(database_url))
+    configure_sqlite_connection(reader, read_only=True)
+
+    async with writer.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        await conn.execute(text("INSERT INTO items (id) VALUES (1)"))
+
+    async with reader.connect() as conn:
+        assert (await conn.execute(text("SELECT count(*) FROM items"))).scalar() == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            await conn.execute(text("INSERT INTO items (id) VALUES (2)"))
+
+    await reader.dispose()
+    await writer.dispose()
+
+
+@pytest.mark.asyncio
+async def test_instrumented_engine_times_statements_and_checkouts(tmp_path):
+    """Tests that statement timings and pool checkout waits are recorded per engine."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'metrics.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="metrics-test"
+    )
+    instrument_engine(engine, "metrics-test")
+
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        await conn.execute(text("INSERT INTO items (id) VALUES (1), (2)"))
+        await conn.execute(text("SELECT id FROM items"))
+        with pytest.raises(OperationalError):
+            await conn.execute(text("SELECT missing FROM items"))
+    await engine.dispose()
+
+    assert DB_STATEMENT_SECONDS.labels("metrics-test", "SELECT").count == 1
+    assert DB_STATEMENT_SECONDS.labels("metrics-test", "INSERT").count == 1
+    assert DB_STATEMENT_SECONDS.labels("metrics-test", "OTHER").count == 1
+    assert DB_STATEMENT_ERRORS.labels("metrics-test").value == 1
+    assert DB_POOL_WAIT_SECONDS.labels("metrics-test").count == 1
@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.entities.task import Task
+from src.domain.entities.task_list import TaskList
+from src.infrastructure.database import (
+    Base, configure_sqlite_connection, on_task_events_committed, remove_task_events_listener
+)
+from src.infrastructure.events import EventBroker, TaskEventType
+from src.infrastructure.group_commit import WriteCoordinator
+from src.infrastructure.repositories import (
+    SQLAlchemyTaskListRepository, SQLAlchemyTaskRepository
+)
+
+# --- Group Commit Integration Tests ---
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'group.db'}")
+    configure_sqlite_connection(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine, sessionmaker(bind=engine, class_=AsyncSession, autoflush=False)
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_one_commit(session_factory):
+    """Tests that concurrent writes are committed together, isolating a failing one."""
+    engine, factory = session_factory
+    coordinator = WriteCoordinator(factory, window_seconds=0.05, max_batch_size=100)
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(conn))
+
+    async def create(title: str):
+        async def operation(session):
+            return await SQLAlchemyTaskListRepository(session).create(TaskList(title=title))
+        return await coordinator.submit(operation)
+
+    async def fail():
+        async def operation(session):
+            await SQLAlchemyTaskListRepository(session).create(TaskList(title="Rolled back"))
+            raise ValueError("boom")
+        return await coordinator.submit(operation)
+
+    results = await asyncio.gather(
+        *[create(f"List {i}") for i in range(5)], fail(), return_exceptions=True
+    )
+
+    created = results[:5]
+    assert all(isinstance(task_list, TaskList) and task_list.id for task_list in created)
+    assert isinstance(results[5], ValueError)
+    assert len(commits) == 1
+
+    async with factory() as session:
+        titles = [t.title for t in await SQLAlchemyTaskListRepository(session).get_all()]
+    assert sorted(titles) == [f"List {i}" for i in range(5)]
+
+
+@pytest.fixture
+def broker():
+    broker = EventBroker(max_queued_events=10)
+    on_task_events_committed(broker.publish)
+    yield broker
+    remove_task_events_listener(broker.publish)
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_operation_publishes_no_events(session_factory, broker):
+    """Tests that only the task events of the committed operations of a batch are published."""
+    _, factory = session_factory
+    async with factory() as session:
+        task_list = await SQLAlchemyTaskListRepository(session).create(TaskList(title="Events"))
+        await session.commit()
+
+    subscription = broker.subscribe(task_list.id)
+    assert (await subscription.get()).type is TaskEventType.RESYNC
+    coordinator = WriteCoordinator(factory, window_seconds=0.05, max_batch_size=100)
+
+    async def create(title: str, fail: bool = False):
+        async def operation(session):
+            await SQLAlchemyTaskRepository(session).create(
+                Task(title=title, task_list_id=task_list.id)
+            )
+            if fail:
+                raise ValueError("boom")
+        return await coordinator.submit(operation)
+
+    await asyncio.gather(
+        create("Kept"), create("Rolled back", fail=True), create("Also kept"),
+        return_exceptions=True
+    )
+
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    assert [event.task.title for event in events] == ["Kept", "Also kept"]
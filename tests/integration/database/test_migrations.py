@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+from src.infrastructure import database, migrations
+
+# --- Schema Migration Integration Tests ---
+
+LEGACY_SCHEMA = (
+    "CREATE TABLE task_lists (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+    "description TEXT, created_at DATETIME NOT NULL, updated_at DATETIME)",
+    "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title VARCHAR(200) NOT NULL, "
+    "description TEXT, status VARCHAR(11) NOT NULL, percentage INTEGER NOT NULL, "
+    "priority VARCHAR(6) NOT NULL, task_list_id INTEGER NOT NULL, "
+    "created_at DATETIME NOT NULL, updated_at DATETIME)",
+    "INSERT INTO task_lists (id, title, created_at) VALUES (1, 'Legacy', '2024-01-01')",
+    "INSERT INTO tasks (title, status, percentage, priority, task_list_id, created_at) "
+    "VALUES ('Done', 'COMPLETED', 100, 'HIGH', 1, '2024-01-01'), "
+    "('Open', 'PENDING', 20, 'LOW', 1, '2024-01-01')",
+)
+
+
+def test_upgrade_legacy_database(tmp_path):
+    """Tests that a database predating the migrations is brought up to date."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+
+    with engine.begin() as connection:
+        applied = migrations.upgrade(connection)
+    assert [migration.version for migration in applied] == [
+        migration.version for migration in migrations.load_migrations()
+    ]
+
+    with engine.connect() as connection:
+        # Read from sqlite_master, since expression indexes cannot be reflected
+        indexes = set(connection.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'tasks'"
+        )).scalars())
+        assert "ix_tasks_task_list_id_status_priority" in indexes
+        assert "ix_tasks_task_list_id_updated_at" in indexes
+        assert "ix_tasks_task_list_id_priority_rank_created_at" in indexes
+        assert "ix_tasks_task_list_id_percentage" in indexes
+
+        counters = connection.execute(text(
+            "SELECT task_count, completed_count, percentage_sum FROM task_lists WHERE id = 1"
+        )).one()
+        assert tuple(counters) == (2, 1, 120)
+
+        for table in ("task_lists", "tasks"):
+            columns = {column["name"] for column in inspect(connection).get_columns(table)}
+            assert "version" in columns
+
+        # Tasks that existed before the search index are indexed by the migration
+        matches = connection.execute(text(
+            "SELECT rowid FROM tasks_fts WHERE tasks_fts MATCH 'open'"
+        )).scalars().all()
+        assert len(matches) == 1
+
+        assert "outbox" in inspect(connection).get_table_names()
+
+        # The rebuilt tables keep their rows and foreign key, and never reuse IDs
+        for table in ("task_lists", "tasks"):
+            sql = connection.execute(text(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"
+            ), {"name": table}).scalar()
+            assert "AUTOINCREMENT" in sql
+        [foreign_key] = inspect(connection).get_foreign_keys("tasks")
+        assert foreign_key["referred_table"] == "task_lists"
+        last_id = connection.execute(text("SELECT max(id) FROM tasks")).scalar()
+        connection.execute(text(f"DELETE FROM tasks WHERE id = {last_id}"))
+        connection.execute(text(
+            "INSERT INTO tasks (title, status, percentage, priority, task_list_id, created_at) "
+            "VALUES ('New', 'PENDING', 0, 'LOW', 1, '2024-01-02')"
+        ))
+        assert connection.execute(text("SELECT max(id) FROM tasks")).scalar() == last_id + 1
+
+    # Running the upgrade again is a no-op
+    with engine.begin() as connection:
+        assert migrations.upgrade(connection) == []
+        assert migrations.pending_migrations(connection) == []
+    engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_startup_refuses_outdated_schema_without_auto_migrate(tmp_path, monkeypatch):
+    """Tests that with AUTO_MIGRATE off, startup fails on a database that needs migrations."""
+    path = tmp_path / "outdated.db"
+    sync_engine = create_engine(f"sqlite:///{path}")
+    with sync_engine.begin() as connection:
+        for statement in LEGACY_SCHEMA:
+            connection.execute(text(statement))
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(settings, "AUTO_MIGRATE", False)
+    try:
+        with pytest.raises(RuntimeError, match="0001"):
+            await database.init_db()
+        # Migrating explicitly (as the CLI does) brings it up to date
+        await database.migrate_db()
+        assert await database.get_pending_migrations() == []
+    finally:
+        await engine.dispose()
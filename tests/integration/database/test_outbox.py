@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.config import settings
+from src.domain.entities.task import Task, TaskStatus
+from src.domain.entities.task_list import TaskList
+from src.infrastructure.database import Base
+from src.infrastructure.models import OutboxModel
+from src.infrastructure.outbox import FileSink, OutboxDispatcher, OutboxSink
+from src.infrastructure.repositories import (
+    SQLAlchemyTaskListRepository, SQLAlchemyTaskRepository
+)
+
+# --- Transactional Outbox Integration Tests ---
+
+@pytest.fixture
+async def session_factory(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "OUTBOX_ENABLED", True)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'outbox.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield sessionmaker(bind=engine, class_=AsyncSession, autoflush=False)
+    await engine.dispose()
+
+
+async def outbox_types(factory) -> list:
+    async with factory() as session:
+        return list(await session.scalars(
+            select(OutboxModel.event_type).order_by(OutboxModel.id)
+        ))
+
+
+def make_dispatcher(factory, sink: OutboxSink, batch_size: int = 100) -> OutboxDispatcher:
+    return OutboxDispatcher(
+        sink, factory, factory, batch_size=batch_size, poll_seconds=0.01,
+        retry_base_seconds=0.01, retry_max_seconds=0.05
+    )
+
+
+@pytest.mark.asyncio
+async def test_notifications_commit_with_the_writes(session_factory):
+    """Tests that notifications are stored by the writing transaction, and only if it commits."""
+    async with session_factory() as session:
+        task_list = await SQLAlchemyTaskListRepository(session).create(TaskList(title="Outbox"))
+        task_repo = SQLAlchemyTaskRepository(session)
+        task = await task_repo.create(Task(title="Ship it", task_list_id=task_list.id))
+        await task_repo.update_status(task.id, TaskStatus.COMPLETED)
+        await task_repo.update_many(task_list_id=task_list.id, percentage=50)
+        await task_repo.delete(task.id)
+        await session.commit()
+
+        await task_repo.create(Task(title="Rolled back", task_list_id=task_list.id))
+        await session.rollback()
+
+    assert await outbox_types(session_factory) == [
+        "task_list.created", "task.created", "task.updated", "tasks.updated", "task.deleted"
+    ]
+
+
+class FlakySink(OutboxSink):
+    """Collects batches, failing the first `failures` attempts"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.batches = []
+
+    async def send(self, messages):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("receiver down")
+        self.batches.append(messages)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_retries_and_delivers_in_order(session_factory):
+    """Tests that a failing sink is retried and gets every message once, in batches and order."""
+    async with session_factory() as session:
+        task_list = await SQLAlchemyTaskListRepository(session).create(TaskList(title="Board"))
+        await SQLAlchemyTaskRepository(session).create_many(
+            task_list.id, [Task(title=f"T{i}", task_list_id=task_list.id) for i in range(4)]
+        )
+        await session.commit()
+
+    sink = FlakySink(failures=2)
+    dispatcher = make_dispatcher(session_factory, sink, batch_size=2)
+    dispatcher.start()
+    try:
+        for _ in range(200):
+            if dispatcher.dispatched == 5:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await dispatcher.stop()
+
+    assert [len(batch) for batch in sink.batches] == [2, 2, 1]
+    messages = [message for batch in sink.batches for message in batch]
+    assert [message["data"].get("title") for message in messages] == [
+        "Board", "T0", "T1", "T2", "T3"
+    ]
+    assert [message["id"] for message in messages] == sorted(m["id"] for m in messages)
+    assert dispatcher.stats()["failures"] == 2
+    assert dispatcher.stats()["consecutive_failures"] == 0
+    assert await outbox_types(session_factory) == []
+
+
+@pytest.mark.asyncio
+async def test_file_sink_appends_ndjson(session_factory, tmp_path):
+    """Tests that the file sink writes one JSON message per line."""
+    async with session_factory() as session:
+        await SQLAlchemyTaskListRepository(session).create(TaskList(title="Filed"))
+        await session.commit()
+
+    path = tmp_path / "outbox.ndjson"
+    dispatcher = make_dispatcher(session_factory, FileSink(str(path)))
+    assert await dispatcher.dispatch_once() == 1
+    assert await dispatcher.dispatch_once() == 0
+
+    [line] = path.read_text().splitlines()
+    message = json.loads(line)
+    assert message["type"] == "task_list.created"
+    assert message["data"]["title"] == "Filed"
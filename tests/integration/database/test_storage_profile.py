@@ -0,0 +1,23 @@
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.config import settings
+from src.infrastructure.database import configure_sqlite_connection, get_sqlite_pragmas
+
+# --- SQLite Storage Profile Integration Tests ---
+
+@pytest.mark.asyncio
+async def test_storage_profile_applied_to_connections(tmp_path):
+    """Tests that every new connection gets the PRAGMAs from the settings."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'profile.db'}")
+    configure_sqlite_connection(engine)
+
+    pragmas = await get_sqlite_pragmas(engine)
+    await engine.dispose()
+
+    assert pragmas["journal_mode"].upper() == settings.SQLITE_JOURNAL_MODE
+    assert pragmas["busy_timeout"] == settings.SQLITE_BUSY_TIMEOUT
+    assert pragmas["cache_size"] == settings.SQLITE_CACHE_SIZE
+    # synchronous=NORMAL and temp_store=MEMORY are reported as their numeric codes
+    assert pragmas["synchronous"] == 1
+    assert pragmas["temp_store"] == 2
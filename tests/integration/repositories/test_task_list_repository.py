@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities.task import Task, TaskStatus
+from src.domain.entities.task_list import TaskList
+from src.infrastructure.models import TaskListModel
+from src.infrastructure.repositories import (
+    SQLAlchemyTaskListRepository,
+    SQLAlchemyTaskRepository,
+)
+
+# --- TaskList Repository Integration Tests ---
+
+@pytest.mark.asyncio
+async def test_rebuild_stats_repairs_counters(db_session: AsyncSession):
+    """Tests that rebuilding the stored counters recomputes them from the tasks table."""
+    task_list_repo = SQLAlchemyTaskListRepository(db_session)
+    task_repo = SQLAlchemyTaskRepository(db_session)
+
+    task_list = await task_list_repo.create(TaskList(title="Drifted List"))
+    await task_repo.create(
+        Task(
+            title="Done",
+            task_list_id=task_list.id,
+            status=TaskStatus.COMPLETED,
+            percentage=100,
+        )
+    )
+    await task_repo.create(Task(title="Started", task_list_id=task_list.id, percentage=30))
+
+    # Simulate counters that drifted away from the real data
+    await db_session.execute(
+        update(TaskListModel)
+        .where(TaskListModel.id == task_list.id)
+        .values(task_count=7, completed_count=0, percentage_sum=5)
+    )
+    await db_session.commit()
+
+    assert await task_list_repo.rebuild_stats() >= 1
+
+    rebuilt = await task_list_repo.get_by_id(task_list.id)
+    assert rebuilt.total_tasks == 2
+    assert rebuilt.completed_tasks == 1
+    assert rebuilt.completion_percentage == 65
@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities.task import Task, TaskPriority, TaskStatus
+from src.domain.entities.task_list import TaskList
+from src.domain.entities.task_query import TaskQuery, TaskSort, TaskSortField
+from src.infrastructure.models import TaskModel
+from src.infrastructure.repositories import (
+    SQLAlchemyTaskListRepository,
+    SQLAlchemyTaskRepository,
+)
+from src.infrastructure.repositories.task_repository import (
+    task_query_conditions,
+    task_query_ordering,
+)
+
+# --- Task Repository Integration Tests ---
+
+@pytest.mark.asyncio
+async def test_filtered_tasks_sorted_by_priority_then_age(db_session: AsyncSession):
+    """Tests sorting by priority (ties by age) combined with range and multi-value filters."""
+    task_list = await SQLAlchemyTaskListRepository(db_session).create(TaskList(title="Board"))
+    task_repo = SQLAlchemyTaskRepository(db_session)
+    start = datetime(2024, 1, 1)
+    specs = [
+        ("Old high", TaskPriority.HIGH, 10),
+        ("New urgent", TaskPriority.URGENT, 50),
+        ("New high", TaskPriority.HIGH, 90),
+        ("Low", TaskPriority.LOW, 0),
+    ]
+    for days, (title, priority, percentage) in enumerate(specs):
+        await task_repo.create(Task(
+            title=title, priority=priority, percentage=percentage,
+            task_list_id=task_list.id, created_at=start + timedelta(days=days)
+        ))
+    await db_session.commit()
+
+    board = TaskQuery(sort=(TaskSort(TaskSortField.PRIORITY, descending=True),))
+    tasks = await task_repo.get_filtered_tasks(task_list.id, board)
+    assert [task.title for task in tasks] == ["New urgent", "Old high", "New high", "Low"]
+
+    # The ascending sort is the exact reverse
+    tasks = await task_repo.get_filtered_tasks(
+        task_list.id, TaskQuery(sort=(TaskSort(TaskSortField.PRIORITY),))
+    )
+    assert [task.title for task in tasks] == ["Low", "New high", "Old high", "New urgent"]
+
+    query = TaskQuery(
+        priorities=(TaskPriority.HIGH, TaskPriority.LOW),
+        created_after=start,
+        min_percentage=5,
+        sort=(TaskSort(TaskSortField.PERCENTAGE, descending=True),),
+    )
+    tasks = await task_repo.get_filtered_tasks(task_list.id, query)
+    assert [task.title for task in tasks] == ["New high"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort", [
+    (TaskSort(TaskSortField.PRIORITY, descending=True),),
+    (TaskSort(TaskSortField.PRIORITY),),
+    (TaskSort(TaskSortField.PRIORITY, descending=True), TaskSort(TaskSortField.CREATED_AT)),
+    (TaskSort(TaskSortField.PERCENTAGE),),
+    (TaskSort(TaskSortField.CREATED_AT, descending=True),),
+    (TaskSort(TaskSortField.UPDATED_AT),),
+])
+async def test_supported_sorts_are_served_by_an_index(db_session: AsyncSession, sort):
+    """Tests that SQLite reads every supported sort from an index instead of sorting."""
+    query = TaskQuery(statuses=(TaskStatus.PENDING, TaskStatus.IN_PROGRESS), sort=sort)
+    stmt = (
+        select(TaskModel.id)
+        .where(TaskModel.task_list_id == 1, *task_query_conditions(query))
+        .order_by(*task_query_ordering(query))
+    )
+    sql = str(stmt.compile(
+        dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True}
+    ))
+
+    connection = await db_session.connection()
+    plan = " ".join(
+        row[-1] for row in await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")
+    )
+    assert "USING INDEX" in plan
+    assert "TEMP B-TREE" not in plan
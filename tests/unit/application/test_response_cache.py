@@ -0,0 +1,48 @@
+from src.application.cache import MISSING, ResponseCache
+
+# --- ResponseCache Unit Tests ---
+
+def test_evicts_least_recently_used_entry():
+    """Tests that a full cache evicts the entry used least recently."""
+    cache = ResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1, task_list_id=1, generation=cache.generation)
+    cache.set("b", 2, task_list_id=1, generation=cache.generation)
+    assert cache.get("a") == 1
+    cache.set("c", 3, task_list_id=2, generation=cache.generation)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entry_is_a_miss():
+    """Tests that entries are not served after their time-to-live."""
+    cache = ResponseCache(max_entries=10, ttl_seconds=0)
+    cache.set("a", 1, task_list_id=1, generation=cache.generation)
+    assert cache.get("a") is MISSING
+    assert cache.stats()["entries"] == 0
+
+
+def test_invalidation_drops_only_the_changed_task_lists():
+    """Tests that invalidating a task list drops its entries and keeps the others."""
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    cache.set("list-1", 1, task_list_id=1, generation=cache.generation)
+    cache.set("tasks-1", 2, task_list_id=1, generation=cache.generation)
+    cache.set("list-2", 3, task_list_id=2, generation=cache.generation)
+
+    cache.invalidate_task_lists({1})
+
+    assert cache.get("list-1") is MISSING
+    assert cache.get("tasks-1") is MISSING
+    assert cache.get("list-2") == 3
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_load_racing_with_a_write_is_not_stored():
+    """Tests that a value loaded before an invalidation is not cached after it."""
+    cache = ResponseCache(max_entries=10, ttl_seconds=60)
+    generation = cache.generation
+    cache.invalidate_task_lists({1})
+    cache.set("list-1", "stale", task_list_id=1, generation=generation)
+    assert cache.get("list-1") is MISSING
@@ -0,0 +1,31 @@
+import json
+from datetime import datetime
+
+from src.application.dtos import TaskListResponse, TaskResponse
+from src.domain.entities.task import Task, TaskPriority, TaskStatus
+from src.domain.entities.task_list import TaskList
+
+# --- Response DTO Unit Tests ---
+
+def test_task_response_from_entity_matches_validated_response():
+    """Tests that the unvalidated fast path serializes exactly like a validated response."""
+    task = Task(
+        id=7, title="Task", description="Desc", status=TaskStatus.IN_PROGRESS,
+        percentage=40, priority=TaskPriority.HIGH, task_list_id=3,
+        created_at=datetime(2024, 1, 2, 3, 4, 5), version=2
+    )
+    validated = TaskResponse(**task.model_dump(exclude={"updated_at"}), updated_at=None)
+
+    fast = TaskResponse.from_entity(task)
+    assert json.loads(fast.model_dump_json()) == json.loads(validated.model_dump_json())
+
+
+def test_task_list_response_from_entity():
+    """Tests that a task list response carries the entity's fields and computed stats."""
+    task_list = TaskList(id=1, title="List", created_at=datetime(2024, 1, 1), version=5)
+
+    data = json.loads(TaskListResponse.from_entity(task_list).model_dump_json())
+    assert data["id"] == 1
+    assert data["title"] == "List"
+    assert data["version"] == 5
+    assert data["total_tasks"] == 0
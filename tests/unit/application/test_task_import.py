@@ -0,0 +1,31 @@
+import pytest
+
+from src.application.task_import import iter_lines, parse_csv
+
+# --- Task Import Parsing Unit Tests ---
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_joins_lines_split_across_chunks():
+    """Tests that lines and multi-byte characters split between chunks are rebuilt."""
+    encoded = "first\r\nsegunda línea\nlast".encode("utf-8")
+    split = encoded.index("í".encode("utf-8")) + 1
+    lines = await _collect(iter_lines(_chunks(encoded[:3], encoded[3:split], encoded[split:])))
+    assert lines == ["first", "segunda línea", "last"]
+
+
+@pytest.mark.asyncio
+async def test_parse_csv_reports_rows_with_the_wrong_field_count():
+    """Tests that malformed CSV rows become per-row errors with their line number."""
+    rows = await _collect(parse_csv(iter_lines(_chunks(b"title,percentage\nA,1\nB\n\nC,3\n"))))
+    assert rows[0] == (2, {"title": "A", "percentage": "1"}, None)
+    assert rows[1][0] == 3 and rows[1][1] is None
+    assert rows[2] == (5, {"title": "C", "percentage": "3"}, None)
@@ -0,0 +1,114 @@
+import tracemalloc
+from datetime import datetime
+
+from src.domain.entities.task import Task, TaskPriority, TaskStatus
+from src.domain.entities.task_collection import TaskCollection, TaskRecord
+from src.domain.entities.task_list import TaskList
+
+# --- TaskCollection Unit Tests ---
+
+def make_record(task_id: int, status=TaskStatus.PENDING, percentage=0) -> TaskRecord:
+    return TaskRecord(
+        task_id, f"T{task_id}", None, status, percentage, TaskPriority.MEDIUM, 1,
+        datetime(2024, 1, 1)
+    )
+
+
+def test_lookup_and_counts():
+    """Tests O(1) lookup by ID and the running status counts."""
+    collection = TaskCollection([
+        make_record(1, TaskStatus.COMPLETED, 100),
+        make_record(2, TaskStatus.IN_PROGRESS, 50),
+        make_record(3),
+    ])
+    assert len(collection) == 3
+    assert collection.get(2).title == "T2"
+    assert collection.get(4) is None
+    assert collection.completed_count == 1
+    assert collection.count(TaskStatus.IN_PROGRESS) == 1
+    assert collection.completion_percentage == 50
+
+
+def test_remove_keeps_order_and_index():
+    """Tests that removing a task updates the aggregates and the lookups of later tasks."""
+    collection = TaskCollection(
+        make_record(task_id, percentage=10 * task_id) for task_id in (1, 2, 3)
+    )
+    removed = collection.remove(1)
+
+    assert removed.id == 1
+    assert collection.remove(1) is None
+    assert [record.id for record in collection] == [2, 3]
+    assert collection.get(3).id == 3
+    assert collection.percentage_sum == 50
+
+
+def test_remove_does_not_move_other_records():
+    """Tests that removals leave later lookups, iteration and positions consistent."""
+    collection = TaskCollection(make_record(task_id) for task_id in range(1, 11))
+    for task_id in (2, 4, 6):
+        collection.remove(task_id)
+
+    assert len(collection) == 7
+    assert collection.get(10).id == 10
+    assert [record.id for record in collection] == [1, 3, 5, 7, 8, 9, 10]
+    assert collection[1].id == 3
+    assert collection[-1].id == 10
+
+    # Removing most records compacts the tombstones away
+    for task_id in (1, 3, 5, 7, 8):
+        collection.remove(task_id)
+    assert [record.id for record in collection] == [9, 10]
+    assert collection.get(9).id == 9
+    collection.add(make_record(11))
+    assert collection.get(11) is collection[2]
+
+
+def test_adding_an_existing_id_replaces_the_task():
+    """Tests that a task added twice is stored and counted once, wherever it is read."""
+    collection = TaskCollection([make_record(1), make_record(2)])
+    collection.add(make_record(1, TaskStatus.COMPLETED, 100))
+
+    assert len(collection) == 2
+    assert collection.completed_count == 1
+    assert collection.percentage_sum == 100
+    assert [record.id for record in collection] == [1, 2]
+    assert collection.get(1).status == TaskStatus.COMPLETED
+
+    collection.remove(2)
+    assert collection[0].id == 1
+    assert collection.remove(1).status == TaskStatus.COMPLETED
+    assert len(collection) == 0
+    assert collection.get(1) is None
+    assert list(collection) == []
+    assert collection.percentage_sum == 0
+
+
+def test_records_round_trip_to_entities():
+    """Tests that records convert to and from the Pydantic entity without losing fields."""
+    task = Task(id=1, title="T1", task_list_id=1, status=TaskStatus.COMPLETED, percentage=100)
+    record = TaskRecord.from_entity(task)
+    assert record.to_entity() == task
+    assert TaskList(id=1, title="List", tasks=[task]).tasks[0] == record
+
+
+def test_records_use_less_memory_than_entities():
+    """Tests that slotted records take well under half the memory of Pydantic tasks."""
+    def allocated(factory) -> int:
+        tracemalloc.start()
+        items = [factory(task_id) for task_id in range(1000)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        assert len(items) == 1000
+        return size
+
+    now = datetime(2024, 1, 1)
+    record_size = allocated(
+        lambda task_id: TaskRecord(
+            task_id, "Title", None, TaskStatus.PENDING, 0, TaskPriority.MEDIUM, 1, now
+        )
+    )
+    entity_size = allocated(
+        lambda task_id: Task(id=task_id, title="Title", task_list_id=1, created_at=now)
+    )
+    assert record_size < entity_size / 2
@@ -1,5 +1,5 @@
 from src.domain.entities.task import Task, TaskStatus
-from src.domain.entities.task_list import TaskList
+from src.domain.entities.task_list import TaskList, TaskListStats
 
 # --- TaskList Entity Unit Tests ---
 
@@ -51,4 +51,28 @@ def test_add_and_remove_task():
     task_list.remove_task(1)
     assert task_list.total_tasks == 1
     assert task_list.get_task(1) is None
-    assert task_list.get_task(2) is not None 
\ No newline at end of file
+    assert task_list.get_task(2) == task2
+
+def test_task_list_properties_from_stats():
+    """Tests that precomputed stats take precedence over iterating the tasks."""
+    stats = TaskListStats(total_tasks=3, completed_tasks=1, percentage_sum=160)
+    task_list = TaskList(id=1, title="Summary List", stats=stats)
+    assert task_list.total_tasks == 3
+    assert task_list.completed_tasks == 1
+    assert task_list.completion_percentage == 53
+
+    task4 = Task(id=4, title="T4", task_list_id=1, status=TaskStatus.COMPLETED, percentage=100)
+    task_list.add_task(task4)
+    assert task_list.total_tasks == 4
+    assert task_list.completed_tasks == 2
+    assert task_list.completion_percentage == 65
+
+    task_list.remove_task(4)
+    assert task_list.total_tasks == 3
+    assert task_list.completed_tasks == 1
+
+    # Adding a task again replaces it, in the stats as well
+    task_list.add_task(Task(id=5, title="T5", task_list_id=1, percentage=20))
+    task_list.add_task(Task(id=5, title="T5", task_list_id=1, percentage=40))
+    assert task_list.total_tasks == 4
+    assert task_list.stats.percentage_sum == 200
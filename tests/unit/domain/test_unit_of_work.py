@@ -0,0 +1,39 @@
+import pytest
+
+from src.domain.repositories.unit_of_work import UnitOfWork
+
+# --- UnitOfWork Unit Tests ---
+
+class RecordingUnitOfWork(UnitOfWork):
+    """Unit of work that only records how its transaction ended."""
+
+    def __init__(self):
+        super().__init__()
+        self.events = []
+
+    async def commit(self):
+        self.events.append("commit")
+
+    async def rollback(self):
+        self.events.append("rollback")
+
+
+@pytest.mark.asyncio
+async def test_nested_blocks_commit_once():
+    """Tests that nested blocks join the outer transaction and commit only once."""
+    uow = RecordingUnitOfWork()
+    async with uow:
+        async with uow:
+            pass
+        assert uow.events == []
+    assert uow.events == ["commit"]
+
+
+@pytest.mark.asyncio
+async def test_error_rolls_back():
+    """Tests that an error inside the block rolls the work back."""
+    uow = RecordingUnitOfWork()
+    with pytest.raises(ValueError):
+        async with uow:
+            raise ValueError("boom")
+    assert uow.events == ["rollback"]
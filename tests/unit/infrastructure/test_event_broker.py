@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+
+from src.domain.entities.task import TaskPriority, TaskStatus
+from src.domain.entities.task_collection import TaskRecord
+from src.infrastructure.events import EventBroker, TaskEvent, TaskEventType
+
+# --- EventBroker Unit Tests ---
+
+def created(task_id: int, task_list_id: int = 1) -> TaskEvent:
+    record = TaskRecord(
+        task_id, f"T{task_id}", None, TaskStatus.PENDING, 0, TaskPriority.MEDIUM, task_list_id,
+        datetime(2024, 1, 1)
+    )
+    return TaskEvent(TaskEventType.CREATED, task_list_id, record)
+
+
+def drain(subscription) -> list:
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+@pytest.mark.asyncio
+async def test_subscribers_get_only_their_task_list():
+    """Tests that events reach the subscribers of their task list, after the initial resync."""
+    broker = EventBroker(max_queued_events=10)
+    first, other = broker.subscribe(1), broker.subscribe(2)
+    assert (await first.get()).type is TaskEventType.RESYNC
+
+    broker.publish([created(1), created(2, task_list_id=2), created(3)])
+
+    assert [event.task.id for event in drain(first)] == [1, 3]
+    # Until a subscriber reads its resync, new events are covered by the refetch
+    assert [event.type for event in drain(other)] == [TaskEventType.RESYNC]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_is_replaced_by_one_resync():
+    """Tests that a slow subscriber drops its backlog for a resync, and resumes after it."""
+    broker = EventBroker(max_queued_events=3)
+    subscription = broker.subscribe(1)
+    await subscription.get()
+
+    broker.publish([created(task_id) for task_id in range(10)])
+
+    assert subscription.queue.qsize() == 1
+    assert (await subscription.get()).type is TaskEventType.RESYNC
+    broker.publish([created(10)])
+    assert (await subscription.get()).task.id == 10
+    assert broker.stats()["overflows"] == 1
+    assert broker.stats()["dropped"] == 10
+
+
+def test_unsubscribe_stops_delivery():
+    """Tests that an unsubscribed queue no longer receives events."""
+    broker = EventBroker(max_queued_events=10)
+    subscription = broker.subscribe(1)
+    broker.unsubscribe(subscription)
+    broker.publish([created(1)])
+
+    assert broker.stats()["subscribers"] == 0
+    assert [event.type for event in drain(subscription)] == [TaskEventType.RESYNC]
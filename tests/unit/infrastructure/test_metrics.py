@@ -0,0 +1,32 @@
+from src.infrastructure.metrics import MetricsRegistry
+
+# --- Metrics Unit Tests ---
+
+def test_histogram_renders_cumulative_buckets():
+    """Tests that observations land in the first bucket whose bound is not below them."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    value = histogram.labels("/tasks")
+    for seconds in (0.05, 0.1, 0.5, 3.0):
+        value.observe(seconds)
+
+    lines = registry.render().splitlines()
+    assert 'latency_seconds_bucket{route="/tasks",le="0.1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/tasks",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/tasks",le="+Inf"} 4' in lines
+    assert 'latency_seconds_count{route="/tasks"} 4' in lines
+    assert 'latency_seconds_sum{route="/tasks"} 3.65' in lines
+
+
+def test_label_values_are_reused_and_escaped():
+    """Tests that a label combination maps to one value and that label values are escaped."""
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("route",))
+    assert counter.labels('/a"b') is counter.labels('/a"b')
+    counter.labels('/a"b').inc()
+    registry.add_collector(lambda: [("cache_hits", "gauge", "Cache hits", 7)])
+
+    output = registry.render()
+    assert '# TYPE requests_total counter' in output
+    assert 'requests_total{route="/a\\"b"} 1' in output
+    assert "cache_hits 7" in output